@@ -0,0 +1,435 @@
+"""Local stand-ins for every external API, with injectable latency, errors and caps.
+
+One aiohttp server mounts each upstream under /<name>/ with the production
+path after it, so pointing utils.upstreams at it is a matter of
+UPSTREAM_<NAME>_URL=http://host:port/<name>. Responses come from the recorded
+fixtures in benchmarks/fixtures/upstreams/ (Nobel, NWS, met.no, WWIS, Epic,
+GOG, Michelin, SPARQL) or are generated deterministically (CKAN
+datastore_search pages, Smithsonian and V&A search pages, USPTO PDFs).
+
+Each upstream has a Profile:
+  latency_ms / jitter_ms   added before responding (uniform jitter)
+  error_rate               fraction answered with error_status (default 503)
+  rps                      throughput cap; excess requests queue for a slot
+  bytes_per_s              body bandwidth cap (0 = unlimited)
+
+The server runs on its own thread and event loop, so blocking clients
+(requests inside a command handler) and aiohttp clients both work against it
+from the same process. GET /_stats returns per-upstream counters;
+POST /_profile?upstream=<name> with a JSON Profile changes behaviour live.
+
+Usage
+-----
+python -m benchmarks.fake_upstreams --port 8700 --latency-ms 80 --jitter-ms 20 --error-rate 0.02
+python -m benchmarks.fake_upstreams --profile nobel:latency_ms=400,rps=5 --profile uspto:bytes_per_s=200000
+
+with FakeUpstreams(Profile(latency_ms=50)) as fake, fake.patched_env():
+    ...  # code under test now talks to the fakes
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional
+
+from aiohttp import web
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import synth
+from utils import upstreams
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "upstreams")
+
+
+@dataclass
+class Profile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rps: float = 0.0
+    bytes_per_s: float = 0.0
+
+
+def parse_profile(spec: str, base: Optional[Profile] = None) -> Profile:
+    """'latency_ms=50,error_rate=0.1' -> Profile (unset fields come from `base`)."""
+    p = copy.copy(base) if base is not None else Profile()
+    types = {f.name: f.type for f in fields(Profile)}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        k, _, v = part.partition("=")
+        k = k.strip()
+        if k not in types:
+            raise ValueError(f"unknown profile field {k!r} (expected one of {', '.join(types)})")
+        setattr(p, k, int(v) if types[k] in (int, "int") else float(v))
+    return p
+
+
+class _Upstream:
+    """Per-upstream profile, throughput slotting and counters."""
+
+    def __init__(self, profile: Profile) -> None:
+        self.profile = profile
+        self.next_slot = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.queued_s = 0.0
+
+    async def throttle(self) -> None:
+        if self.profile.rps <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + 1.0 / self.profile.rps
+        if slot > now:
+            self.queued_s += slot - now
+            await asyncio.sleep(slot - now)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "errors": self.errors, "bytes": self.bytes,
+                "max_inflight": self.max_inflight, "queued_s": round(self.queued_s, 3),
+                "profile": asdict(self.profile)}
+
+
+def _fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def _seed(*parts: Any) -> int:
+    return zlib.crc32("|".join(str(p) for p in parts).encode("utf-8"))
+
+
+def _int(request: web.Request, key: str, default: int) -> int:
+    try:
+        return int(request.query.get(key, default))
+    except ValueError:
+        return default
+
+
+def _pdf(patent: str, size: int) -> bytes:
+    head = (f"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+            f"2 0 obj << /Type /Pages /Kids [] /Count 0 >> endobj\n% US patent {patent}\n").encode("ascii")
+    tail = b"trailer << /Root 1 0 R >>\n%%EOF\n"
+    return head + b"%" * max(0, size - len(head) - len(tail)) + tail
+
+
+class FakeUpstreams:
+    def __init__(self, profile: Optional[Profile] = None, profiles: Optional[Dict[str, Profile]] = None,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0,
+                 ckan_rows: int = 2000, search_rows: int = 500, pdf_kb: int = 64) -> None:
+        default = profile or Profile()
+        self._up = {n: _Upstream(copy.copy((profiles or {}).get(n, default))) for n in upstreams.NAMES}
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.ckan_rows = ckan_rows
+        self.search_rows = search_rows
+        self.pdf_size = pdf_kb * 1024
+        self._fixtures: Dict[str, bytes] = {}
+        self._whc: Optional[List[Dict[str, Any]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self.base_url = ""
+
+    # -- behaviour ---------------------------------------------------------------
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        name = request.path.strip("/").split("/", 1)[0]
+        up = self._up.get(name)
+        if up is None:
+            return await handler(request)
+        up.requests += 1
+        up.inflight += 1
+        up.max_inflight = max(up.max_inflight, up.inflight)
+        try:
+            await up.throttle()
+            p = up.profile
+            delay = p.latency_ms + (self.rng.uniform(-p.jitter_ms, p.jitter_ms) if p.jitter_ms else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000.0)
+            if p.error_rate and self.rng.random() < p.error_rate:
+                up.errors += 1
+                return web.json_response({"error": "injected by fake_upstreams"}, status=p.error_status)
+            resp = await handler(request)
+            size = len(getattr(resp, "body", None) or b"")
+            up.bytes += size
+            if p.bytes_per_s > 0 and size:
+                await asyncio.sleep(size / p.bytes_per_s)
+            return resp
+        finally:
+            up.inflight -= 1
+
+    def set_profile(self, name: Optional[str], profile: Profile) -> None:
+        """Change one upstream's profile (or all of them when name is None); thread-safe."""
+        targets = [self._up[name]] if name else list(self._up.values())
+
+        def apply() -> None:
+            for up in targets:
+                up.profile = copy.copy(profile)
+
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(apply)
+        else:
+            apply()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {n: up.stats() for n, up in self._up.items() if up.requests}
+
+    # -- handlers ----------------------------------------------------------------
+
+    def _raw(self, name: str) -> bytes:
+        data = self._fixtures.get(name)
+        if data is None:
+            data = self._fixtures[name] = _fixture(name)
+        return data
+
+    def _json_fixture(self, name: str) -> web.Response:
+        return web.Response(body=self._raw(name), content_type="application/json")
+
+    async def _nobel(self, request: web.Request) -> web.Response:
+        year = request.query.get("nobelPrizeYear")
+        if not year:
+            return self._json_fixture("nobel_prizes.json")
+        # Same prizes relabelled with the requested year, so per-year cache keys stay distinct.
+        body = self._raw("nobel_prizes.json").decode("utf-8").replace("2023", str(int(year)))
+        return web.Response(text=body, content_type="application/json")
+
+    async def _nws_points(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._raw("nws_points.json"), content_type="application/geo+json")
+
+    async def _nws_forecast(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._raw("nws_forecast.json"), content_type="application/geo+json")
+
+    async def _metno(self, request: web.Request) -> web.Response:
+        return self._json_fixture("metno_compact.json")
+
+    async def _wwis(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._raw("wwis_members.html"), content_type="text/html", charset="utf-8")
+
+    async def _epic(self, request: web.Request) -> web.Response:
+        return self._json_fixture("epic_free_promotions.json")
+
+    async def _gog(self, request: web.Request) -> web.Response:
+        return self._json_fixture("gog_filtered.json")
+
+    async def _michelin(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._raw("michelin_restaurants.html"), content_type="text/html", charset="utf-8")
+
+    async def _uspto(self, request: web.Request) -> web.Response:
+        return web.Response(body=_pdf(request.match_info["pn"], self.pdf_size), content_type="application/pdf")
+
+    async def _ckan(self, request: web.Request) -> web.Response:
+        if self._whc is None:
+            # 1-based: the sync script treats a falsy id as missing.
+            self._whc = [{"id": r.pop("id_no") + 1, **r} for r in synth.whc_rows(self.ckan_rows)]
+        offset = max(0, _int(request, "offset", 0))
+        limit = max(0, _int(request, "limit", 100))
+        columns = list(self._whc[0]) if self._whc else []
+        wanted = [f for f in request.query.get("fields", "").split(",") if f] or columns
+        records = [{k: r[k] for k in wanted if k in r} for r in self._whc[offset:offset + limit]]
+        return web.json_response({
+            "success": True,
+            "result": {"resource_id": request.query.get("resource_id", ""), "offset": offset, "limit": limit,
+                       "total": len(self._whc), "fields": [{"id": c, "type": "text"} for c in wanted],
+                       "records": records},
+        })
+
+    async def _smithsonian(self, request: web.Request) -> web.Response:
+        q = request.query.get("q", "")
+        start = max(0, _int(request, "start", 0))
+        rows = max(0, _int(request, "rows", 10))
+        base = _seed("si", q)
+        out = []
+        for i in range(start, min(start + rows, self.search_rows)):
+            rid = f"edanmdm:nmah_{base % 100000}_{i}"
+            out.append({"id": rid, "title": f"{q.title()} {i}", "content": {
+                "id": rid,
+                "descriptiveNonRepeating": {"title": {"label": "Title", "content": f"{q.title()} {i}"},
+                                            "record_link": f"https://collections.si.edu/search/detail/{rid}"},
+            }})
+        return web.json_response({"status": 200, "response": {"rows": out, "rowCount": self.search_rows}})
+
+    async def _vam(self, request: web.Request) -> web.Response:
+        q = request.query.get("q", "")
+        page = max(1, _int(request, "page", 1))
+        size = max(0, _int(request, "page_size", 15))
+        base = _seed("vam", q)
+        first = (page - 1) * size
+        records = [{"systemNumber": f"O{base % 100000}{i:05d}", "objectNumber": f"{i}-{base % 1000}",
+                    "_primaryTitle": f"{q.title()} {i}"}
+                   for i in range(first, min(first + size, self.search_rows))]
+        return web.json_response({"info": {"record_count": self.search_rows, "page": page, "page_size": size},
+                                  "records": records})
+
+    async def _sparql(self, request: web.Request) -> web.Response:
+        return web.Response(body=self._raw("sparql_hs.json"), content_type="application/sparql-results+json")
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def _set_profile(self, request: web.Request) -> web.Response:
+        name = request.query.get("upstream") or None
+        if name and name not in self._up:
+            return web.json_response({"error": f"unknown upstream {name!r}"}, status=404)
+        try:
+            profile = Profile(**(await request.json()))
+        except (TypeError, ValueError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+        self.set_profile(name, profile)
+        return web.json_response({"upstream": name or "*", "profile": asdict(profile)})
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes([
+            web.get("/nobel/2.1/nobelPrizes", self._nobel),
+            web.get("/nws/points/{coords}", self._nws_points),
+            web.get("/nws/gridpoints/{grid}/{xy}/forecast{tail:.*}", self._nws_forecast),
+            web.get("/metno/weatherapi/locationforecast/2.0/compact", self._metno),
+            web.get("/wwis/en/members.html", self._wwis),
+            web.get("/epic/freeGamesPromotions", self._epic),
+            web.get("/gog/games/ajax/filtered", self._gog),
+            web.get("/michelin/{path:.*}", self._michelin),
+            web.get("/uspto/dirsearch-public/print/downloadPdf/{pn}", self._uspto),
+            web.get("/ckan/api/3/action/datastore_search", self._ckan),
+            web.get("/smithsonian/openaccess/api/v1.0/search", self._smithsonian),
+            web.get("/vam/v2/objects/search", self._vam),
+            web.get("/sparql{path:.*}", self._sparql),
+            web.get("/_stats", self._stats),
+            web.post("/_profile", self._set_profile),
+        ])
+        return app
+
+    # -- lifecycle ---------------------------------------------------------------
+
+    async def _serve(self) -> None:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        sock = site._server.sockets[0]  # resolve port=0
+        self.port = sock.getsockname()[1]
+        self.base_url = f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Serve on a background thread; returns the base URL once bound."""
+        ready = threading.Event()
+        failed: List[BaseException] = []
+
+        def run() -> None:
+            loop = self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self._serve())
+            except BaseException as e:
+                failed.append(e)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self._runner.cleanup())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="fake-upstreams", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failed:
+            raise failed[0]
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+        self._loop = self._thread = None
+
+    def __enter__(self) -> "FakeUpstreams":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def env(self) -> Dict[str, str]:
+        return {upstreams.env_var(n): f"{self.base_url}/{n}" for n in upstreams.NAMES}
+
+    @contextlib.contextmanager
+    def patched_env(self) -> Iterator[Dict[str, str]]:
+        """Point every UPSTREAM_<NAME>_URL at this server for the duration of the block."""
+        env = self.env()
+        saved = {k: os.environ.get(k) for k in env}
+        os.environ.update(env)
+        try:
+            yield env
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serve fake upstream APIs for offline network benchmarks.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8700)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--rps", type=float, default=0.0, help="Per-upstream throughput cap (0 = none).")
+    ap.add_argument("--bytes-per-s", type=float, default=0.0, help="Per-response bandwidth cap (0 = none).")
+    ap.add_argument("--profile", action="append", default=[],
+                    help="Per-upstream override, e.g. nobel:latency_ms=300,error_rate=0.1 (repeatable).")
+    ap.add_argument("--ckan-rows", type=int, default=2000, help="Records served by datastore_search.")
+    ap.add_argument("--search-rows", type=int, default=500, help="Results per Smithsonian/V&A query.")
+    ap.add_argument("--pdf-kb", type=int, default=64, help="Size of generated USPTO PDFs.")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    default = Profile(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.rps, args.bytes_per_s)
+    profiles: Dict[str, Profile] = {}
+    for spec in args.profile:
+        name, _, rest = spec.partition(":")
+        if name not in upstreams.NAMES:
+            ap.error(f"unknown upstream {name!r} (expected one of {', '.join(upstreams.NAMES)})")
+        profiles[name] = parse_profile(rest, default)
+
+    fake = FakeUpstreams(default, profiles, host=args.host, port=args.port, seed=args.seed,
+                         ckan_rows=args.ckan_rows, search_rows=args.search_rows, pdf_kb=args.pdf_kb)
+    fake.start()
+    for k, v in fake.env().items():
+        print(f"export {k}={v}")
+    print(f"# stats: {fake.base_url}/_stats", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(fake.stats(), indent=2), file=sys.stderr)
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int
+    number: int      # calls per sample
+    repeat: int      # samples
+    min: float       # seconds per call
+    median: float
+    mean: float
+    stdev: float
+
+
+def measure(fn: Callable[[], Any], min_sample: float = 0.05, repeat: int = 5, max_seconds: float = 30.0) -> Dict[str, Any]:
+    """Time `fn` timeit-style: calibrate calls per sample to ~min_sample seconds, then take `repeat` samples."""
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+    number = max(1, int(min_sample / first)) if first > 0 else 1000
+    # Slow cases get fewer samples so one benchmark cannot dominate the run.
+    repeat = max(1, min(repeat, int(max_seconds / max(first * number, 1e-9))))
+    per_call: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - t0) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "git_rev": _git_rev(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def save(path: str, results: List[Result], skipped: Dict[str, str]) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    doc = {"environment": environment(), "results": [asdict(r) for r in results], "skipped": skipped}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: List[Result], threshold: float = 0.10) -> List[str]:
+    """Regression lines for results whose median is more than `threshold` slower than the baseline."""
+    base = {(r["name"], r["rows"]): r for r in baseline.get("results", [])}
+    regressions: List[str] = []
+    for r in current:
+        b = base.get((r.name, r.rows))
+        if b is None or not b["median"]:
+            continue
+        ratio = r.median / b["median"]
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{r.name} @ {r.rows}: {_fmt(b['median'])} -> {_fmt(r.median)} ({(ratio - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def table(results: List[Result], baseline: Optional[Dict[str, Any]] = None) -> str:
+    base = {(r["name"], r["rows"]): r for r in (baseline or {}).get("results", [])}
+    lines = [f"{'benchmark':<40} {'rows':>9} {'median':>10} {'min':>10} {'stdev':>10} {'vs base':>9}"]
+    for r in results:
+        b = base.get((r.name, r.rows))
+        delta = f"{(r.median / b['median'] - 1) * 100:+.1f}%" if b and b["median"] else ""
+        lines.append(f"{r.name:<40} {r.rows:>9} {_fmt(r.median):>10} {_fmt(r.min):>10} {_fmt(r.stdev):>10} {delta:>9}")
+    return "\n".join(lines)
@@ -0,0 +1,135 @@
+"""Offline stand-ins for discord.Interaction and a command-tree driver.
+
+FakeInteraction carries the attributes the command handlers touch (user,
+guild, response, followup) and records every send, so callbacks from the
+tree built by commands.register_all_commands can be awaited directly with
+no gateway or HTTP traffic.
+"""
+from __future__ import annotations
+
+import contextlib
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+_IDS = itertools.count(1)
+
+
+@dataclass
+class Sent:
+    kind: str                 # send_message | defer | followup | edit_message
+    content: Optional[str]
+    embeds: int
+    files: int
+    ephemeral: bool
+    at: float
+
+
+@dataclass
+class FakePermissions:
+    administrator: bool = False
+
+
+@dataclass
+class FakeUser:
+    id: int
+    name: str = "loadtest"
+    guild_permissions: FakePermissions = field(default_factory=FakePermissions)
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+class FakeResponse:
+    def __init__(self, log: List[Sent]) -> None:
+        self._log = log
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _record(self, kind: str, content: Any = None, embed: Any = None, embeds: Sequence[Any] = (),
+                file: Any = None, files: Sequence[Any] = (), ephemeral: bool = False) -> None:
+        if self._done and kind != "followup":
+            raise RuntimeError("This interaction has already been responded to before")
+        self._log.append(Sent(kind, None if content is None else str(content),
+                              int(embed is not None) + len(embeds), int(file is not None) + len(files),
+                              ephemeral, time.perf_counter()))
+
+    async def send_message(self, content: Any = None, *, embed: Any = None, embeds: Sequence[Any] = (),
+                           file: Any = None, files: Sequence[Any] = (), ephemeral: bool = False, **_: Any) -> None:
+        self._record("send_message", content, embed, embeds, file, files, ephemeral)
+        self._done = True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False, **_: Any) -> None:
+        self._record("defer", ephemeral=ephemeral)
+        self._done = True
+
+    async def edit_message(self, *, content: Any = None, embed: Any = None, **_: Any) -> None:
+        self._record("edit_message", content, embed)
+        self._done = True
+
+
+class FakeFollowup:
+    def __init__(self, log: List[Sent], response: FakeResponse) -> None:
+        self._log = log
+        self._response = response
+
+    async def send(self, content: Any = None, *, embed: Any = None, embeds: Sequence[Any] = (),
+                   file: Any = None, files: Sequence[Any] = (), ephemeral: bool = False, **_: Any) -> None:
+        self._response._record("followup", content, embed, embeds, file, files, ephemeral)
+
+
+class FakeInteraction:
+    def __init__(self, user_id: Optional[int] = None, guild_id: Optional[int] = 1, admin: bool = False) -> None:
+        self.id = next(_IDS)
+        self.user = FakeUser(user_id if user_id is not None else self.id, guild_permissions=FakePermissions(admin))
+        self.guild_id = guild_id
+        self.channel_id = 1
+        self.sent: List[Sent] = []
+        self.response = FakeResponse(self.sent)
+        self.followup = FakeFollowup(self.sent, self.response)
+        self.created = time.perf_counter()
+
+    @property
+    def errored(self) -> bool:
+        """Handlers in this repo report failures as an ephemeral "Error: ..." message."""
+        return any(s.ephemeral and (s.content or "").startswith("Error") for s in self.sent)
+
+
+@contextlib.contextmanager
+def _only_registrars(exclude: Sequence[str]) -> Iterator[None]:
+    import commands as command_pkg
+
+    saved = command_pkg._REGISTRARS
+    command_pkg._REGISTRARS = tuple(r for r in saved if r[0] not in set(exclude))
+    try:
+        yield
+    finally:
+        command_pkg._REGISTRARS = saved
+
+
+def build_tree(data_dir: str, cooldown_seconds: int = 0, exclude: Sequence[str] = ()) -> Tuple[Any, Dict[str, Any]]:
+    """Build the real command tree offline; returns (bot, {qualified name: Command}).
+
+    `exclude` drops registrar modules (e.g. "commands.legacy_suite") that cannot load here.
+    """
+    import discord
+    from discord import app_commands
+    from discord.ext import commands as dcommands
+
+    from commands import register_all_commands
+    from utils.rate_limit import RateLimiter
+
+    bot = dcommands.Bot(command_prefix="!", intents=discord.Intents.none())
+    with _only_registrars(exclude):
+        register_all_commands(bot, bot.tree, data_dir, RateLimiter(cooldown_seconds=cooldown_seconds))
+    found = {c.qualified_name: c for c in bot.tree.walk_commands() if isinstance(c, app_commands.Command)}
+    return bot, found
+
+
+async def invoke(command: Any, interaction: FakeInteraction, options: Optional[Dict[str, Any]] = None) -> None:
+    """Await a slash command's callback the way discord.py does after option parsing."""
+    await command._do_call(interaction, dict(options or {}))
@@ -0,0 +1,294 @@
+"""Drive slash commands offline and report throughput, latency and event-loop lag.
+
+Modes
+-----
+closed loop:  --concurrency N              N workers issue commands back to back
+open loop:    --rate R                     Poisson arrivals at R commands/second
+replay:       --trace audit.jsonl          re-issue recorded commands with their
+                                           original spacing (--speed 2 = twice as fast)
+
+The command mix is every slash command without required options (admin
+commands excluded) unless --mix names a JSON file of
+[{"command": "games by_year", "options": {"year": 1980}, "weight": 2}, ...].
+Traces are the {"event": "command"} records written to logs/audit.jsonl when
+TRACE_COMMANDS=1. --fake-upstreams starts benchmarks.fake_upstreams in-process
+and points every external API at it, so network-backed commands run offline
+with the given latency/error profile.
+
+Usage
+-----
+python -m benchmarks.loadtest --data-dir data --concurrency 32 --requests 5000
+python -m benchmarks.loadtest --rate 200 --duration 30 --exclude commands.legacy_suite
+python -m benchmarks.loadtest --fake-upstreams latency_ms=80,jitter_ms=20,error_rate=0.01 --duration 30
+python -m benchmarks.loadtest --trace logs/audit.jsonl --speed 5 --out .cache/bench/load.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.interactions import FakeInteraction, build_tree, invoke
+from utils.metrics import LatencyHistogram
+
+ADMIN_COMMANDS = ("stats", "profile")
+
+
+@dataclass(frozen=True)
+class Call:
+    command: str
+    options: Dict[str, Any]
+    user_id: Optional[int] = None
+    at: float = 0.0  # seconds from start (replay only)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.overall = LatencyHistogram()
+        self.by_command: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.completed = 0
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.overall.record(seconds)
+        h = self.by_command.get(name)
+        if h is None:
+            h = self.by_command[name] = LatencyHistogram()
+        h.record(seconds)
+        self.completed += 1
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def _loop_lag(stop: asyncio.Event, out: LatencyHistogram, interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        out.record(max(0.0, loop.time() - t0 - interval))
+
+
+def default_mix(commands: Dict[str, Any]) -> List[Tuple[Call, float]]:
+    mix: List[Tuple[Call, float]] = []
+    for name, cmd in sorted(commands.items()):
+        if name.split(" ")[0] in ADMIN_COMMANDS:
+            continue
+        if any(p.required for p in cmd.parameters):
+            continue
+        mix.append((Call(name, {}), 1.0))
+    return mix
+
+
+def load_mix(path: str) -> List[Tuple[Call, float]]:
+    with open(path, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [(Call(r["command"], dict(r.get("options") or {})), float(r.get("weight", 1.0))) for r in rows]
+
+
+def load_trace(path: str) -> List[Call]:
+    calls: List[Call] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                ev = json.loads(line)
+            except Exception:
+                continue
+            if ev.get("event") != "command" or not ev.get("command"):
+                continue
+            calls.append(Call(ev["command"], dict(ev.get("options") or {}), ev.get("user_id"),
+                              float(ev.get("t") or ev.get("ts") or 0)))
+    if not calls:
+        return calls
+    calls.sort(key=lambda c: c.at)
+    t0 = calls[0].at
+    return [Call(c.command, c.options, c.user_id, c.at - t0) for c in calls]
+
+
+class Runner:
+    def __init__(self, commands: Dict[str, Any], users: int, seed: int = 0) -> None:
+        self.commands = commands
+        self.users = users
+        self.rng = random.Random(seed)
+        self.rec = Recorder()
+        self.unknown: Dict[str, int] = {}
+
+    async def one(self, call: Call) -> None:
+        cmd = self.commands.get(call.command)
+        if cmd is None:
+            self.unknown[call.command] = self.unknown.get(call.command, 0) + 1
+            return
+        uid = call.user_id if call.user_id is not None else self.rng.randrange(1, self.users + 1)
+        interaction = FakeInteraction(user_id=uid)
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            await invoke(cmd, interaction, call.options)
+        except Exception:
+            ok = False
+        self.rec.record(call.command, time.perf_counter() - t0, ok and not interaction.errored)
+
+    def _pick(self, mix: List[Tuple[Call, float]]) -> Call:
+        return self.rng.choices([c for c, _ in mix], weights=[w for _, w in mix])[0]
+
+    async def closed_loop(self, mix: List[Tuple[Call, float]], concurrency: int, requests: int, duration: float) -> None:
+        deadline = time.perf_counter() + duration if duration else None
+        issued = 0
+
+        async def worker() -> None:
+            nonlocal issued
+            while (not requests or issued < requests) and (deadline is None or time.perf_counter() < deadline):
+                issued += 1
+                await self.one(self._pick(mix))
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, mix: List[Tuple[Call, float]], rate: float, requests: int, duration: float) -> None:
+        tasks: List[asyncio.Task] = []
+        start = time.perf_counter()
+        next_at = 0.0
+        issued = 0
+        while (not requests or issued < requests) and (not duration or next_at < duration):
+            delay = start + next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.one(self._pick(mix))))
+            issued += 1
+            next_at += self.rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+
+    async def replay(self, calls: List[Call], speed: float) -> None:
+        tasks: List[asyncio.Task] = []
+        start = time.perf_counter()
+        for c in calls:
+            delay = start + c.at / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.one(c)))
+        await asyncio.gather(*tasks)
+
+
+def _summary(h: LatencyHistogram) -> Dict[str, float]:
+    return {
+        "count": h.count,
+        "mean_ms": (h.total / h.count * 1000) if h.count else 0.0,
+        "p50_ms": h.quantile(0.5) * 1000,
+        "p90_ms": h.quantile(0.9) * 1000,
+        "p99_ms": h.quantile(0.99) * 1000,
+        "max_ms": h.max * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    exclude = [m.strip() for m in args.exclude.split(",") if m.strip()]
+    _, commands = build_tree(args.data_dir, cooldown_seconds=args.cooldown, exclude=exclude)
+    runner = Runner(commands, users=args.users, seed=args.seed)
+
+    lag = LatencyHistogram()
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_loop_lag(stop, lag))
+    t0 = time.perf_counter()
+    if args.trace:
+        mode = "replay"
+        await runner.replay(load_trace(args.trace), args.speed)
+    else:
+        mix = load_mix(args.mix) if args.mix else default_mix(commands)
+        if not mix:
+            raise SystemExit("No commands to run (empty mix).")
+        if args.rate:
+            mode = "open"
+            await runner.open_loop(mix, args.rate, args.requests, args.duration)
+        else:
+            mode = "closed"
+            await runner.closed_loop(mix, args.concurrency, args.requests, args.duration)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await lag_task
+
+    rec = runner.rec
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "completed": rec.completed,
+        "throughput_per_s": rec.completed / elapsed if elapsed else 0.0,
+        "errors": rec.errors,
+        "unknown_commands": runner.unknown,
+        "latency": _summary(rec.overall),
+        "by_command": {k: _summary(h) for k, h in sorted(rec.by_command.items())},
+        "loop_lag": _summary(lag),
+    }
+
+
+def render(report: Dict[str, Any]) -> str:
+    lat, lag = report["latency"], report["loop_lag"]
+    lines = [
+        f"mode={report['mode']} completed={report['completed']} in {report['elapsed_s']:.2f}s "
+        f"-> {report['throughput_per_s']:.1f} cmd/s, errors={sum(report['errors'].values())}",
+        f"latency  p50={lat['p50_ms']:.2f}ms p90={lat['p90_ms']:.2f}ms p99={lat['p99_ms']:.2f}ms max={lat['max_ms']:.2f}ms",
+        f"loop lag p50={lag['p50_ms']:.2f}ms p99={lag['p99_ms']:.2f}ms max={lag['max_ms']:.2f}ms",
+        "",
+        f"{'command':<32} {'n':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'err':>5}",
+    ]
+    for name, s in report["by_command"].items():
+        lines.append(f"{name:<32} {s['count']:>7} {s['p50_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f} "
+                     f"{report['errors'].get(name, 0):>5}")
+    for name, n in report["unknown_commands"].items():
+        lines.append(f"unknown command in mix/trace: {name} (x{n})")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Offline slash-command load test.")
+    ap.add_argument("--data-dir", default=os.getenv("DATA_DIR", "data"))
+    ap.add_argument("--exclude", default="", help="Comma-separated registrar modules to skip.")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--rate", type=float, default=0.0, help="Open-loop arrivals per second (Poisson).")
+    ap.add_argument("--requests", type=int, default=2000, help="Stop after this many commands (0 = no limit).")
+    ap.add_argument("--duration", type=float, default=0.0, help="Stop after this many seconds (0 = no limit).")
+    ap.add_argument("--mix", default="", help="JSON command mix file.")
+    ap.add_argument("--trace", default="", help="Replay {'event': 'command'} records from a JSONL trace.")
+    ap.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier.")
+    ap.add_argument("--users", type=int, default=10000, help="Distinct simulated user ids.")
+    ap.add_argument("--cooldown", type=int, default=0, help="Rate-limiter cooldown for the simulated bot.")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="", help="Also write the report as JSON here.")
+    ap.add_argument("--fake-upstreams", default="", metavar="PROFILE",
+                    help="Serve external APIs locally with this profile, e.g. latency_ms=50,error_rate=0.05 "
+                         "('latency_ms=0' for no injected delay).")
+    args = ap.parse_args()
+    if not args.requests and not args.duration and not args.trace:
+        ap.error("set --requests or --duration")
+
+    with contextlib.ExitStack() as stack:
+        if args.fake_upstreams:
+            from benchmarks.fake_upstreams import FakeUpstreams, parse_profile
+
+            fake = stack.enter_context(FakeUpstreams(parse_profile(args.fake_upstreams)))
+            stack.enter_context(fake.patched_env())
+        report = asyncio.run(run(args))
+        if args.fake_upstreams:
+            report["upstreams"] = fake.stats()
+    print(render(report))
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
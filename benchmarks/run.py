@@ -0,0 +1,225 @@
+"""Run the registry hot-path benchmarks against synthetic datasets.
+
+Usage
+-----
+python -m benchmarks.run --rows 1k,100k
+python -m benchmarks.run --rows 1k,100k,1m --only pick_random_jsonl
+python -m benchmarks.run --rows 1k --compare .cache/bench/baseline.json --threshold 0.15
+
+Results are written as JSON (default .cache/bench/results-<utc stamp>.json).
+With --compare, the run exits 1 when any median regresses past --threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import harness, synth
+
+Setup = Callable[[str], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Bench:
+    name: str
+    setup: Setup                    # dataset dir -> zero-arg callable to time
+    max_rows: Optional[int] = None  # skip larger datasets (quadratic or very slow paths)
+
+
+def _load_registry_items(root: str) -> Callable[[], Any]:
+    from services.registry_loader import load_registry_items
+
+    path = Path(root, "heritage_registry.json")
+    return lambda: load_registry_items(path, "items")
+
+
+def _pick_random(root: str) -> Callable[[], Any]:
+    from services.random_picker import pick_random
+    from services.registry_loader import load_registry_items
+
+    items = load_registry_items(Path(root, "heritage_registry.json"), "items")
+    return lambda: pick_random(items)
+
+
+def _pick_random_filtered(root: str) -> Callable[[], Any]:
+    from services.random_picker import pick_random
+    from services.registry_loader import load_registry_items
+
+    items = load_registry_items(Path(root, "heritage_registry.json"), "items")
+    return lambda: pick_random(items, predicate=lambda x: len(x.get("sources", [])) > 1)
+
+
+def _pick_random_jsonl(root: str) -> Callable[[], Any]:
+    from services.random_picker import pick_random_jsonl
+
+    path = Path(root, "whc", "whc_sites.jsonl")
+    return lambda: pick_random_jsonl(path)
+
+
+def _entry_embed(root: str) -> Callable[[], Any]:
+    from services.embed_factory import entry_embed
+    from services.registry_loader import load_registry_items
+
+    items = load_registry_items(Path(root, "heritage_registry.json"), "items")[:1000]
+    return lambda: entry_embed("Heritage", random.choice(items))
+
+
+def _pick_pair(root: str) -> Callable[[], Any]:
+    from core.hand_drawn_selector import pick_pair
+
+    path = os.path.join(root, "hand_drawn_pool.json")
+    pick_pair(path, "ink")  # compile once; the timed path is the warm lookup
+
+    def run() -> Any:
+        pick_pair(path)
+        return pick_pair(path, "ink")
+    return run
+
+
+def _find_term(root: str) -> Callable[[], Any]:
+    from core.glossary import find_term, load_glossary
+
+    path = os.path.join(root, "glossary.json")
+    terms = [t["term"] for t in load_glossary(path)["terms"]]
+    rng = random.Random(1)
+    queries = [rng.choice(terms) for _ in range(16)] + ["marble", "zz-no-such-term"]
+
+    def run() -> Any:
+        for q in queries:
+            find_term(path, q)
+    return run
+
+
+def _build_registry_cold(root: str) -> Callable[[], Any]:
+    from core.source_registry import build_registry
+
+    tree = os.path.join(root, "tree")
+    return lambda: build_registry(tree)
+
+
+def _build_registry_warm(root: str) -> Callable[[], Any]:
+    from core.source_registry import build_registry
+
+    tree = os.path.join(root, "tree")
+    manifest = os.path.join(tempfile.mkdtemp(prefix="bench-manifest-"), "manifest.json")
+    build_registry(tree, manifest_path=manifest)
+    return lambda: build_registry(tree, manifest_path=manifest)
+
+
+def _merge_instrument_examples(root: str) -> Callable[[], Any]:
+    spec = importlib.util.spec_from_file_location("merge_instrument_examples",
+                                                  os.path.join(ROOT, "scripts", "merge_instrument_examples.py"))
+    mod = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(mod)
+
+    work = tempfile.mkdtemp(prefix="bench-merge-")
+    entities = os.path.join(work, "instrument_entities.json")
+    src = os.path.join(root, "instruments", "instrument_entities.json")
+    cfg_path = os.path.join(work, "merge.json")
+    with open(cfg_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "entities_path": entities,
+            "smithsonian_cache_jsonl": os.path.join(root, "instruments", "cache", "smithsonian_examples.jsonl"),
+            "vam_cache_jsonl": os.path.join(root, "instruments", "cache", "vam_examples.jsonl"),
+            "max_examples_per_provider": 2,
+            "max_total_examples": 5,
+        }, f)
+
+    def run() -> Any:
+        shutil.copyfile(src, entities)
+        argv = sys.argv
+        sys.argv = ["merge_instrument_examples.py", "--config", cfg_path]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return mod.main()
+        finally:
+            sys.argv = argv
+    return run
+
+
+BENCHMARKS: List[Bench] = [
+    Bench("registry_loader.load_registry_items", _load_registry_items),
+    Bench("random_picker.pick_random", _pick_random),
+    Bench("random_picker.pick_random[predicate]", _pick_random_filtered),
+    Bench("random_picker.pick_random_jsonl", _pick_random_jsonl),
+    Bench("embed_factory.entry_embed", _entry_embed),
+    Bench("hand_drawn_selector.pick_pair", _pick_pair),
+    Bench("glossary.find_term[x18]", _find_term),
+    Bench("source_registry.build_registry[cold]", _build_registry_cold),
+    Bench("source_registry.build_registry[manifest]", _build_registry_warm),
+    # Entities x records keyword scan: quadratic, so capped.
+    Bench("scripts.merge_instrument_examples", _merge_instrument_examples, max_rows=10_000),
+]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Registry hot-path benchmarks on synthetic data.")
+    ap.add_argument("--rows", default="1k,100k", help="Dataset sizes, e.g. 1k,100k,1m")
+    ap.add_argument("--only", default="", help="Comma-separated substrings of benchmark names to run.")
+    ap.add_argument("--data", default=synth.DEFAULT_OUT, help="Where synthetic datasets are generated/cached.")
+    ap.add_argument("--out", default="", help="Results JSON path (default .cache/bench/results-<stamp>.json).")
+    ap.add_argument("--compare", default="", help="Baseline results JSON to compare against.")
+    ap.add_argument("--threshold", type=float, default=0.10, help="Allowed median slowdown vs baseline (0.10 = 10%%).")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    only = [s.strip() for s in args.only.split(",") if s.strip()]
+    selected = [b for b in BENCHMARKS if not only or any(s in b.name for s in only)]
+    results: List[harness.Result] = []
+    skipped: Dict[str, str] = {}
+
+    for rows in synth.parse_sizes(args.rows):
+        t0 = time.perf_counter()
+        root = synth.generate(rows, args.data)
+        print(f"[{rows} rows] dataset ready in {time.perf_counter() - t0:.1f}s: {root}", file=sys.stderr)
+        for b in selected:
+            key = f"{b.name}@{rows}"
+            if b.max_rows is not None and rows > b.max_rows:
+                skipped[key] = f"rows > {b.max_rows}"
+                continue
+            random.seed(0)
+            try:
+                fn = b.setup(root)
+                stats = harness.measure(fn, repeat=args.repeat)
+            except ImportError as e:
+                skipped[key] = f"missing dependency: {e}"
+                continue
+            r = harness.Result(name=b.name, rows=rows, **stats)
+            results.append(r)
+            print(f"  {b.name:<40} {harness._fmt(r.median):>10}", file=sys.stderr)
+
+    out = args.out or os.path.join(".cache", "bench", f"results-{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}.json")
+    harness.save(out, results, skipped)
+
+    baseline = harness.load(args.compare) if args.compare else None
+    print(harness.table(results, baseline))
+    for key, why in skipped.items():
+        print(f"skipped {key}: {why}")
+    print(f"results: {out}")
+    if baseline is not None:
+        regressions = harness.compare(baseline, results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+"""Synthetic registries shaped like the files under data/, at arbitrary row counts.
+
+Output is deterministic for a given (rows, seed), so runs at the same size are
+comparable. Layout under <out>/<rows>/:
+
+  heritage_registry.json          {"items": [...]}            load_registry_items / entry_embed
+  whc/whc_sites.jsonl             one site per line           pick_random_jsonl
+  hand_drawn_pool.json            techniques + tools          hand_drawn_selector.pick_pair
+  glossary.json                   {"terms": [...]}            glossary.find_term
+  tree/part-NNN.json              nested records with URLs    source_registry.build_registry
+  instruments/...                 entities + museum caches    merge_instrument_examples
+
+Usage
+-----
+python -m benchmarks.synth --rows 1000,100000 [--out .cache/bench_data]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+DEFAULT_OUT = os.path.join(".cache", "bench_data")
+
+_WORDS = (
+    "alba basilica canal castello duomo fresco giardino loggia mosaico palazzo piazza "
+    "ponte portico rocca teatro torre villa arch atlas bronze cedar delta ember forge "
+    "glacier harbor ivory juniper kiln lagoon marble nectar onyx quarry reef saffron "
+    "terrace umber vault willow zenith"
+).split()
+_COUNTRIES = ("Italy", "France", "Japan", "Peru", "Egypt", "India", "Mexico", "Spain", "Greece", "China")
+_CATEGORIES = ("Cultural", "Natural", "Mixed")
+_HOSTS = ("whc.unesco.org", "www.uffizi.it", "www.metmuseum.org", "www.ox.ac.uk", "collections.vam.ac.uk",
+          "www.si.edu", "example.edu", "museum.example.org")
+_TAGS = ("line", "shading", "anime", "cartoon", "timing", "layout", "ink", "color", "pose", "perspective")
+
+
+def _name(rng: random.Random, i: int, words: int = 3) -> str:
+    return " ".join(rng.choice(_WORDS).title() for _ in range(words)) + f" {i}"
+
+
+def _url(rng: random.Random, i: int) -> str:
+    return f"https://{rng.choice(_HOSTS)}/item/{i}"
+
+
+def whc_rows(rows: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for i in range(rows):
+        yield {
+            "id_no": i,
+            "name": _name(rng, i),
+            "country": rng.choice(_COUNTRIES),
+            "category": rng.choice(_CATEGORIES),
+            "year_inscribed": rng.randint(1978, 2025),
+            "criteria": sorted(rng.sample(["i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x"], 2)),
+            "whc_url": f"https://whc.unesco.org/en/list/{i}",
+        }
+
+
+def registry_items(rows: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": _name(rng, i),
+            "description": " ".join(rng.choice(_WORDS) for _ in range(20)),
+            "sources": [{"label": f"Source {k}", "url": _url(rng, i * 3 + k)} for k in range(rng.randint(1, 3))],
+        }
+        for i in range(rows)
+    ]
+
+
+def hand_drawn_pool(rows: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    n_tools = max(10, rows // 4)
+    tools = [{"id": f"tool_{i}", "name": _name(rng, i, 2), "tags": rng.sample(_TAGS, 3)} for i in range(n_tools)]
+    techniques = [
+        {
+            "id": f"tech_{i}",
+            "name": _name(rng, i, 2),
+            "tags": rng.sample(_TAGS, 3),
+            "recommended_tools": [f"tool_{rng.randrange(n_tools)}" for _ in range(3)],
+        }
+        for i in range(rows)
+    ]
+    return {"techniques": techniques, "tools": tools}
+
+
+def glossary(rows: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {"terms": [{"term": _name(rng, i, 2), "definition": " ".join(rng.choice(_WORDS) for _ in range(20))}
+                      for i in range(rows)]}
+
+
+def url_tree_files(rows: int, files: int, seed: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    per = max(1, rows // files)
+    for f in range(files):
+        yield [{"name": _name(rng, i), "meta": {"links": [_url(rng, f * per + i)], "nested": {"url": _url(rng, i)}}}
+               for i in range(per)]
+
+
+def instrument_set(rows: int, seed: int = 0) -> Dict[str, Any]:
+    """Entities (rows // 100, at least 10) and museum cache records (rows each provider)."""
+    rng = random.Random(seed)
+    n_ent = max(10, rows // 100)
+    names = [f"{rng.choice(_WORDS)}{i}" for i in range(n_ent)]
+    entities = [{"instrument_id": f"inst_{n}", "common_name": n.title(), "hs_code": f"{rng.randint(100, 599)}.{i}",
+                 "examples": []} for i, n in enumerate(names)]
+
+    def records(provider: str) -> List[Dict[str, Any]]:
+        return [{"title": f"{rng.choice(names).title()} {rng.choice(_WORDS)}",
+                 "description": " ".join(rng.choice(_WORDS) for _ in range(12)),
+                 "keywords": [rng.choice(names)],
+                 "url": f"https://{provider}.example.org/object/{i}"} for i in range(rows)]
+
+    return {"entities": {"items": entities}, "smithsonian": records("si"), "vam": records("vam")}
+
+
+def _dump(path: str, obj: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def _dump_jsonl(path: str, rows: Iterator[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def generate(rows: int, out: str = DEFAULT_OUT, seed: int = 0, force: bool = False) -> str:
+    """Write the dataset for `rows` (skipped if already complete); returns its directory."""
+    root = os.path.join(out, str(rows))
+    marker = os.path.join(root, ".complete")
+    if os.path.exists(marker) and not force:
+        return root
+    _dump_jsonl(os.path.join(root, "whc", "whc_sites.jsonl"), whc_rows(rows, seed))
+    _dump(os.path.join(root, "heritage_registry.json"), {"items": registry_items(rows, seed)})
+    _dump(os.path.join(root, "hand_drawn_pool.json"), hand_drawn_pool(rows, seed))
+    _dump(os.path.join(root, "glossary.json"), glossary(rows, seed))
+    files = max(1, min(200, rows // 500))
+    for i, part in enumerate(url_tree_files(rows, files, seed)):
+        _dump(os.path.join(root, "tree", f"part-{i:03d}.json"), part)
+    inst = instrument_set(rows, seed)
+    _dump(os.path.join(root, "instruments", "instrument_entities.json"), inst["entities"])
+    _dump_jsonl(os.path.join(root, "instruments", "cache", "smithsonian_examples.jsonl"), iter(inst["smithsonian"]))
+    _dump_jsonl(os.path.join(root, "instruments", "cache", "vam_examples.jsonl"), iter(inst["vam"]))
+    with open(marker, "w", encoding="utf-8") as f:
+        f.write(str(rows))
+    return root
+
+
+def parse_sizes(spec: str) -> List[int]:
+    """'1k,100k,1m' -> [1000, 100000, 1000000]."""
+    out: List[int] = []
+    for part in spec.split(","):
+        p = part.strip().lower()
+        if not p:
+            continue
+        mult = {"k": 1_000, "m": 1_000_000}.get(p[-1], 1)
+        out.append(int(float(p[:-1] if mult > 1 else p) * mult))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate synthetic benchmark registries.")
+    ap.add_argument("--rows", default="1k,100k", help="Comma-separated sizes, e.g. 1k,100k,1m")
+    ap.add_argument("--out", default=DEFAULT_OUT)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--force", action="store_true", help="Regenerate even if the dataset exists.")
+    args = ap.parse_args()
+    for rows in parse_sizes(args.rows):
+        print(generate(rows, args.out, args.seed, args.force))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,33 +1,50 @@
 from __future__ import annotations
 
-import discord
+import importlib
+from typing import Optional, Tuple
+
 from discord import app_commands
 from discord.ext import commands as dcommands
 
-from commands.heritage import register_heritage
-from commands.chocolate import register_chocolate
-from commands.japanbrands import register_japanbrands
-from commands.instrument import register_instrument
-from commands.console_history import register_history_of_the_consoles
-from commands.early_games import register_first_and_early_games_from_the_history
-from commands.legacy_suite import register_legacy_suite
+from utils.command_profiler import profile_tree
+from utils.metrics import instrument_tree
 from utils.rate_limit import RateLimiter
+from utils.startup_profile import StartupProfiler, maybe_section
+
+
+# (module, registrar, signature). Command modules only declare their groups and
+# option signatures at registration; services and datasets are imported inside
+# the handlers on first use, so importing this package stays cheap.
+#   "tree": registrar(tree, data_dir, limiter)
+#   "bot":  registrar(bot, data_dir)
+_REGISTRARS: Tuple[Tuple[str, str, str], ...] = (
+    ("commands.heritage", "register_heritage", "tree"),
+    ("commands.chocolate", "register_chocolate", "tree"),
+    ("commands.japanbrands", "register_japanbrands", "tree"),
+    ("commands.instrument", "register_instrument", "tree"),
+    # Additional curated modules (renamed; no Bottany naming retained)
+    ("commands.console_history", "register_history_of_the_consoles", "bot"),
+    ("commands.early_games", "register_first_and_early_games_from_the_history", "bot"),
+    # Legacy suite: previously developed commands migrated into this repo.
+    ("commands.legacy_suite", "register_legacy_suite", "bot"),
+    ("commands.stats", "register_stats", "tree"),
+)
 
 
-def register_all_commands(bot: dcommands.Bot, tree: app_commands.CommandTree, data_dir: str, limiter: RateLimiter) -> None:
+def register_all_commands(bot: dcommands.Bot, tree: app_commands.CommandTree, data_dir: str, limiter: RateLimiter,
+                          profiler: Optional[StartupProfiler] = None) -> None:
     """Register all bot commands.
 
     Keep main.py minimal by concentrating command wiring here.
     """
-    register_heritage(tree, data_dir, limiter)
-    register_chocolate(tree, data_dir, limiter)
-    register_japanbrands(tree, data_dir, limiter)
-    register_instrument(tree, data_dir, limiter)
-
-    # Additional curated modules (renamed; no Bottany naming retained)
-    register_history_of_the_consoles(bot, data_dir)
-    register_first_and_early_games_from_the_history(bot, data_dir)
-
-    # Legacy suite: previously developed commands migrated into this repo.
-    register_legacy_suite(bot, data_dir)
-
+    for module_name, func_name, kind in _REGISTRARS:
+        with maybe_section(profiler, f"register {module_name}"):
+            register = getattr(importlib.import_module(module_name), func_name)
+            if kind == "tree":
+                register(tree, data_dir, limiter)
+            else:
+                register(bot, data_dir)
+    # Every slash command records latency and errors (utils.metrics, /stats) and
+    # can be profiled on demand (utils.command_profiler, /profile).
+    profile_tree(tree)
+    instrument_tree(tree)
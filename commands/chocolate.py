@@ -6,9 +6,6 @@ from pathlib import Path
 import discord
 from discord import app_commands
 
-from services.embed_factory import entry_embed
-from services.random_picker import pick_random
-from services.registry_loader import load_registry_items
 from utils.rate_limit import RateLimiter
 
 
@@ -21,10 +18,12 @@ def register_chocolate(tree: app_commands.CommandTree, data_dir: str, limiter: R
     async def random_chocolate(interaction: discord.Interaction) -> None:
         try:
             limiter.check(f"chocolate:{interaction.user.id}")
-            items = load_registry_items(Path(reg_path), "items")
-            entry = pick_random(items)
-            emb = entry_embed("Chocolate", entry)
-            await interaction.response.send_message(embed=emb)
+            # Deferred: services load on first use, not at bot startup.
+            from services.payload_cache import compile_registry_async
+            from services.registry_loader import load_registry_items
+
+            compiled = await compile_registry_async("chocolate", Path(reg_path), "Chocolate", lambda p: load_registry_items(p, "items"))
+            await interaction.response.send_message(embed=compiled.random_embed())
         except Exception as e:
             await interaction.response.send_message(f"Error: {e}", ephemeral=True)
 
@@ -6,6 +6,8 @@ import random
 import discord
 from discord import app_commands
 
+from utils import executors
+
 REG_FILE = "consoles_registry.json"
 
 def _load_items(data_dir: str) -> list[dict]:
@@ -29,7 +31,14 @@ def register_history_of_the_consoles(bot: discord.Client, data_dir: str) -> None
     @console.command(name="random", description="Shows a random game console from history.")
     async def random_console(interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=False)
-        items = _load_items(data_dir)
+        try:
+            items = await executors.run("files", _load_items, data_dir)
+        except executors.BulkheadFull as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        except Exception as e:
+            await interaction.followup.send(f"Error: {e}", ephemeral=True)
+            return
         if not items:
             await interaction.followup.send("Console registry is empty.", ephemeral=False)
             return
@@ -2,10 +2,19 @@ from __future__ import annotations
 
 import os
 import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
 import discord
 from discord import app_commands
 
+from services.registry_loader import dataset_version
+from utils import executors
+
 REG_FILE = "first_games_registry.json"
+TEXT_LIMIT = 3900
 
 def _load_items(data_dir: str) -> list[dict]:
     path = os.path.join(data_dir, REG_FILE)
@@ -21,6 +30,90 @@ def _fmt_source(item: dict) -> str:
         return f"[{src}]({url})"
     return src or url or "—"
 
+def _sort_key(g: dict) -> tuple:
+    y = g.get("release_year", 9999)
+    return (y if isinstance(y, int) else 9999, str(g.get("title", "")))
+
+def _clip(text: str) -> str:
+    return text[:TEXT_LIMIT] + "\n…" if len(text) > TEXT_LIMIT else text
+
+@dataclass(frozen=True)
+class _GamesIndex:
+    """Games registry indexed once per file version.
+
+    `ordered` is presorted by (release_year, title); `year_slices` maps each
+    year to its [start, end) range in `ordered`, so /games first100 and
+    /games by_year never sort or scan per request.
+    """
+    version: Tuple[int, int]
+    ordered: Tuple[dict, ...]
+    years: Tuple[int, ...]
+    year_slices: Dict[int, Tuple[int, int]]
+    histogram: Dict[int, int]
+    first100_title: str
+    first100_text: str
+    summary_text: str
+    year_pages: Dict[int, str]
+
+    def year_items(self, year: int) -> Tuple[dict, ...]:
+        start, end = self.year_slices.get(year, (0, 0))
+        return self.ordered[start:end]
+
+def _build_index(items: List[dict], version: Tuple[int, int]) -> _GamesIndex:
+    ordered = tuple(sorted(items, key=_sort_key))
+    keys = [_sort_key(g)[0] for g in ordered]
+
+    # Only real int years get a bucket (9999 is the missing-year sort sentinel).
+    years = tuple(sorted({g["release_year"] for g in ordered if isinstance(g.get("release_year"), int)}))
+    year_slices = {y: (bisect_left(keys, y), bisect_right(keys, y)) for y in years}
+    histogram = {y: e - s for y, (s, e) in year_slices.items()}
+
+    lines = []
+    for i, g in enumerate(ordered[:100], start=1):
+        y = g.get("release_year", "—")
+        t = g.get("title", "Untitled")
+        plat = g.get("platform", "")
+        tail = f" — {plat}" if plat else ""
+        lines.append(f"{i}. **{t}** ({y}){tail}")
+
+    summary = [f"**{y}**: {histogram[y]} game(s)" for y in years] or ["No year data found."]
+
+    year_pages: Dict[int, str] = {}
+    for y, (start, end) in year_slices.items():
+        page = []
+        for g in ordered[start:min(end, start + 80)]:
+            t = g.get("title", "Untitled")
+            plat = g.get("platform", "")
+            pub = g.get("publisher", "")
+            parts = [p for p in [plat, pub] if p]
+            tail = " — ".join(parts)
+            page.append(f"• **{t}**" + (f" — {tail}" if tail else ""))
+        year_pages[y] = "\n".join(page)[:TEXT_LIMIT]
+
+    return _GamesIndex(
+        version=version,
+        ordered=ordered,
+        years=years,
+        year_slices=year_slices,
+        histogram=histogram,
+        first100_title=f"First {min(100, len(ordered))} commercially released games (curated)",
+        first100_text=_clip("\n".join(lines)),
+        summary_text="\n".join(summary)[:TEXT_LIMIT],
+        year_pages=year_pages,
+    )
+
+# path -> index for the current file version
+_INDEX: Dict[str, _GamesIndex] = {}
+
+def _get_index(data_dir: str) -> _GamesIndex:
+    path = os.path.join(data_dir, REG_FILE)
+    version = dataset_version(Path(path))
+    idx = _INDEX.get(path)
+    if idx is None or idx.version != version:
+        idx = _build_index(_load_items(data_dir), version)
+        _INDEX[path] = idx
+    return idx
+
 def register_first_and_early_games_from_the_history(bot: discord.Client, data_dir: str) -> None:
     """Registers /games first100 and /games by_year"""
     games = app_commands.Group(name="games", description="First and early commercially released games (curated).")
@@ -28,30 +121,19 @@ def register_first_and_early_games_from_the_history(bot: discord.Client, data_di
     @games.command(name="first100", description="Lists up to the first 100 commercially released games (curated).")
     async def first100(interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=False)
-        items = _load_items(data_dir)
-        if not items:
+        try:
+            idx = await executors.run("files", _get_index, data_dir)
+        except executors.BulkheadFull as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        except Exception as e:
+            await interaction.followup.send(f"Error: {e}", ephemeral=True)
+            return
+        if not idx.ordered:
             await interaction.followup.send("First-games registry is empty.", ephemeral=False)
             return
 
-        items = sorted(items, key=lambda x: (x.get("release_year", 9999), x.get("title", "")))
-        top = items[:100]
-
-        lines = []
-        for i, g in enumerate(top, start=1):
-            y = g.get("release_year", "—")
-            t = g.get("title", "Untitled")
-            plat = g.get("platform", "")
-            tail = f" — {plat}" if plat else ""
-            lines.append(f"{i}. **{t}** ({y}){tail}")
-
-        text = "\n".join(lines)
-        if len(text) > 3900:
-            text = text[:3900] + "\n…"
-
-        embed = discord.Embed(
-            title=f"First {min(100, len(items))} commercially released games (curated)",
-            description=text,
-        )
+        embed = discord.Embed(title=idx.first100_title, description=idx.first100_text)
         embed.set_footer(text="Curated list with references. Expand the dataset to reach 100 entries.")
         await interaction.followup.send(embed=embed, ephemeral=False)
 
@@ -59,46 +141,35 @@ def register_first_and_early_games_from_the_history(bot: discord.Client, data_di
     @app_commands.describe(year="Optional year filter (leave empty for summary).")
     async def by_year(interaction: discord.Interaction, year: int | None = None):
         await interaction.response.defer(ephemeral=False)
-        items = _load_items(data_dir)
-        if not items:
+        try:
+            idx = await executors.run("files", _get_index, data_dir)
+        except executors.BulkheadFull as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        except Exception as e:
+            await interaction.followup.send(f"Error: {e}", ephemeral=True)
+            return
+        if not idx.ordered:
             await interaction.followup.send("First-games registry is empty.", ephemeral=False)
             return
 
         if year is None:
-            counts: dict[int, int] = {}
-            for g in items:
-                y = g.get("release_year")
-                if isinstance(y, int):
-                    counts[y] = counts.get(y, 0) + 1
-            years = sorted(counts.keys())
-            lines = [f"**{y}**: {counts[y]} game(s)" for y in years] or ["No year data found."]
             embed = discord.Embed(
                 title="First commercially released games by year (curated)",
-                description="\n".join(lines)[:3900],
+                description=idx.summary_text,
             )
             embed.set_footer(text="Use /games by_year <year> to list entries for a specific year.")
             await interaction.followup.send(embed=embed, ephemeral=False)
             return
 
-        filtered = [g for g in items if g.get("release_year") == year]
-        filtered = sorted(filtered, key=lambda x: x.get("title", ""))
-
-        if not filtered:
+        page = idx.year_pages.get(year)
+        if not page:
             await interaction.followup.send(f"No entries found for {year}.", ephemeral=False)
             return
 
-        lines = []
-        for g in filtered[:80]:
-            t = g.get("title", "Untitled")
-            plat = g.get("platform", "")
-            pub = g.get("publisher", "")
-            parts = [p for p in [plat, pub] if p]
-            tail = " — ".join(parts)
-            lines.append(f"• **{t}**" + (f" — {tail}" if tail else ""))
-
         embed = discord.Embed(
             title=f"Early commercially released games — {year} (curated)",
-            description="\n".join(lines)[:3900],
+            description=page,
         )
         embed.set_footer(text="Sources included per entry where available.")
         await interaction.followup.send(embed=embed, ephemeral=False)
@@ -2,16 +2,34 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Any, Dict, List
 
 import discord
 from discord import app_commands
 
-from services.embed_factory import entry_embed
-from services.random_picker import pick_random_jsonl, pick_random
-from services.registry_loader import load_registry_items
 from utils.rate_limit import RateLimiter
 
 
+def _normalize_whc(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a UNESCO WHC JSONL row to the embed schema expected by entry_payload."""
+    return {
+        "name": entry.get("name"),
+        "description": (
+            f"**State Party:** {entry.get('country') or 'Unknown'}\n"
+            f"**Category:** {entry.get('category') or 'Unknown'}\n"
+            f"**Year inscribed:** {entry.get('year_inscribed') or 'Unknown'}\n"
+            f"**Criteria:** {', '.join(entry.get('criteria', []) or []) or 'Unknown'}"
+        ),
+        "sources": [{"label": "UNESCO WHC (official)", "url": entry.get("whc_url")}],
+    }
+
+
+def _load_whc(path: Path) -> List[Dict[str, Any]]:
+    from services.registry_loader import iter_jsonl
+
+    return [o for o in iter_jsonl(path) if o.get("whc_url") and o.get("name")]
+
+
 def register_heritage(tree: app_commands.CommandTree, data_dir: str, limiter: RateLimiter) -> None:
     # Fallback curated registry
     curated_path = os.path.join(data_dir, "heritage_registry.json")
@@ -24,30 +42,21 @@ def register_heritage(tree: app_commands.CommandTree, data_dir: str, limiter: Ra
     async def random_heritage(interaction: discord.Interaction) -> None:
         try:
             limiter.check(f"heritage:{interaction.user.id}")
+            # Deferred: services load on first use, not at bot startup.
+            from services.payload_cache import compile_registry_async
+            from services.registry_loader import load_registry_items
 
             if os.path.exists(whc_jsonl):
                 # Prefer official UNESCO WHC-derived dataset when available.
-                entry = pick_random_jsonl(
-                    Path(whc_jsonl),
-                    predicate=lambda o: bool(o.get("whc_url")) and bool(o.get("name")),
-                )
-                # Normalize to embed format expected by entry_embed
-                entry = {
-                    "name": entry.get("name"),
-                    "description": (
-                        f"**State Party:** {entry.get('country') or 'Unknown'}\n"
-                        f"**Category:** {entry.get('category') or 'Unknown'}\n"
-                        f"**Year inscribed:** {entry.get('year_inscribed') or 'Unknown'}\n"
-                        f"**Criteria:** {', '.join(entry.get('criteria', []) or []) or 'Unknown'}"
-                    ),
-                    "sources": [{"label": "UNESCO WHC (official)", "url": entry.get("whc_url")}],
-                }
+                compiled = await compile_registry_async("heritage:whc", Path(whc_jsonl), "Heritage", _load_whc, _normalize_whc)
+                if not len(compiled):
+                    raise RuntimeError(f"No eligible items found in JSONL: {whc_jsonl}")
             else:
-                items = load_registry_items(Path(curated_path), "items")
-                entry = pick_random(items)
+                compiled = await compile_registry_async(
+                    "heritage:curated", Path(curated_path), "Heritage", lambda p: load_registry_items(p, "items")
+                )
 
-            emb = entry_embed("Heritage", entry)
-            await interaction.response.send_message(embed=emb)
+            await interaction.response.send_message(embed=compiled.random_embed())
         except Exception as e:
             await interaction.response.send_message(f"Error: {e}", ephemeral=True)
 
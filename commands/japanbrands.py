@@ -2,19 +2,22 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Any, Dict
 
 import discord
 from discord import app_commands
 
-import random
-
-from services.embed_factory import entry_embed
-from services.registry_loader import load_json, load_registry_items
-from services.verification import filter_verified_official_items
-from services.random_picker import pick_random
 from utils.rate_limit import RateLimiter
 
 
+def _normalize_official(picked: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": picked.get("brand_name"),
+        "description": (picked.get("description") or "").strip(),
+        "sources": [{"label": "Official site", "url": picked.get("official_url")}],
+    }
+
+
 def register_japanbrands(tree: app_commands.CommandTree, data_dir: str, limiter: RateLimiter) -> None:
     legacy_path = os.path.join(data_dir, "japan_only_food_registry.json")
     # Optional: strict official-only registry with verification metadata
@@ -26,22 +29,34 @@ def register_japanbrands(tree: app_commands.CommandTree, data_dir: str, limiter:
     async def random_japan_brand(interaction: discord.Interaction) -> None:
         try:
             limiter.check(f"japanbrands:{interaction.user.id}")
-            if os.path.exists(official_path):
-                reg = load_json(Path(official_path))
-                items = filter_verified_official_items(reg)
-                if not items:
+            # Deferred: services load on first use, not at bot startup.
+            from services.payload_cache import compile_registry_async
+            from services.registry_loader import load_json, load_registry_items
+            from services.verification import filter_verified_official_items, verified_view_path, view_is_current
+            from utils import executors
+
+            # PASS + active subset materialised by scripts/verify_official_domains.py.
+            view_path = verified_view_path(official_path)
+            if await executors.run("files", view_is_current, view_path, official_path):
+                compiled = await compile_registry_async(
+                    "japanbrands:verified", Path(view_path), "Japan Brand",
+                    lambda p: load_registry_items(p, "items"), _normalize_official,
+                )
+                if not len(compiled):
+                    raise RuntimeError("Official registry is present but has no PASS + active items.")
+            elif await executors.run("files", os.path.exists, official_path):
+                # No view (or one built from other registry content): filter once per registry version.
+                compiled = await compile_registry_async(
+                    "japanbrands:official", Path(official_path), "Japan Brand",
+                    lambda p: filter_verified_official_items(load_json(p)), _normalize_official,
+                )
+                if not len(compiled):
                     raise RuntimeError("Official registry is present but has no PASS + active items.")
-                picked = pick_random(items)
-                entry = {
-                    "name": picked.get("brand_name"),
-                    "description": (picked.get("description") or "").strip(),
-                    "sources": [{"label": "Official site", "url": picked.get("official_url")}],
-                }
             else:
-                items = load_registry_items(Path(legacy_path), "items")
-                entry = pick_random(items)
-            emb = entry_embed("Japan Brand", entry)
-            await interaction.response.send_message(embed=emb)
+                compiled = await compile_registry_async(
+                    "japanbrands:legacy", Path(legacy_path), "Japan Brand", lambda p: load_registry_items(p, "items")
+                )
+            await interaction.response.send_message(embed=compiled.random_embed())
         except Exception as e:
             await interaction.response.send_message(f"Error: {e}", ephemeral=True)
 
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+from utils.rate_limit import RateLimiter
+
+# Discord message limit, minus the code fence.
+_MAX_TEXT = 1990
+
+
+def _is_admin(interaction: discord.Interaction) -> bool:
+    perms = getattr(interaction.user, "guild_permissions", None)
+    return perms is not None and perms.administrator
+
+
+def _block(text: str) -> str:
+    return f"```\n{text[:_MAX_TEXT - 8]}\n```"
+
+
+def register_stats(tree: app_commands.CommandTree, data_dir: str, limiter: RateLimiter) -> None:
+    @tree.command(name="stats", description="Command latency, cache and upstream metrics (admins only)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def stats(interaction: discord.Interaction) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils.metrics import METRICS
+
+        await interaction.response.send_message(_block(METRICS.summary()), ephemeral=True)
+
+    profile = app_commands.Group(
+        name="profile",
+        description="Capture cProfile reports for slow commands (admins only)",
+        default_permissions=discord.Permissions(administrator=True),
+        guild_only=True,
+    )
+
+    @profile.command(name="on", description="Profile commands and keep captures slower than the threshold")
+    @app_commands.describe(commands='"*" or comma-separated command names, e.g. "instrument random"',
+                           threshold_ms="Keep captures at least this slow (ms)")
+    async def profile_on(interaction: discord.Interaction, commands: str = "*",
+                         threshold_ms: Optional[app_commands.Range[int, 0, 600000]] = None) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils.command_profiler import get_profiler
+
+        prof = get_profiler()
+        prof.enable(commands, threshold_ms)
+        await interaction.response.send_message(prof.status(), ephemeral=True)
+
+    @profile.command(name="off", description="Stop profiling commands")
+    async def profile_off(interaction: discord.Interaction) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils.command_profiler import get_profiler
+
+        prof = get_profiler()
+        prof.disable()
+        await interaction.response.send_message(prof.status(), ephemeral=True)
+
+    @profile.command(name="list", description="List captured slow-command profiles, newest first")
+    async def profile_list(interaction: discord.Interaction) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils.command_profiler import get_profiler
+
+        prof = get_profiler()
+        lines = [prof.status()]
+        for i, cap in enumerate(prof.captures()):
+            lines.append(f"#{i}  {cap.get('duration_ms', '?')} ms  {cap.get('command', '?')}  {cap.get('args', {})}")
+        await interaction.response.send_message(_block("\n".join(lines)), ephemeral=True)
+
+    @profile.command(name="report", description="Top functions of a captured profile")
+    @app_commands.describe(index="Capture number from /profile list (0 = newest)", top="Number of functions")
+    async def profile_report(interaction: discord.Interaction, index: app_commands.Range[int, 0, 1000] = 0,
+                             top: app_commands.Range[int, 1, 40] = 15) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils.command_profiler import get_profiler
+
+        await interaction.response.send_message(_block(get_profiler().report(index, top)), ephemeral=True)
+
+    @profile.command(name="samples", description="Sampling profiler status and collapsed-stack (flamegraph) export")
+    @app_commands.describe(export="Attach the collapsed stacks collected so far")
+    async def profile_samples(interaction: discord.Interaction, export: bool = False) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("Error: administrators only.", ephemeral=True)
+            return
+        from utils import sampling_profiler
+
+        sampler = sampling_profiler.SAMPLER
+        if sampler is None:
+            await interaction.response.send_message("Sampling profiler is off (set SAMPLING_PROFILER=1).", ephemeral=True)
+            return
+        lines = [sampler.status(), "", "Top frames (samples):"]
+        lines += [f"{n:8d}  {frame}" for frame, n in sampler.top(12)]
+        if not export:
+            await interaction.response.send_message(_block("\n".join(lines)), ephemeral=True)
+            return
+        path = sampling_profiler.export_file(sampler, sampling_profiler.export_dir())
+        await interaction.response.send_message(_block("\n".join(lines)), file=discord.File(path), ephemeral=True)
+
+    tree.add_command(profile)
@@ -1,21 +1,73 @@
 
-import json, random, os
+import json, random, os, sys
+from core.sampling import AliasSampler
 
 BASE_DIR=os.path.dirname(os.path.dirname(__file__))
+AUTHORS=("cicero","caesar","seneca","marcus","augustus")
+# "manifest": author shares follow distribution_locked; "uniform": every quote equally likely.
+WEIGHTING=os.getenv("ROME_QUOTES_WEIGHTING","manifest").strip().lower()
 
 def load(author):
     path=os.path.join(BASE_DIR,"data",f"ancient_rome_quotes_{author}.json")
     with open(path,"r",encoding="utf-8") as f:
         return json.load(f)["items"]
 
+def load_manifest():
+    path=os.path.join(BASE_DIR,"data","ancient_rome_quotes_manifest.json")
+    try:
+        with open(path,"r",encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+class QuoteCorpus:
+    """All quotes in one tuple, grouped by author, with an alias sampler over authors.
+
+    An unfiltered pick draws an author from the alias table, then a uniform
+    index inside that author's precomputed slice: O(1), nothing allocated.
+    """
+    def __init__(self, weighting="manifest"):
+        items=[]
+        self.slices={}
+        names={}
+        for a in AUTHORS:
+            rows=load(a)
+            self.slices[a]=(len(items),len(items)+len(rows))
+            items.extend(rows)
+            if rows:
+                names[a]=rows[0].get("author") or a
+        self.items=tuple(items)
+        if not self.items:
+            raise ValueError("Dataset empty")
+        locked=(load_manifest().get("distribution_locked") or {}) if weighting=="manifest" else {}
+        self.authors=tuple(a for a in AUTHORS if self.slices[a][1]>self.slices[a][0])
+        # Manifest keys are author slugs; display names are accepted too.
+        unknown=set(locked)-set(AUTHORS)-set(names.values())
+        if unknown:
+            print(f"Warning: distribution_locked keys match no author: {', '.join(sorted(map(str,unknown)))}",file=sys.stderr)
+        weights=[]
+        for a in self.authors:
+            start,end=self.slices[a]
+            w=locked.get(a,locked.get(names[a]))
+            weights.append(float(w) if isinstance(w,(int,float)) and w>0 else float(end-start))
+        self.sampler=AliasSampler(weights)
+
+    def pick(self, author=None):
+        if author in self.slices:
+            start,end=self.slices[author]
+        else:
+            start,end=self.slices[self.authors[self.sampler.draw()]]
+        if end<=start:
+            raise ValueError("Dataset empty")
+        return self.items[start+int(random.random()*(end-start))]
+
+_CORPUS={}
+
+def corpus(weighting=None):
+    w=weighting or WEIGHTING
+    if w not in _CORPUS:
+        _CORPUS[w]=QuoteCorpus(w)
+    return _CORPUS[w]
+
 def pick(author=None):
-    authors=["cicero","caesar","seneca","marcus","augustus"]
-    items=[]
-    if author and author in authors:
-        items=load(author)
-    else:
-        for a in authors:
-            items+=load(a)
-    if not items:
-        raise ValueError("Dataset empty")
-    return random.choice(items)
+    return corpus().pick(author if author in AUTHORS else None)
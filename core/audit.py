@@ -1,6 +1,10 @@
 from __future__ import annotations
+import json
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import urlparse
+from core.domain_index import AhoCorasick
 from core.policy import ALLOWED_SOURCE_KINDS, BLOCKED_HOST_CONTAINS
 
 @dataclass(frozen=True)
@@ -12,25 +16,122 @@ class Source:
 def _host(url: str) -> str:
     return (urlparse(url).hostname or "").lower()
 
+_BLOCKED = AhoCorasick(sorted(BLOCKED_HOST_CONTAINS))
+
+@lru_cache(maxsize=8192)
+def is_blocked_host(host: str) -> bool:
+    return _BLOCKED.search(host)
+
 def is_blocked(url: str) -> bool:
-    h = _host(url)
-    return any(b in h for b in BLOCKED_HOST_CONTAINS)
+    return is_blocked_host(_host(url))
+
+@lru_cache(maxsize=8192)
+def source_errors(s: Source) -> tuple[str, ...]:
+    """Audit errors for one source; sources are static data, so each is checked once."""
+    errors: list[str] = []
+    if not s.url.startswith(("https://","http://")):
+        errors.append(f"Invalid URL scheme: {s.url}")
+    if is_blocked(s.url):
+        errors.append(f"Blocked source domain: {s.url}")
+    if s.kind not in ALLOWED_SOURCE_KINDS:
+        errors.append(f"Invalid source kind: {s.kind}")
+    if not s.label or len(s.label) < 3:
+        errors.append("Missing or too-short source label.")
+    return tuple(errors)
 
 def audit_sources(sources: list[Source]) -> tuple[bool, list[str]]:
     errors: list[str] = []
     for s in sources:
-        if not s.url.startswith(("https://","http://")):
-            errors.append(f"Invalid URL scheme: {s.url}")
-        if is_blocked(s.url):
-            errors.append(f"Blocked source domain: {s.url}")
-        if s.kind not in ALLOWED_SOURCE_KINDS:
-            errors.append(f"Invalid source kind: {s.kind}")
-        if not s.label or len(s.label) < 3:
-            errors.append("Missing or too-short source label.")
+        errors.extend(source_errors(s))
     return (len(errors) == 0, errors)
 
-def sources_block(sources: list[Source]) -> str:
-    ok, _ = audit_sources(sources)
+@dataclass(frozen=True)
+class AuditVerdict:
+    """Audit outcome for a source list, computed when the dataset is loaded."""
+    ok: bool
+    errors: tuple[str, ...]
+    sources: tuple[Source, ...]  # the audited sources; empty when the audit failed
+    block: str                   # pre-rendered sources_block text
+
+class MalformedSource(ValueError):
+    pass
+
+def to_source(r) -> Source:
+    """Source from a registry dict {"label", "url", "kind"}; raises MalformedSource otherwise."""
+    if not isinstance(r, dict) or any(k not in r for k in ("label", "url", "kind")):
+        raise MalformedSource(f"Malformed source entry: {r!r}"[:200])
+    return Source(str(r["label"]), str(r["url"]), str(r["kind"]))
+
+def to_sources(raw) -> tuple[Source, ...]:
+    """Source tuple from registry dicts; raises MalformedSource on the first malformed entry."""
+    return tuple(to_source(r) for r in raw or [])
+
+@lru_cache(maxsize=4096)
+def verdict(sources: tuple[Source, ...]) -> AuditVerdict:
+    ok, errors = audit_sources(list(sources))
     if not ok:
-        return "Sources: (withheld — audit failed)"
-    return "Sources:\n" + "\n".join([f"- {s.label}: {s.url}" for s in sources])
+        block = WITHHELD
+    else:
+        block = "Sources:\n" + "\n".join([f"- {s.label}: {s.url}" for s in sources])
+    return AuditVerdict(ok, tuple(errors), sources if ok else (), block)
+
+WITHHELD = "Sources: (withheld — audit failed)"
+
+def raw_verdict(raw) -> AuditVerdict:
+    """verdict() for raw registry entries; a malformed entry fails the audit with its error."""
+    try:
+        sources = to_sources(raw)
+    except MalformedSource as e:
+        return AuditVerdict(False, (str(e),), (), WITHHELD)
+    return verdict(sources)
+
+def sources_block(sources: list[Source]) -> str:
+    return verdict(tuple(sources)).block
+
+def _source_dicts(data):
+    # Every {"label", "url", "kind"} record anywhere in a registry, iteratively.
+    stack = [data]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            if isinstance(cur.get("url"), str) and "kind" in cur:
+                yield cur
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+
+def _failure(r, errors) -> dict:
+    source = {k: r.get(k) for k in ("label", "url", "kind")} if isinstance(r, dict) else r
+    return {"source": source, "errors": list(errors)}
+
+def audit_report(data_dir: str) -> dict:
+    """Bulk audit of every institutional source record in every *.json registry under `data_dir`."""
+    files: list[dict] = []
+    totals = {"files": 0, "sources": 0, "failed": 0}
+    for root, _, names in os.walk(data_dir):
+        for fn in sorted(names):
+            if not fn.lower().endswith(".json"):
+                continue
+            fp = os.path.join(root, fn)
+            try:
+                with open(fp, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            records = list(_source_dicts(data))
+            if not records:
+                continue
+            failures = []
+            for r in records:
+                try:
+                    errors = source_errors(to_source(r))
+                except MalformedSource as e:
+                    errors = (str(e),)
+                if errors:
+                    failures.append(_failure(r, errors))
+            files.append({"file": os.path.relpath(fp, data_dir), "sources": len(records), "failed": len(failures), "failures": failures})
+            totals["files"] += 1
+            totals["sources"] += len(records)
+            totals["failed"] += len(failures)
+    files.sort(key=lambda r: r["file"])
+    return {"totals": totals, "files": files}
@@ -1,10 +1,198 @@
-import json, time, os
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
 LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs', 'audit.jsonl')
+
+
+class AuditLogger:
+    """Buffered JSONL audit log with a background writer thread.
+
+    `log()` is a dict copy and a deque append; it never touches the file, so it
+    is safe to call from the event loop. The writer drains the buffer in
+    batches when `batch_size` events are queued or every `flush_interval`
+    seconds, and rotates the file past `max_bytes` (audit.jsonl.1[.gz] ...).
+    When `capacity` events are already queued new events are dropped and
+    counted rather than blocking the caller.
+    """
+
+    def __init__(self, path: str = LOG_PATH, capacity: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 1.0, max_bytes: int = 10 * 1024 * 1024,
+                 backups: int = 5, compress: bool = True) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+
+        self._buf: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._stop = False
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.unserializable = 0
+        self.rotations = 0
+
+    # Hot path
+
+    def log(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; False if it was dropped because the buffer is full."""
+        if len(self._buf) >= self.capacity:
+            self.dropped += 1
+            return False
+        event = dict(event)
+        event.setdefault('ts', int(time.time()))
+        self._buf.append(event)
+        if self._thread is None:
+            self.start()
+        if len(self._buf) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    # Writer
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="audit-logger", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop:
+            try:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self.flush()
+            except Exception as e:
+                # Never let one bad batch end the writer: later events would pile up unseen.
+                self.errors += 1
+                print(f"[audit_logger] writer error: {e}", file=sys.stderr)
+        self.flush()
+
+    def _encode(self, batch: List[Dict[str, Any]]) -> Tuple[str, int]:
+        """(JSONL text, events encoded); non-JSON values are written with str()."""
+        lines: List[str] = []
+        for e in batch:
+            try:
+                lines.append(json.dumps(e, ensure_ascii=False, default=str) + '\n')
+            except (TypeError, ValueError) as exc:  # e.g. circular references
+                self.unserializable += 1
+                print(f"[audit_logger] event skipped (not serializable): {exc}", file=sys.stderr)
+        return "".join(lines), len(lines)
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        buf = self._buf
+        while buf:
+            batch.append(buf.popleft())
+        return batch
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of events written."""
+        with self._io_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            try:
+                lines, written = self._encode(batch)
+                if not written:
+                    return 0
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+                    size = f.tell()
+                self.written += written
+                if self.max_bytes and size >= self.max_bytes:
+                    self._rotate()
+            except Exception as e:
+                self.errors += 1
+                print(f"[audit_logger] write failed ({len(batch)} events lost): {e}", file=sys.stderr)
+                return 0
+            return written
+
+    def _backup(self, n: int) -> str:
+        return f"{self.path}.{n}" + (".gz" if self.compress else "")
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+            self.rotations += 1
+            return
+        oldest = self._backup(self.backups)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for n in range(self.backups - 1, 0, -1):
+            src = self._backup(n)
+            if os.path.exists(src):
+                os.replace(src, self._backup(n + 1))
+        if self.compress:
+            with open(self.path, 'rb') as src_f, gzip.open(self._backup(1), 'wb') as dst_f:
+                shutil.copyfileobj(src_f, dst_f)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self._backup(1))
+        self.rotations += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer and flush whatever is still queued."""
+        thread = self._thread
+        self._stop = True
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': len(self._buf),
+            'written': self.written,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'unserializable': self.unserializable,
+            'rotations': self.rotations,
+        }
+
+
+_DEFAULT: Optional[AuditLogger] = None
+
+
+def default_logger() -> AuditLogger:
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = AuditLogger(
+            path=os.getenv('AUDIT_LOG_PATH', LOG_PATH),
+            max_bytes=int(os.getenv('AUDIT_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+            backups=int(os.getenv('AUDIT_LOG_BACKUPS', '5')),
+            compress=os.getenv('AUDIT_LOG_GZIP', '1').strip().lower() not in ('0', 'false', 'no', ''),
+        )
+        atexit.register(_DEFAULT.close)
+    return _DEFAULT
+
+
 def log_event(event: dict) -> None:
-    event = dict(event)
-    event.setdefault('ts', int(time.time()))
-    try:
-        with open(LOG_PATH, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(event, ensure_ascii=False)+'\n')
-    except Exception:
-        pass
+    default_logger().log(event)
+
+
+def shutdown() -> None:
+    """Flush the default logger; call once when the bot stops."""
+    if _DEFAULT is not None:
+        _DEFAULT.close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SuffixTrie(Generic[T]):
+    """Domains stored label by label from the TLD inwards ("uffizi.it" -> it -> uffizi).
+
+    `match(host)` returns the value of the longest registered domain that is
+    the host itself or one of its parent domains, in O(labels) regardless of
+    how many domains are registered.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, entries: Iterable[Tuple[str, T]] = ()) -> None:
+        # node: (children, value-or-None)
+        self._root: Tuple[Dict[str, tuple], List[Optional[T]]] = ({}, [None])
+        self._size = 0
+        for domain, value in entries:
+            self.add(domain, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, domain: str, value: T) -> None:
+        node = self._root
+        for label in reversed(domain.lower().strip(".").split(".")):
+            node = node[0].setdefault(label, ({}, [None]))
+        if node[1][0] is None:
+            self._size += 1
+        node[1][0] = value
+
+    def match(self, host: str) -> Optional[T]:
+        node = self._root
+        best: Optional[T] = None
+        for label in reversed(host.split(".")):
+            nxt = node[0].get(label)
+            if nxt is None:
+                break
+            node = nxt
+            if node[1][0] is not None:
+                best = node[1][0]
+        return best
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: one pass over the text for any number of patterns."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        for p in patterns:
+            if not p:
+                continue
+            s = 0
+            for ch in p:
+                nxt = self._goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[s][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                s = nxt
+            self._out[s] = self._out[s] + (p,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self._goto[s].items():
+                queue.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _step(self, s: int, ch: str) -> int:
+        while s and ch not in self._goto[s]:
+            s = self._fail[s]
+        return self._goto[s].get(ch, 0)
+
+    def search(self, text: str) -> bool:
+        """True if any pattern occurs in `text`."""
+        s = 0
+        for ch in text:
+            s = self._step(s, ch)
+            if self._out[s]:
+                return True
+        return False
+
+    def findall(self, text: str) -> List[str]:
+        """Patterns occurring in `text`, in order of where they end."""
+        s = 0
+        found: List[str] = []
+        for ch in text:
+            s = self._step(s, ch)
+            found.extend(self._out[s])
+        return found
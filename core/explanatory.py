@@ -1,18 +1,23 @@
 import json
 from typing import Dict, List, Tuple
 
+from core.term_index import index_for_file
+
 def load_terms(path: str) -> Dict[str, str]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 def list_terms(path: str) -> List[str]:
-    return sorted(load_terms(path).keys())
+    return sorted(index_for_file(path).keys)
 
 def explain(path: str, term: str) -> Tuple[str, str] | None:
-    data = load_terms(path)
-    key = term.strip().lower()
-    # normalize spaces/underscores/hyphens lightly
-    key = key.replace(" ", "-").replace("_", "-")
-    if key in data:
-        return key, data[key]
+    # Keys are folded (case, accents, spaces/underscores/hyphens) once per file version.
+    index = index_for_file(path)
+    hit = index.get(term)
+    if hit is not None:
+        return index.keys[hit], index.values[hit]
     return None
+
+def suggest(path: str, term: str, limit: int = 5) -> List[str]:
+    """'Did you mean' keys for a term that explain() did not find."""
+    return index_for_file(path).suggest(term, limit)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 import json
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.io import compiled
 
 @dataclass(frozen=True)
 class FashionBrand:
@@ -16,28 +19,51 @@ def load_dataset(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _brand(r: Dict[str, Any]) -> FashionBrand:
+    return FashionBrand(
+        name=str(r["name"]),
+        founded_year=int(r["founded_year"]) if r.get("founded_year") is not None else None,
+        region=str(r.get("region") or "unknown").lower(),
+        hq_city=str(r.get("hq_city") or ""),
+        website=str(r.get("website") or ""),
+        one_liner=str(r.get("one_liner") or "").strip(),
+    )
+
+class BrandIndex:
+    """Brands built once per dataset version.
+
+    `by_year` is presorted by (founded_year, name) with a parallel `years`
+    array, so a from/to range is two bisects plus a slice; `by_region` maps a
+    region to its name-sorted brands.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.brands: Tuple[FashionBrand, ...] = tuple(_brand(r) for r in data.get("items") or [])
+        dated = sorted((b for b in self.brands if b.founded_year is not None),
+                       key=lambda b: (b.founded_year, b.name.lower()))
+        self.by_year: Tuple[FashionBrand, ...] = tuple(dated)
+        self.years: List[int] = [b.founded_year for b in dated]
+        regions: Dict[str, List[FashionBrand]] = {}
+        for b in self.brands:
+            regions.setdefault(b.region, []).append(b)
+        self.by_region: Dict[str, Tuple[FashionBrand, ...]] = {
+            k: tuple(sorted(v, key=lambda b: b.name.lower())) for k, v in regions.items()
+        }
+
+    def range(self, from_year: Optional[int] = None, to_year: Optional[int] = None) -> List[FashionBrand]:
+        lo = bisect_left(self.years, from_year) if from_year is not None else 0
+        hi = bisect_right(self.years, to_year) if to_year is not None else len(self.years)
+        return list(self.by_year[lo:hi]) if lo < hi else []
+
+def index(path: str) -> BrandIndex:
+    return compiled(path, BrandIndex)
+
 def list_all(path: str) -> List[FashionBrand]:
-    data = load_dataset(path)
-    out: List[FashionBrand] = []
-    for r in data.get("items") or []:
-        out.append(FashionBrand(
-            name=str(r["name"]),
-            founded_year=int(r["founded_year"]) if r.get("founded_year") is not None else None,
-            region=str(r.get("region") or "unknown").lower(),
-            hq_city=str(r.get("hq_city") or ""),
-            website=str(r.get("website") or ""),
-            one_liner=str(r.get("one_liner") or "").strip(),
-        ))
-    return out
+    return list(index(path).brands)
 
 def timeline(path: str, from_year: Optional[int]=None, to_year: Optional[int]=None) -> List[FashionBrand]:
-    rows = [b for b in list_all(path) if b.founded_year is not None]
-    if from_year is not None:
-        rows = [b for b in rows if b.founded_year >= from_year]
-    if to_year is not None:
-        rows = [b for b in rows if b.founded_year <= to_year]
-    return sorted(rows, key=lambda b: (b.founded_year or 9999, b.name.lower()))
+    return index(path).range(from_year, to_year)
 
 def by_region(path: str, region: str) -> List[FashionBrand]:
     reg = (region or "").strip().lower()
-    return sorted([b for b in list_all(path) if b.region == reg], key=lambda b: b.name.lower())
+    return list(index(path).by_region.get(reg, ()))
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
-import asyncio, json, os, time
+import asyncio, json, os, threading, time
 import aiohttp
 
+from utils import executors, upstreams
+
 # Note: endpoints are fetched live at request time.
 # Epic endpoint is a public store backend JSON used by the Epic Games Store frontend.
 EPIC_FREE_PROMOS = "https://store-site-backend-static-ipv4.ak.epicgames.com/freeGamesPromotions"
@@ -38,7 +40,7 @@ async def fetch_epic_free_games(region: str = "global") -> List[FreeGameItem]:
     country, locale = REGION_TO_COUNTRY_LOCALE.get(region, REGION_TO_COUNTRY_LOCALE["global"])
     params = {"locale": locale, "country": country, "allowCountries": country}
     async with aiohttp.ClientSession(headers={"User-Agent": "AcademicDiscordBot/1.0"}) as session:
-        data = await _get_json(session, EPIC_FREE_PROMOS, params=params)
+        data = await _get_json(session, upstreams.url("epic", EPIC_FREE_PROMOS), params=params)
     catalog = (data or {}).get("data") or {}
     catalog = catalog.get("Catalog") or {}
     search = (catalog.get("searchStore") or {})
@@ -70,7 +72,7 @@ async def fetch_gog_free_games(page: int = 1) -> List[FreeGameItem]:
         "sort": "popularity",
     }
     async with aiohttp.ClientSession(headers={"User-Agent": "AcademicDiscordBot/1.0"}) as session:
-        data = await _get_json(session, GOG_FILTERED, params=params)
+        data = await _get_json(session, upstreams.url("gog", GOG_FILTERED), params=params)
     products = (data or {}).get("products") or []
     out: List[FreeGameItem] = []
     for p in products:
@@ -90,7 +92,8 @@ def load_seen(path: str) -> Dict[str, Any]:
 
 def save_seen(path: str, payload: Dict[str, Any]) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
+    # Per-thread temp name: saves may run concurrently on the "files" pool.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     with open(tmp, "w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
     os.replace(tmp, path)
@@ -105,3 +108,9 @@ def mark_new(items: List[FreeGameItem], seen: Dict[str, Any]) -> Tuple[List[Free
             s[key] = {"t": _now_ms(), "title": it.title, "url": it.url}
     seen["seen"] = s
     return new, seen
+
+async def load_seen_async(path: str) -> Dict[str, Any]:
+    return await executors.run("files", load_seen, path)
+
+async def save_seen_async(path: str, payload: Dict[str, Any]) -> None:
+    await executors.run("files", save_seen, path, payload)
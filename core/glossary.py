@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from core.term_index import TermIndex, build, index_for_file
 
 def load_glossary(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def find_term(glossary: Dict[str, Any], query: str) -> Optional[Dict[str, Any]]:
-    q = (query or "").strip().lower()
-    if not q:
-        return None
+def glossary_index(glossary: Union[str, Dict[str, Any]]) -> TermIndex:
+    """Index for a glossary file path (cached per file version) or an already loaded dict (built per call)."""
+    if isinstance(glossary, str):
+        return index_for_file(glossary)
+    return build(glossary)
+
+def _scan(glossary: Dict[str, Any], q: str) -> Optional[Dict[str, Any]]:
+    # A loaded dict has no version to cache an index under; one pass beats building one.
     for t in glossary.get("terms", []):
         term = str(t.get("term","")).strip().lower()
         if term == q:
@@ -21,6 +27,26 @@ def find_term(glossary: Dict[str, Any], query: str) -> Optional[Dict[str, Any]]:
             return t
     return None
 
+def find_term(glossary: Union[str, Dict[str, Any]], query: str) -> Optional[Dict[str, Any]]:
+    """Exact, then substring match; a file path uses the cached index, a dict is scanned."""
+    q = (query or "").strip().lower()
+    if not q:
+        return None
+    if not isinstance(glossary, str):
+        return _scan(glossary, q)
+    index = glossary_index(glossary)
+    hit = index.get(q)
+    if hit is not None:
+        return index.values[hit]
+    subs = index.substring(q)
+    if subs:
+        return index.values[subs[0]]
+    return None
+
+def suggest_terms(glossary: Union[str, Dict[str, Any]], query: str, limit: int = 5) -> List[str]:
+    """'Did you mean' candidates, ranked (prefix, substring, then typo-tolerant)."""
+    return glossary_index(glossary).suggest(query, limit)
+
 def list_terms(glossary: Dict[str, Any], limit: int = 25) -> List[str]:
     terms = [str(t.get("term","")).strip() for t in glossary.get("terms", []) if t.get("term")]
     terms = [t for t in terms if t]
@@ -1,48 +1,70 @@
 from __future__ import annotations
 
-import json
 import random
 from typing import Any, Dict, List, Optional, Tuple
 
-def _load(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+from core.tag_index import TagIndex
+from utils.io import compiled
 
-def pick_pair(path: str, tag: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    data = _load(path)
-    techniques: List[Dict[str, Any]] = list(data.get("techniques", []))
-    tools: List[Dict[str, Any]] = list(data.get("tools", []))
+class CompiledSelector:
+    """Technique/tool pool compiled once per file version.
+
+    Holds a tag index for both pools, the id -> tool map and each technique's
+    recommended tools resolved to tool indices, so pick_pair does lookups only.
+    """
 
-    if tag:
-        t = tag.strip().lower()
-        techniques = [x for x in techniques if t in [y.lower() for y in (x.get("tags") or [])]]
-        tools_tagged = [x for x in tools if t in [y.lower() for y in (x.get("tags") or [])]]
-        if tools_tagged:
-            tools = tools_tagged
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.techniques = TagIndex(data.get("techniques", []))
+        self.tools = TagIndex(data.get("tools", []))
+        self.tool_by_id: Dict[str, int] = {}
+        for i, t in enumerate(self.tools.rows):
+            if "id" in t:
+                self.tool_by_id[t["id"]] = i
+        self.recommended: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self.tool_by_id[r] for r in (tech.get("recommended_tools") or []) if r in self.tool_by_id)
+            for tech in self.techniques.rows
+        )
+        self.tags: Tuple[str, ...] = tuple(sorted(set(self.techniques.tags) | set(self.tools.tags)))
+        # (technique index, tag) -> recommended tools that also carry the tag
+        self._rec_tagged: Dict[Tuple[int, str], Tuple[int, ...]] = {}
 
-    if not techniques or not tools:
-        raise ValueError("No matching items")
+    def _recommended_for(self, tech_i: int, tag: str, tool_ids: Tuple[int, ...]) -> Tuple[int, ...]:
+        key = (tech_i, tag)
+        hit = self._rec_tagged.get(key)
+        if hit is None:
+            allowed = set(tool_ids)
+            hit = tuple(i for i in self.recommended[tech_i] if i in allowed)
+            self._rec_tagged[key] = hit
+        return hit
 
-    tech = random.choice(techniques)
+    def pick_pair(self, tag: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        techniques = self.techniques.rows
+        tools = self.tools.rows
+        if tag:
+            t = tag.strip().lower()
+            tech_ids = self.techniques.ids(t)
+            tool_ids = self.tools.ids(t)
+            if not tech_ids or not tools:
+                raise ValueError("No matching items")
+            tech_i = random.choice(tech_ids)
+            if tool_ids:
+                candidates = self._recommended_for(tech_i, t, tool_ids)
+                tool_i = random.choice(candidates) if candidates else random.choice(tool_ids)
+                return techniques[tech_i], tools[tool_i]
+        else:
+            if not techniques or not tools:
+                raise ValueError("No matching items")
+            tech_i = random.randrange(len(techniques))
 
-    rec = [r for r in (tech.get("recommended_tools") or [])]
-    tool = None
-    if rec:
-        by_id = {t["id"]: t for t in tools if "id" in t}
-        candidates = [by_id[r] for r in rec if r in by_id]
-        if candidates:
-            tool = random.choice(candidates)
+        candidates = self.recommended[tech_i]
+        tool_i = random.choice(candidates) if candidates else random.randrange(len(tools))
+        return techniques[tech_i], tools[tool_i]
 
-    if tool is None:
-        tool = random.choice(tools)
+def selector(path: str) -> CompiledSelector:
+    return compiled(path, CompiledSelector)
 
-    return tech, tool
+def pick_pair(path: str, tag: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    return selector(path).pick_pair(tag)
 
 def list_tags(path: str) -> List[str]:
-    data = _load(path)
-    tags = set()
-    for arr in (data.get("techniques", []), data.get("tools", [])):
-        for i in arr:
-            for t in (i.get("tags") or []):
-                tags.add(str(t))
-    return sorted(tags)
+    return list(selector(path).tags)
@@ -1,13 +1,35 @@
-import json, random
-from typing import Any, Dict, List, Optional, Tuple
-from core.audit import Source, audit_sources
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from core.audit import AuditVerdict, Source, raw_verdict
+from utils.io import compiled
 from core.util import clamp_mode
 
-def load(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+class _Artists:
+    """Artists of one file version plus a side map row -> AuditVerdict, audited once."""
 
-def pick_one(items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def __init__(self, data: Any) -> None:
+        self.items: Tuple[Dict[str, Any], ...] = tuple(a for a in (data if isinstance(data, list) else []) if isinstance(a, dict))
+        self.rows: Dict[int, int] = {id(a): i for i, a in enumerate(self.items)}
+        self.verdicts: Tuple[AuditVerdict, ...] = tuple(raw_verdict(a.get("institutional_sources")) for a in self.items)
+
+# abspath -> registry for the file version last loaded
+_LOADED: Dict[str, _Artists] = {}
+
+def load(path: str) -> Tuple[Dict[str, Any], ...]:
+    """Artists as stored in the file; parsed and audited once per file version (rows are shared, do not mutate)."""
+    reg = compiled(path, _Artists)
+    _LOADED[os.path.abspath(path)] = reg
+    return reg.items
+
+def artist_verdict(a: Dict[str, Any]) -> AuditVerdict:
+    for reg in _LOADED.values():
+        i = reg.rows.get(id(a))
+        if i is not None and reg.items[i] is a:
+            return reg.verdicts[i]
+    return raw_verdict(a.get("institutional_sources"))
+
+def pick_one(items: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     return random.choice(items) if items else None
 
 def format_artist(a: Dict[str, Any], mode: str="short") -> Tuple[str, str, list[Source]]:
@@ -16,11 +38,7 @@ def format_artist(a: Dict[str, Any], mode: str="short") -> Tuple[str, str, list[
     period = a.get("period","—")
     domain = a.get("domain","—")
     one_line = a.get("one_line","—")
-    srcs = [Source(s["label"], s["url"], s["kind"]) for s in a.get("institutional_sources", [])]
-
-    ok, _ = audit_sources(srcs)
-    if not ok:
-        srcs = []
+    srcs = list(artist_verdict(a).sources)
 
     if mode == "short":
         body = f"Period: {period}\nDomain: {domain}\nNote: {one_line}"
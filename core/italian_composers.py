@@ -1,43 +1,90 @@
-import json, random
-from typing import Any, Dict, List, Optional, Tuple
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from core.people_index import PeopleIndex
+from utils.io import compiled
 from core.util import norm, clamp_mode
 
 VALID_PERIODS = {"medieval","renaissance","baroque","classical","romantic","modern","contemporary"}
 
-def load(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return [c for c in data if c.get("nationality") == "Italian"]
+def _institutions(c: Dict[str, Any]) -> str:
+    return " ".join([norm(s.get("institution","")) for s in c.get("sources", [])])
 
-def filter_list(items: List[Dict[str, Any]], name: Optional[str]=None, period: Optional[str]=None,
+def _build_index(items: Sequence[Dict[str, Any]]) -> PeopleIndex[Dict[str, Any]]:
+    return PeopleIndex(
+        items,
+        name_of=lambda c: c.get("name",""),
+        period_of=lambda c: c.get("period",""),
+        flags={
+            "berklee": lambda c: any("berklee" in norm(s.get("institution","")) for s in c.get("sources", [])),
+            "oxford": lambda c: "oxford" in _institutions(c),
+            "cambridge": lambda c: "cambridge" in _institutions(c),
+        },
+    )
+
+class _Composers:
+    """Italian composers of one file version: rows, their index and formatted output per (row, mode)."""
+
+    def __init__(self, data: Any) -> None:
+        self.items: Tuple[Dict[str, Any], ...] = tuple(c for c in data if c.get("nationality") == "Italian")
+        self.index = _build_index(self.items)
+        self.rows: Dict[int, int] = {id(c): i for i, c in enumerate(self.items)}
+        self.formatted: Dict[Tuple[int, str], Tuple[str, str]] = {}
+
+# abspath -> registry for the file version last loaded
+_LOADED: Dict[str, _Composers] = {}
+
+def load(path: str) -> Tuple[Dict[str, Any], ...]:
+    # Parsed and indexed once per file version; the rows are shared, do not mutate them.
+    reg = compiled(path, _Composers)
+    _LOADED[os.path.abspath(path)] = reg
+    return reg.items
+
+def _registry_of(items: Sequence[Dict[str, Any]]) -> Optional[_Composers]:
+    for reg in _LOADED.values():
+        if reg.items is items:
+            return reg
+    return None
+
+def filter_list(items: Sequence[Dict[str, Any]], name: Optional[str]=None, period: Optional[str]=None,
                 berklee_modern: bool=False, oxbridge: bool=False) -> List[Dict[str, Any]]:
-    out = items[:]
+    # Rows from load() use the index of their file version; any other list is indexed per call.
+    reg = _registry_of(items)
+    idx = reg.index if reg is not None else _build_index(items)
+    mask = idx.all
     if name:
-        q = norm(name)
-        out = [c for c in out if q in norm(c.get("name",""))]
+        mask &= idx.name_mask(name)
     if period:
         p = norm(period)
         if p not in VALID_PERIODS:
             return []
-        out = [c for c in out if norm(c.get("period","")) == p]
+        mask &= idx.period_mask(p)
 
     if berklee_modern:
-        out = [c for c in out if norm(c.get("period","")) in {"modern","contemporary"}]
-        out = [c for c in out if any("berklee" in norm(s.get("institution","")) for s in c.get("sources", []))]
+        mask &= idx.period_mask("modern") | idx.period_mask("contemporary")
+        mask &= idx.flags["berklee"]
 
     if oxbridge:
-        def has_oxbridge(c):
-            insts = " ".join([norm(s.get("institution","")) for s in c.get("sources", [])])
-            return ("oxford" in insts) or ("cambridge" in insts)
-        out = [c for c in out if has_oxbridge(c)]
+        mask &= idx.flags["oxford"] | idx.flags["cambridge"]
 
-    return out
+    return idx.rows(mask)
 
-def pick_one(items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+def pick_one(items: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     return random.choice(items) if items else None
 
 def format_item(c: Dict[str, Any], mode: str="short") -> Tuple[str, str]:
+    """Cached per (row, mode) of the loaded file version; other dicts are formatted per call."""
     mode = clamp_mode(mode)
+    for reg in _LOADED.values():
+        i = reg.rows.get(id(c))
+        if i is not None and reg.items[i] is c:
+            out = reg.formatted.get((i, mode))
+            if out is None:
+                out = reg.formatted[(i, mode)] = _format_item(c, mode)
+            return out
+    return _format_item(c, mode)
+
+def _format_item(c: Dict[str, Any], mode: str) -> Tuple[str, str]:
     years = f" ({c['born']}–{c['died']})" if c.get("born") and c.get("died") else ""
     title = f"ITALIAN COMPOSER — {c['name'].upper()}{years}"
     period = c.get("period","—").title()
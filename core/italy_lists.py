@@ -1,20 +1,39 @@
+from core.people_index import PeopleIndex, cached_index
 from core.util import norm, clamp_mode
 from data.italy_figures import ITALIAN_PAINTERS, ITALIAN_ARCHITECTS, ITALIAN_PHILOSOPHERS
 
+def _index(items):
+    # Figures are frozen dataclasses: the rows themselves are the version.
+    rows = tuple(items)
+    return cached_index(rows, "figures", lambda: PeopleIndex(rows, name_of=lambda it: it.name, period_of=lambda it: it.period))
+
 def _pick(items, name=None, period=None):
+    idx = _index(items)
     qn = norm(name) if name else ""
     qp = norm(period) if period else ""
-    out = []
-    for it in items:
-        if qn and qn not in norm(it.name):
-            continue
-        if qp and qp != norm(it.period):
-            continue
-        out.append(it)
-    return out
+    mask = idx.all
+    if qn:
+        mask &= idx.name_mask(qn)
+    if qp:
+        mask &= idx.period_mask(qp)
+    return idx.rows(mask)
+
+# (title, rows, name, period, mode) -> text; output depends only on the rows and the normalised query.
+_FORMATTED = {}
+_MAX_FORMATTED = 512
 
 def format_list(title, items, name=None, period=None, mode="short"):
     mode = clamp_mode(mode)
+    key = (title, tuple(items), norm(name), norm(period), mode)
+    hit = _FORMATTED.get(key)
+    if hit is not None:
+        return hit
+    if len(_FORMATTED) >= _MAX_FORMATTED:
+        _FORMATTED.pop(next(iter(_FORMATTED)))
+    text = _FORMATTED[key] = _format_list(title, items, name, period, mode)
+    return text
+
+def _format_list(title, items, name, period, mode):
     matches = _pick(items, name=name, period=period)
     lines = [f"{title} ({mode})"]
     if not matches:
@@ -3,12 +3,15 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
 import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from utils import executors, metrics, upstreams
+
 MICHELIN_BASE = "https://guide.michelin.com"
 DEFAULT_LOCALE = "en"
 
@@ -131,15 +134,19 @@ def fetch_restaurants(base_dir: str, territory: str, award: str = "selected", pa
     now = time.time()
     if os.path.exists(cache_path):
         try:
-            cached = json.load(open(cache_path, "r", encoding="utf-8"))
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
             if now - cached.get("ts", 0) <= ttl_seconds:
+                metrics.cache_result("michelin", True)
                 return [MichelinRestaurant(**it) for it in cached.get("items", [])]
         except Exception:
             pass
+    metrics.cache_result("michelin", False)
 
     headers = {"User-Agent": "Mozilla/5.0 (compatible; AcademicBot/1.0; +https://guide.michelin.com/)"}
-    resp = requests.get(url, headers=headers, timeout=20)
-    resp.raise_for_status()
+    with metrics.upstream("michelin"):
+        resp = requests.get(upstreams.url("michelin", url), headers=headers, timeout=20)
+        resp.raise_for_status()
 
     items = _parse_restaurant_cards(resp.text)
 
@@ -150,10 +157,19 @@ def fetch_restaurants(base_dir: str, territory: str, award: str = "selected", pa
         cu = cuisine.strip().lower()
         items = [i for i in items if cu in (i.cuisine or "").lower()]
 
-    json.dump({"ts": now, "url": url, "items": [i.__dict__ for i in items]}, open(cache_path, "w", encoding="utf-8"),
-              ensure_ascii=False, indent=2)
+    # Atomic, per-thread temp file: the same page may be fetched concurrently on the "michelin" pool.
+    tmp = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"ts": now, "url": url, "items": [i.__dict__ for i in items]}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, cache_path)
     return items
 
+async def fetch_restaurants_async(base_dir: str, territory: str, award: str = "selected", page: int = 1,
+                                  city: Optional[str] = None, cuisine: Optional[str] = None,
+                                  ttl_seconds: int = 21600) -> List[MichelinRestaurant]:
+    """fetch_restaurants on the "michelin" pool (utils.executors)."""
+    return await executors.run("michelin", fetch_restaurants, base_dir, territory, award, page, city, cuisine, ttl_seconds)
+
 def michelin_explain_urls(locale: str = "en") -> Dict[str, str]:
     base = f"{MICHELIN_BASE}/{locale}"
     return {
@@ -1,15 +1,22 @@
 from __future__ import annotations
 import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 import requests
 
+from utils import executors, metrics, upstreams
+
 DEFAULT_TIMEOUT = 14
 BASE = "https://api.nobelprize.org/2.1/nobelPrizes"
 
 # Cache: key -> (ts, payload)
 _CACHE: dict[str, tuple[float, dict]] = {}
+# One fetch per key at a time: concurrent misses for the same year (from the
+# executor threads) wait for the first request instead of repeating it.
+_KEY_LOCKS: dict[str, threading.Lock] = {}
+_KEY_LOCKS_GUARD = threading.Lock()
 
 @dataclass(frozen=True)
 class NobelLaureate:
@@ -39,16 +46,28 @@ def _ttl() -> int:
 def _get(params: dict) -> dict:
     # Simple in-memory cache to reduce API calls on Railway.
     key = "&".join([f"{k}={params[k]}" for k in sorted(params.keys())])
-    now = time.time()
     ttl = _ttl()
-    if key in _CACHE and (now - _CACHE[key][0]) < ttl:
-        return _CACHE[key][1]
-
-    r = requests.get(BASE, params=params, timeout=DEFAULT_TIMEOUT, headers={"User-Agent": _ua()})
-    r.raise_for_status()
-    data = r.json()
-    _CACHE[key] = (now, data)
-    return data
+    hit = _CACHE.get(key)
+    if hit is not None and (time.time() - hit[0]) < ttl:
+        metrics.cache_result("nobel", True)
+        return hit[1]
+
+    with _KEY_LOCKS_GUARD:
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+    with key_lock:
+        hit = _CACHE.get(key)
+        now = time.time()
+        if hit is not None and (now - hit[0]) < ttl:
+            metrics.cache_result("nobel", True)
+            return hit[1]
+        metrics.cache_result("nobel", False)
+
+        with metrics.upstream("nobel"):
+            r = requests.get(upstreams.url("nobel", BASE), params=params, timeout=DEFAULT_TIMEOUT, headers={"User-Agent": _ua()})
+            r.raise_for_status()
+        data = r.json()
+        _CACHE[key] = (now, data)
+        return data
 
 def _code_from_links(prize_obj: dict) -> str:
     # The API provides href like https://api.nobelprize.org/2/nobelPrize/phy/2023
@@ -126,3 +145,18 @@ def format_motivations(p: NobelPrize, max_items: int = 3) -> str:
         else:
             out.append(f"• {l.name}")
     return "\n".join(out) if out else "—"
+
+
+# Async facades: the blocking calls above, run on the "nobel" pool (utils.executors).
+
+async def fetch_year_async(year: int) -> List[NobelPrize]:
+    return await executors.run("nobel", fetch_year, year)
+
+async def latest_available_year_async(start_year: int, predicate) -> Optional[int]:
+    return await executors.run("nobel", latest_available_year, start_year, predicate)
+
+async def science_winners_async(year: int) -> List[NobelPrize]:
+    return await executors.run("nobel", science_winners, year)
+
+async def literature_winners_async(year: int) -> List[NobelPrize]:
+    return await executors.run("nobel", literature_winners, year)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Sequence, Tuple, TypeVar
+
+from core.util import norm
+
+T = TypeVar("T")
+
+
+def _grams(s: str) -> Iterable[str]:
+    return (s[i:i + 3] for i in range(len(s) - 2))
+
+
+class PeopleIndex(Generic[T]):
+    """A people registry with normalised fields and bitset indexes, built once.
+
+    Row sets are Python ints (bit i = row i), so every filter combination is
+    an AND of precomputed masks; rows come back in registry order.
+    - names: substring queries go through a name trigram -> mask index
+    - periods: normalised period -> mask
+    - flags: caller-defined named masks (e.g. institution flags)
+    """
+
+    def __init__(self, items: Sequence[T], name_of: Callable[[T], str], period_of: Callable[[T], str],
+                 flags: Dict[str, Callable[[T], bool]] | None = None) -> None:
+        self.items: Tuple[T, ...] = tuple(items)
+        self.all: int = (1 << len(self.items)) - 1
+        self.names: Tuple[str, ...] = tuple(norm(name_of(it)) for it in self.items)
+        self.periods: Tuple[str, ...] = tuple(norm(period_of(it)) for it in self.items)
+
+        self.by_period: Dict[str, int] = {}
+        for i, p in enumerate(self.periods):
+            self.by_period[p] = self.by_period.get(p, 0) | (1 << i)
+
+        self.name_grams: Dict[str, int] = {}
+        for i, n in enumerate(self.names):
+            for g in set(_grams(n)):
+                self.name_grams[g] = self.name_grams.get(g, 0) | (1 << i)
+
+        self.flags: Dict[str, int] = {}
+        for flag, test in (flags or {}).items():
+            mask = 0
+            for i, it in enumerate(self.items):
+                if test(it):
+                    mask |= 1 << i
+            self.flags[flag] = mask
+
+    def name_mask(self, query: str) -> int:
+        q = norm(query)
+        if not q:
+            return self.all
+        if len(q) >= 3:
+            mask = self.all
+            for g in set(_grams(q)):
+                mask &= self.name_grams.get(g, 0)
+                if not mask:
+                    return 0
+        else:
+            mask = self.all
+        out = 0
+        while mask:
+            low = mask & -mask
+            i = low.bit_length() - 1
+            if q in self.names[i]:
+                out |= low
+            mask ^= low
+        return out
+
+    def period_mask(self, period: str) -> int:
+        return self.by_period.get(norm(period), 0)
+
+    def rows(self, mask: int) -> List[T]:
+        out: List[T] = []
+        while mask:
+            low = mask & -mask
+            out.append(self.items[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+
+# (kind, version) -> index
+_INDEXES: Dict[Tuple[str, Hashable], Any] = {}
+_MAX_INDEXES = 32
+
+
+def cached_index(version: Hashable, kind: str, build: Callable[[], T]) -> T:
+    """Index built once per registry version (a file version, or the rows themselves when hashable)."""
+    key = (kind, version)
+    hit = _INDEXES.get(key)
+    if hit is not None:
+        return hit
+    if len(_INDEXES) >= _MAX_INDEXES:
+        _INDEXES.pop(next(iter(_INDEXES)))
+    index = _INDEXES[key] = build()
+    return index
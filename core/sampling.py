@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import random
+from typing import List, Sequence
+
+
+class AliasSampler:
+    """Vose's alias method: O(n) build, O(1) weighted draw with no per-call allocation."""
+
+    __slots__ = ("n", "prob", "alias")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+        scaled = [w * n / total for w in weights]
+        prob: List[float] = [0.0] * n
+        alias: List[int] = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float rounding.
+        for i in large + small:
+            prob[i] = 1.0
+            alias[i] = i
+        self.n = n
+        self.prob = tuple(prob)
+        self.alias = tuple(alias)
+
+    def draw(self) -> int:
+        i = int(random.random() * self.n)
+        return i if random.random() < self.prob[i] else self.alias[i]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Set
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+from core.domain_index import SuffixTrie
+
 DOMAIN_TYPE_MAP = {
     "metmuseum.org": "Museum",
     "moma.org": "Museum",
@@ -25,16 +28,47 @@ def _host(url: str) -> str:
     except Exception:
         return ""
 
-def classify_source(url: str) -> str:
-    host = _host(url)
+_TRIE: Optional[SuffixTrie[str]] = None
+
+
+def _trie() -> SuffixTrie[str]:
+    global _TRIE
+    if _TRIE is None:
+        _TRIE = SuffixTrie(DOMAIN_TYPE_MAP.items())
+    return _TRIE
+
+
+def reset_classifier() -> None:
+    """Drop the compiled trie and memo; call after editing DOMAIN_TYPE_MAP at runtime."""
+    global _TRIE
+    _TRIE = None
+    classify_host.cache_clear()
+
+
+@lru_cache(maxsize=8192)
+def classify_host(host: str) -> str:
     if not host:
         return "Institution"
     if host.endswith(".edu") or ".ac." in host:
         return "University"
-    for dom, typ in DOMAIN_TYPE_MAP.items():
-        if host == dom or host.endswith("." + dom):
-            return typ
-    return "Institution"
+    return _trie().match(host) or "Institution"
+
+
+def classify_source(url: str) -> str:
+    return classify_host(_host(url))
+
+
+def classify_many(urls: Iterable[str]) -> List[Tuple[str, str]]:
+    """(host, type) for each url; each url is parsed once and each host classified once."""
+    seen: Dict[str, str] = {}
+    out: List[Tuple[str, str]] = []
+    for u in urls:
+        host = _host(u)
+        typ = seen.get(host)
+        if typ is None:
+            typ = seen[host] = classify_host(host)
+        out.append((host, typ))
+    return out
 
 def extract_source_types(sources: Iterable[Dict]) -> List[str]:
     types: Set[str] = set()
@@ -1,72 +1,200 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import os
-from typing import Any, Dict, Iterable, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from core.source_audit import classify_source
+from core.source_audit import classify_many
 
-def _walk(obj: Any) -> Iterable[Any]:
-    if isinstance(obj, dict):
-        for v in obj.values():
-            yield v
-            yield from _walk(v)
-    elif isinstance(obj, list):
-        for v in obj:
-            yield v
-            yield from _walk(v)
+MANIFEST_VERSION = 2
+# Below this many changed files, or this many changed bytes, starting a
+# process pool costs more than parsing in-process.
+PARALLEL_MIN_FILES = 8
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
 
 def extract_urls_from_json(data: Any) -> Set[str]:
     urls: Set[str] = set()
-    for v in _walk(data):
-        if isinstance(v, str) and v.startswith("http"):
-            urls.add(v.strip())
+    stack: List[Any] = [data]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
+        elif isinstance(cur, str) and cur.startswith("http"):
+            urls.add(cur.strip())
     return urls
 
-def build_registry(data_dir: str) -> Dict[str, Any]:
-    urls: Set[str] = set()
+def _extract_file(fp: str, prev_sha: Optional[str] = None) -> Tuple[str, Optional[str], Optional[List[str]]]:
+    """(path, sha256, sorted urls). The file is hashed before it is parsed: when the
+    sha256 equals `prev_sha` the parse is skipped and urls is None. urls is also
+    None when the file is not valid JSON; sha256 is None (and urls empty) when
+    the file could not be read."""
+    try:
+        with open(fp, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return fp, None, []
+    sha = hashlib.sha256(raw).hexdigest()
+    if sha == prev_sha:
+        return fp, sha, None
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except Exception:
+        return fp, sha, None
+    return fp, sha, sorted(extract_urls_from_json(data))
+
+def _extract_star(args: Tuple[str, Optional[str]]) -> Tuple[str, Optional[str], Optional[List[str]]]:
+    return _extract_file(*args)
+
+def _classified(urls: Optional[List[str]]) -> List[List[str]]:
+    """[url, host, type] per url, sorted by url (host is "" when the url has none)."""
+    if not urls:
+        return []
+    return [[u, host, typ] for u, (host, typ) in zip(urls, classify_many(urls))]
+
+def _json_files(data_dir: str) -> List[str]:
+    out: List[str] = []
     for root, _, files in os.walk(data_dir):
         for fn in files:
-            if not fn.lower().endswith(".json"):
-                continue
-            fp = os.path.join(root, fn)
-            try:
-                with open(fp, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                urls |= extract_urls_from_json(data)
-            except Exception:
-                continue
+            if fn.lower().endswith(".json"):
+                out.append(os.path.join(root, fn))
+    return sorted(out)
+
+def _load_manifest(path: Optional[str]) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """(files, registry built from them) or ({}, None) when missing, unreadable or outdated."""
+    if not path or not os.path.exists(path):
+        return {}, None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}, None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}, None
+    files = data.get("files")
+    registry = data.get("registry")
+    return (files if isinstance(files, dict) else {}), (registry if isinstance(registry, dict) else None)
+
+def load_manifest(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    return _load_manifest(path)[0]
+
+def save_manifest(path: str, files: Dict[str, Dict[str, Any]], registry: Optional[Dict[str, Any]] = None) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files, "registry": registry}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def scan(data_dir: str, manifest: Dict[str, Dict[str, Any]], workers: Optional[int] = None) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Bring a (path -> {mtime_ns, size, sha256, urls}) manifest up to date with `data_dir`.
 
-    domains: Dict[str, Dict[str, Any]] = {}
-    from urllib.parse import urlparse
-    for u in sorted(urls):
+    `urls` holds [url, host, type] triples, classified when the file was parsed.
+    Files whose (mtime_ns, size) are unchanged are reused as-is. Candidates are
+    re-read and hashed, and parsed and classified only when their sha256
+    changed, in a process pool when there are enough of them (files and
+    bytes). Returns (manifest, reparsed).
+    """
+    files: Dict[str, Dict[str, Any]] = {}
+    stale: List[Tuple[str, Optional[str]]] = []
+    stale_bytes = 0
+    for fp in _json_files(data_dir):
         try:
-            host = urlparse(u).netloc.lower()
-            if host.startswith("www."):
-                host = host[4:]
-        except Exception:
-            host = ""
-        if not host:
+            st = os.stat(fp)
+        except OSError:
             continue
-        typ = classify_source(u)
-        entry = domains.setdefault(host, {"domain": host, "type": typ, "example_urls": []})
-        if len(entry["example_urls"]) < 3:
-            entry["example_urls"].append(u)
+        rel = os.path.relpath(fp, data_dir)
+        prev = manifest.get(rel)
+        if prev and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("size") == st.st_size:
+            files[rel] = prev
+        else:
+            files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": None, "urls": None}
+            stale.append((fp, (prev or {}).get("sha256")))
+            stale_bytes += st.st_size
+
+    parallel = len(stale) >= PARALLEL_MIN_FILES and stale_bytes >= PARALLEL_MIN_BYTES
+    if parallel and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_extract_star, stale, chunksize=max(1, len(stale) // 32)))
+    else:
+        results = [_extract_file(fp, sha) for fp, sha in stale]
+
+    reparsed = 0
+    for fp, sha, urls in results:
+        rel = os.path.relpath(fp, data_dir)
+        prev = manifest.get(rel)
+        entry = files[rel]
+        if sha is None:
+            # Deleted or unreadable since the scan: no URLs, and re-read next build.
+            entry["mtime_ns"] = None
+            entry["urls"] = []
+            continue
+        entry["sha256"] = sha
+        if prev and prev.get("sha256") == sha:
+            # Touched but identical content: not parsed, classification reused.
+            entry["urls"] = prev.get("urls")
+            continue
+        entry["urls"] = _classified(urls)
+        reparsed += 1
+    return files, reparsed
+
+def _merge(files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Registry from the per-file [url, host, type] triples; nothing is parsed or classified here."""
+    seen: Set[str] = set()
+    by_host: Dict[str, Tuple[str, List[str]]] = {}
+    for entry in files.values():
+        for u, host, typ in entry.get("urls") or ():
+            if u in seen:
+                continue
+            seen.add(u)
+            if not host:
+                continue
+            hit = by_host.get(host)
+            if hit is None:
+                by_host[host] = (typ, [u])
+            else:
+                hit[1].append(u)
+
+    # Domains in order of their first url, each with its three first urls (sorted order).
+    domains: List[Dict[str, Any]] = []
+    for host, (typ, host_urls) in by_host.items():
+        domains.append({"domain": host, "type": typ, "example_urls": heapq.nsmallest(3, host_urls)})
+    domains.sort(key=lambda d: d["example_urls"][0])
 
     by_type: Dict[str, int] = {}
-    for d in domains.values():
+    for d in domains:
         by_type[d["type"]] = by_type.get(d["type"], 0) + 1
 
     return {
         "version": "1.0.0",
         "generated_from": "data/*.json (recursive)",
-        "counts": {"domains": len(domains), "urls": len(urls)},
+        "counts": {"domains": len(domains), "urls": len(seen)},
         "by_type": dict(sorted(by_type.items(), key=lambda x: (-x[1], x[0]))),
-        "domains": list(domains.values()),
+        "domains": domains,
     }
 
-def write_registry(data_dir: str, out_path: str) -> Dict[str, Any]:
-    reg = build_registry(data_dir)
+def build_registry(data_dir: str, manifest_path: Optional[str] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Build the source-domain registry for every *.json under `data_dir`.
+
+    With `manifest_path`, per-file classified URLs and the last registry are
+    persisted. Only files that changed since the previous build are parsed and
+    classified; when none changed, the stored registry is returned and the
+    manifest is not rewritten.
+    """
+    manifest, registry = _load_manifest(manifest_path)
+    files, _ = scan(data_dir, manifest, workers=workers)
+    changed = files.keys() != manifest.keys() or any(files[k] is not manifest[k] for k in files)
+    if registry is None or changed:
+        registry = _merge(files)
+        if manifest_path:
+            save_manifest(manifest_path, files, registry)
+    return registry
+
+def write_registry(data_dir: str, out_path: str, manifest_path: Optional[str] = None) -> Dict[str, Any]:
+    reg = build_registry(data_dir, manifest_path=manifest_path)
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(reg, f, ensure_ascii=False, indent=2)
     return reg
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+EMPTY: Tuple[int, ...] = ()
+
+
+class TagIndex:
+    """Rows held in a tuple plus a lowercase tag -> sorted row-index tuple map.
+
+    Tag filtering becomes one dict lookup instead of lowercasing every tag
+    of every row per query.
+    """
+
+    __slots__ = ("rows", "by_tag", "tags")
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self.rows: Tuple[Dict[str, Any], ...] = tuple(rows)
+        by_tag: Dict[str, List[int]] = {}
+        tags = set()
+        for i, row in enumerate(self.rows):
+            for t in (row.get("tags") or []):
+                tags.add(str(t))
+                ids = by_tag.setdefault(str(t).lower(), [])
+                if not ids or ids[-1] != i:
+                    ids.append(i)
+        self.by_tag: Dict[str, Tuple[int, ...]] = {k: tuple(v) for k, v in by_tag.items()}
+        # Original spelling, as list_tags has always reported them.
+        self.tags: Tuple[str, ...] = tuple(sorted(tags))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def ids(self, tag: str) -> Tuple[int, ...]:
+        return self.by_tag.get(tag.strip().lower(), EMPTY)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.io import compiled
+
+
+def fold(s: Optional[str]) -> str:
+    """Accent- and case-insensitive key: 'Café_Noir-' -> 'cafe noir'."""
+    s = unicodedata.normalize("NFKD", s or "")
+    s = "".join(ch for ch in s if not unicodedata.combining(ch)).casefold()
+    s = s.replace("_", " ").replace("-", " ")
+    return " ".join(s.split())
+
+
+def _trigrams(s: str) -> Set[str]:
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, cap: int) -> int:
+    """Levenshtein distance, giving up early (returns cap + 1) once it exceeds `cap`."""
+    if abs(len(a) - len(b)) > cap:
+        return cap + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j, cb in enumerate(b, start=1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            best = min(best, cur[j])
+        if best > cap:
+            return cap + 1
+        prev = cur
+    return prev[-1]
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    key: str      # original spelling
+    index: int    # position in TermIndex.keys / values
+    kind: str     # exact | prefix | substring | fuzzy
+    score: float  # 1.0 exact, lower is weaker
+
+
+class TermIndex:
+    """Lookup structure over glossary keys, built once per file version.
+
+    - exact: folded key -> index
+    - prefix: folded keys kept sorted, prefix ranges found by bisect
+    - substring/fuzzy: trigram -> key ids, candidates verified or ranked by
+      trigram overlap and bounded edit distance
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]) -> None:
+        keys: List[str] = []
+        values: List[Any] = []
+        for k, v in entries:
+            keys.append(str(k))
+            values.append(v)
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.values: Tuple[Any, ...] = tuple(values)
+        self.folded: Tuple[str, ...] = tuple(fold(k) for k in keys)
+
+        self.exact: Dict[str, int] = {}
+        for i, f in enumerate(self.folded):
+            self.exact.setdefault(f, i)
+
+        self._sorted: List[Tuple[str, int]] = sorted((f, i) for i, f in enumerate(self.folded))
+        self._sorted_keys: List[str] = [f for f, _ in self._sorted]
+
+        grams: Dict[str, List[int]] = {}
+        self._gram_count: List[int] = []
+        for i, f in enumerate(self.folded):
+            g = _trigrams(f)
+            self._gram_count.append(len(g))
+            for t in g:
+                grams.setdefault(t, []).append(i)
+        self.grams: Dict[str, Tuple[int, ...]] = {t: tuple(v) for t, v in grams.items()}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get(self, query: str) -> Optional[int]:
+        return self.exact.get(fold(query))
+
+    def prefix(self, query: str, limit: int = 25) -> List[int]:
+        q = fold(query)
+        out: List[int] = []
+        i = bisect_left(self._sorted_keys, q)
+        while i < len(self._sorted) and len(out) < limit and self._sorted_keys[i].startswith(q):
+            out.append(self._sorted[i][1])
+            i += 1
+        return out
+
+    def substring(self, query: str) -> List[int]:
+        """Ids whose folded key contains the query, in file order."""
+        q = fold(query)
+        if not q:
+            return []
+        if len(q) < 3:
+            return [i for i, f in enumerate(self.folded) if q in f]
+        inner = {q[i:i + 3] for i in range(len(q) - 2)}
+        candidates: Optional[Set[int]] = None
+        for t in sorted(inner, key=lambda t: len(self.grams.get(t, ()))):
+            ids = self.grams.get(t)
+            if not ids:
+                return []
+            candidates = set(ids) if candidates is None else candidates & set(ids)
+            if not candidates:
+                return []
+        return sorted(i for i in (candidates or ()) if q in self.folded[i])
+
+    def fuzzy(self, query: str, limit: int = 5, max_distance: int = 2) -> List[TermMatch]:
+        q = fold(query)
+        if not q:
+            return []
+        qg = _trigrams(q)
+        shared: Dict[int, int] = {}
+        for t in qg:
+            for i in self.grams.get(t, ()):
+                shared[i] = shared.get(i, 0) + 1
+        # Only the best trigram overlaps pay for an edit-distance check.
+        dice_of = {i: 2.0 * n / (len(qg) + self._gram_count[i]) for i, n in shared.items()}
+        shortlist = sorted(dice_of, key=lambda i: -dice_of[i])[:limit * 4]
+        ranked: List[TermMatch] = []
+        for i in shortlist:
+            dice = dice_of[i]
+            dist = edit_distance(q, self.folded[i], max_distance)
+            if dist <= max_distance or dice >= 0.5:
+                score = max(dice, 1.0 - dist / max(len(q), 1)) * 0.9
+                ranked.append(TermMatch(self.keys[i], i, "fuzzy", round(score, 4)))
+        ranked.sort(key=lambda m: (-m.score, self.folded[m.index]))
+        return ranked[:limit]
+
+    def lookup(self, query: str, limit: int = 5) -> List[TermMatch]:
+        """Ranked candidates: exact, then prefix, then substring, then typo-tolerant matches."""
+        q = fold(query)
+        if not q:
+            return []
+        seen: Set[int] = set()
+        out: List[TermMatch] = []
+
+        def add(i: int, kind: str, score: float) -> None:
+            if i not in seen and len(out) < limit:
+                seen.add(i)
+                out.append(TermMatch(self.keys[i], i, kind, score))
+
+        hit = self.exact.get(q)
+        if hit is not None:
+            add(hit, "exact", 1.0)
+        for i in self.prefix(q, limit):
+            add(i, "prefix", 0.95)
+        if len(out) < limit:
+            for i in self.substring(q):
+                add(i, "substring", 0.92)
+        if len(out) < limit:
+            for m in self.fuzzy(q, limit):
+                add(m.index, m.kind, m.score)
+        return out
+
+    def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """'Did you mean' keys for a query with no exact match."""
+        return [m.key for m in self.lookup(query, limit) if m.kind != "exact"]
+
+
+def _entries(data: Any) -> List[Tuple[str, Any]]:
+    # Glossary shape: {"terms": [{"term": ..., ...}]}
+    if isinstance(data, dict) and isinstance(data.get("terms"), list):
+        return [(str(t.get("term", "")).strip(), t) for t in data["terms"] if isinstance(t, dict) and t.get("term")]
+    # Flat shapes: {"key": "text"} or {"key": {"label": ...}}
+    if isinstance(data, dict):
+        return [(str(k), v) for k, v in data.items()]
+    return []
+
+
+def build(data: Any) -> TermIndex:
+    return TermIndex(_entries(data))
+
+
+def index_for_file(path: str) -> TermIndex:
+    """Term index for a glossary file (animation vocabulary, explanatory terms, philosophy terms)."""
+    return compiled(path, build)
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 import requests
 
+from utils import executors, upstreams
+
 DEFAULT_TIMEOUT = 18
 
 @dataclass(frozen=True)
@@ -57,7 +59,7 @@ def try_download_pdf(patent_number: str, dest_path: str) -> Tuple[bool, str]:
     ua = os.getenv("TESLA_USER_AGENT") or "AcademicDiscordBot/1.0 (contact: set TESLA_USER_AGENT)"
     for url in urls:
         try:
-            r = requests.get(url, timeout=DEFAULT_TIMEOUT, headers={"User-Agent": ua})
+            r = requests.get(upstreams.url("uspto", url), timeout=DEFAULT_TIMEOUT, headers={"User-Agent": ua})
             if r.status_code == 200 and ("application/pdf" in (r.headers.get("content-type") or "")):
                 with open(dest_path, "wb") as f:
                     f.write(r.content)
@@ -65,3 +67,8 @@ def try_download_pdf(patent_number: str, dest_path: str) -> Tuple[bool, str]:
         except Exception:
             continue
     return False, urls[0] if urls else ""
+
+
+async def try_download_pdf_async(patent_number: str, dest_path: str) -> Tuple[bool, str]:
+    """try_download_pdf on the "uspto" pool (utils.executors)."""
+    return await executors.run("uspto", try_download_pdf, patent_number, dest_path)
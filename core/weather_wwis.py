@@ -2,6 +2,8 @@ from __future__ import annotations
 import re
 import requests
 
+from utils import executors, upstreams
+
 DEFAULT_TIMEOUT = 12
 
 # Lightweight HTML parsing (no scraping of provider sites; uses WMO WWIS directory only).
@@ -12,7 +14,7 @@ def find_member_link(country_name: str, members_url: str = "https://worldweather
     if not q:
         return None
 
-    r = requests.get(members_url, timeout=DEFAULT_TIMEOUT)
+    r = requests.get(upstreams.url("wwis", members_url), timeout=DEFAULT_TIMEOUT)
     r.raise_for_status()
     html = r.text
 
@@ -32,3 +34,8 @@ def find_member_link(country_name: str, members_url: str = "https://worldweather
         return href
     # WWIS links are usually relative
     return 'https://worldweather.wmo.int' + href if href.startswith('/') else 'https://worldweather.wmo.int/' + href
+
+
+async def find_member_link_async(country_name: str, members_url: str = "https://worldweather.wmo.int/en/members.html") -> str | None:
+    """find_member_link on the "wwis" pool (utils.executors)."""
+    return await executors.run("wwis", find_member_link, country_name, members_url)
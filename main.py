@@ -3,15 +3,25 @@ from __future__ import annotations
 import os
 import sys
 
-import discord
-from discord.ext import commands
-from dotenv import load_dotenv
-
-from commands import register_all_commands
-from utils.rate_limit import RateLimiter
+from utils.startup_profile import StartupProfiler
 
 
 def main() -> None:
+    # --profile-startup: report per-module import time and per-registrar cost.
+    profiler = StartupProfiler() if "--profile-startup" in sys.argv[1:] else None
+    if profiler is not None:
+        profiler.install()
+
+    # Imported here (not at module level) so the profiler can see them.
+    import discord
+    from discord.ext import commands
+    from dotenv import load_dotenv
+
+    from commands import register_all_commands
+    from core import audit_logger
+    from utils import command_sync, executors, metrics, sampling_profiler
+    from utils.rate_limit import RateLimiter
+
     load_dotenv()
 
     token = os.getenv("DISCORD_TOKEN")
@@ -26,25 +36,28 @@ def main() -> None:
 
     limiter = RateLimiter(cooldown_seconds=int(os.getenv("COOLDOWN_SECONDS", "8")))
 
-    register_all_commands(bot, bot.tree, data_dir, limiter)
+    register_all_commands(bot, bot.tree, data_dir, limiter, profiler=profiler)
+
+    if profiler is not None:
+        profiler.uninstall()
+        print(profiler.report())
+
+    syncer = command_sync.from_env(bot.tree)
+    metrics.from_env()
+    sampling_profiler.from_env()
 
     @bot.event
     async def on_ready() -> None:
-        guild_id = os.getenv("GUILD_ID")
-        try:
-            if guild_id:
-                guild = discord.Object(id=int(guild_id))
-                synced = await bot.tree.sync(guild=guild)
-                print(f"Synced {len(synced)} commands to guild {guild_id}.")
-            else:
-                synced = await bot.tree.sync()
-                print(f"Synced {len(synced)} commands globally.")
-        except Exception as e:
-            print(f"Command sync failed: {e}", file=sys.stderr)
-
+        # on_ready fires again after gateway reconnects; the syncer runs in the
+        # background and skips scopes whose command schema hash is unchanged.
+        syncer.schedule()
         print(f"Logged in as {bot.user} (id={bot.user.id})")
 
-    bot.run(token)
+    try:
+        bot.run(token)
+    finally:
+        executors.shutdown()
+        audit_logger.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,33 +1,163 @@
-import json, os
-from typing import Set
+"""User allowlist backed by allowlist.json ({"user_ids": [...]}).
+
+The ids live in memory as a frozenset; is_allowed() is a set lookup. The file
+is re-read only when its (mtime_ns, size) changes, and that is checked at most
+once every ALLOWLIST_CHECK_SECONDS (default 2), so edits made by hand or by
+another process are picked up without touching the disk on every call.
+
+Mutations go through update(add=..., remove=...): one lock-protected
+read-modify-write and one atomic replace (temp file + os.replace) for the
+whole batch. add()/remove() are single-id shorthands. The *_async variants
+coalesce every change requested in the same event-loop tick into one write,
+run on the "files" pool (utils.executors) so coroutines never block on it.
+An empty allowlist allows everyone.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import FrozenSet, Iterable, Optional, Set, Tuple
 
 STORE = os.path.join(os.path.dirname(__file__), "allowlist.json")
 
-def _load() -> Set[int]:
-    if not os.path.exists(STORE):
-        return set()
-    with open(STORE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return set(int(x) for x in data.get("user_ids", []))
+Version = Tuple[int, int]
+
+
+def _check_seconds() -> float:
+    try:
+        return float(os.getenv("ALLOWLIST_CHECK_SECONDS") or "2")
+    except ValueError:
+        return 2.0
+
+
+class Allowlist:
+    def __init__(self, path: str = STORE, check_seconds: Optional[float] = None) -> None:
+        self.path = path
+        self.check_seconds = _check_seconds() if check_seconds is None else check_seconds
+        self._ids: FrozenSet[int] = frozenset()
+        self._version: Optional[Version] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.writes = 0
+        # Async batching: changes queued until the scheduled flush picks them up.
+        self._pending_add: Set[int] = set()
+        self._pending_remove: Set[int] = set()
+        self._flush: Optional[asyncio.Future] = None
+
+    def _stat(self) -> Optional[Version]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> Set[int]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return set()
+        return set(int(x) for x in data.get("user_ids", []))
+
+    def _reload_locked(self) -> None:
+        version = self._stat()
+        if version != self._version or self._version is None:
+            self._ids = frozenset(self._read()) if version is not None else frozenset()
+            self._version = version
+            self.reloads += 1
+        self._next_check = time.monotonic() + self.check_seconds
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-read the file if it changed (or unconditionally with force=True)."""
+        with self._lock:
+            if force:
+                self._version = None
+            self._reload_locked()
+
+    def ids(self) -> FrozenSet[int]:
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._ids
+
+    def is_allowed(self, user_id: int) -> bool:
+        ids = self.ids()
+        return int(user_id) in ids if ids else True
+
+    def update(self, add: Iterable[int] = (), remove: Iterable[int] = ()) -> FrozenSet[int]:
+        """Apply a batch of additions and removals in one atomic write; returns the new id set."""
+        add_ids = {int(x) for x in add}
+        remove_ids = {int(x) for x in remove}
+        with self._lock:
+            # Start from the file, not the cached set, so concurrent external edits are kept.
+            self._reload_locked()
+            ids = (set(self._ids) | add_ids) - remove_ids
+            if ids == self._ids and self._version is not None:
+                return self._ids
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"user_ids": sorted(ids)}, f, indent=2)
+            os.replace(tmp, self.path)
+            self._ids = frozenset(ids)
+            self._version = self._stat()
+            self._next_check = time.monotonic() + self.check_seconds
+            self.writes += 1
+            return self._ids
+
+    async def update_async(self, add: Iterable[int] = (), remove: Iterable[int] = ()) -> FrozenSet[int]:
+        for x in add:
+            self._pending_remove.discard(int(x))
+            self._pending_add.add(int(x))
+        for x in remove:
+            self._pending_add.discard(int(x))
+            self._pending_remove.add(int(x))
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self._flush_pending())
+        return await asyncio.shield(self._flush)
+
+    async def _flush_pending(self) -> FrozenSet[int]:
+        from utils import executors
+
+        await asyncio.sleep(0)  # let callers scheduled in the same tick join this batch
+        add, remove = self._pending_add, self._pending_remove
+        self._pending_add, self._pending_remove = set(), set()
+        self._flush = None
+        return await executors.run("files", self.update, add, remove)
+
+
+_DEFAULT = Allowlist()
 
-def _save(ids: Set[int]) -> None:
-    with open(STORE, "w", encoding="utf-8") as f:
-        json.dump({"user_ids": sorted(list(ids))}, f, indent=2)
 
 def is_allowed(user_id: int) -> bool:
-    ids = _load()
-    return user_id in ids if ids else True
+    return _DEFAULT.is_allowed(user_id)
+
+
+def update(add: Iterable[int] = (), remove: Iterable[int] = ()) -> FrozenSet[int]:
+    return _DEFAULT.update(add, remove)
+
+
+async def update_async(add: Iterable[int] = (), remove: Iterable[int] = ()) -> FrozenSet[int]:
+    return await _DEFAULT.update_async(add, remove)
+
 
 def add(user_id: int) -> None:
-    ids = _load()
-    ids.add(int(user_id))
-    _save(ids)
+    _DEFAULT.update(add=(user_id,))
+
 
 def remove(user_id: int) -> None:
-    ids = _load()
-    if int(user_id) in ids:
-        ids.remove(int(user_id))
-    _save(ids)
+    _DEFAULT.update(remove=(user_id,))
+
+
+async def add_async(user_id: int) -> None:
+    await _DEFAULT.update_async(add=(user_id,))
+
+
+async def remove_async(user_id: int) -> None:
+    await _DEFAULT.update_async(remove=(user_id,))
+
 
 def list_ids() -> list[int]:
-    return sorted(list(_load()))
+    return sorted(_DEFAULT.ids())
@@ -0,0 +1,43 @@
+"""Audit every institutional source record ({"label", "url", "kind"}) under data/.
+
+Runs the same checks as core.audit (URL scheme, blocked hosts, allowed kinds,
+label length) and prints a per-file JSON report.
+
+Usage
+-----
+python scripts/audit_sources_report.py [--data-dir data] [--out report.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.audit import audit_report
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Audit every institutional source record in the data registries.")
+    ap.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    ap.add_argument("--out", default="", help="Write the JSON report here instead of stdout.")
+    args = ap.parse_args()
+
+    report = audit_report(args.data_dir)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    t = report["totals"]
+    print(f"{t['files']} files, {t['sources']} sources, {t['failed']} failing", file=sys.stderr)
+    return 1 if t["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
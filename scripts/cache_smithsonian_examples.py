@@ -29,6 +29,12 @@ from typing import Any, Dict, Iterable, List, Optional
 
 import requests
 
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import upstreams
+
 
 def load_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
@@ -78,7 +84,7 @@ def pins_from_config(cfg: Dict[str, Any]) -> Pins:
 
 
 def fetch_page(base_url: str, search_path: str, api_key: str, q: str, start: int, rows: int, timeout: int = 45) -> Dict[str, Any]:
-    url = base_url.rstrip("/") + search_path
+    url = upstreams.url("smithsonian", base_url.rstrip("/") + search_path)
     params = {"api_key": api_key, "q": q, "start": str(start), "rows": str(rows)}
     r = requests.get(url, params=params, timeout=timeout)
     r.raise_for_status()
@@ -17,12 +17,20 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 import requests
 
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import upstreams
+
 
 def load_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
@@ -72,7 +80,7 @@ def pins_from_config(cfg: Dict[str, Any]) -> Pins:
 
 
 def fetch_page(base_url: str, search_path: str, params: Dict[str, Any], timeout: int = 45) -> Dict[str, Any]:
-    url = base_url.rstrip("/") + search_path
+    url = upstreams.url("vam", base_url.rstrip("/") + search_path)
     r = requests.get(url, params=params, timeout=timeout)
     r.raise_for_status()
     return r.json()
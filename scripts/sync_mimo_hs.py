@@ -37,6 +37,12 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import upstreams
+
 
 def load_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
@@ -64,7 +70,7 @@ def canonicalize_https(url: str) -> str:
 
 def query_sparql(endpoint: str, query: str, timeout: int = 45) -> Dict[str, Any]:
     headers = {"Accept": "application/sparql-results+json"}
-    resp = requests.get(endpoint, params={"query": query}, headers=headers, timeout=timeout)
+    resp = requests.get(upstreams.url("sparql", endpoint), params={"query": query}, headers=headers, timeout=timeout)
     resp.raise_for_status()
     return resp.json()
 
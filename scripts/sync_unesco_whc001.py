@@ -6,6 +6,10 @@ Design goals
 1) **No runtime scraping**: the bot reads local JSON/JSONL only.
 2) **Pinning for stability**: endpoint + resource_id are defined in `config/unesco_whc.json`.
 3) **CI-friendly**: deterministic output ordering and a lock file for change detection.
+4) **Bounded**: the first page gives `result.total`; the remaining offsets are
+   fetched concurrently (with retries and exponential backoff), only the columns
+   the normalizer reads are requested, and rows are sorted through spill files
+   (external merge sort), so memory does not grow with the resource size.
 
 Configuration
 -------------
@@ -19,22 +23,47 @@ python scripts/sync_unesco_whc001.py --config config/unesco_whc.json
 
 Optional:
   --limit 1000
+  --concurrency 4     parallel page requests (config: concurrency)
+  --retries 4         attempts per page after the first (config: retries)
+  --spill-rows 50000  rows sorted in memory before spilling a run to disk
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import os
+import random
 import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
 
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import upstreams
+
+# Every source column _normalize_record can read; the others are not requested.
+SOURCE_FIELDS = (
+    "id", "wh_id", "site_id", "UNESCO_ID", "whc_id",
+    "name", "site", "site_name", "property",
+    "country", "states", "states_parties", "state_party",
+    "category", "type", "kind",
+    "year_inscribed", "date_inscribed", "inscription_year",
+    "criteria", "lat", "latitude", "lon", "longitude", "whc_url", "url",
+)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 @dataclass(frozen=True)
 class SyncConfig:
@@ -49,6 +78,8 @@ class SyncConfig:
     expected_domain: Optional[str]
     require_https: bool
     allow_redirects: bool
+    concurrency: int = 4
+    retries: int = 4
 
 
 def _load_json(path: Path) -> Any:
@@ -64,9 +95,11 @@ def _write_json(path: Path, obj: Any) -> None:
 
 def _write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
         for r in rows:
             f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
 
 
 def _safe_get(d: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
@@ -138,6 +171,8 @@ def _parse_config(config_path: Path) -> SyncConfig:
         expected_domain=pin.get("expected_domain"),
         require_https=bool(pin.get("require_https", True)),
         allow_redirects=bool(pin.get("allow_redirects", False)),
+        concurrency=int(raw.get("concurrency", 4)),
+        retries=int(raw.get("retries", 4)),
     )
 
 
@@ -185,33 +220,164 @@ def _enforce_lock(cfg: SyncConfig, *, lock_path: Path) -> Dict[str, Any]:
     return lock if isinstance(lock, dict) else {}
 
 
-def _datastore_search(cfg: SyncConfig, *, offset: int) -> Dict[str, Any]:
-    params = {
+def _session(cfg: SyncConfig) -> requests.Session:
+    s = requests.Session()
+    s.headers["Accept-Encoding"] = "gzip, deflate"
+    # One pooled connection per worker thread.
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, cfg.concurrency))
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def _datastore_search(
+    cfg: SyncConfig, *, offset: int, session: Optional[requests.Session] = None, fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
         "resource_id": cfg.resource_id,
         "limit": cfg.page_size,
         "offset": offset,
     }
-    resp = requests.get(
-        cfg.ckan_datastore_search_url,
-        params=params,
-        timeout=60,
-        allow_redirects=cfg.allow_redirects,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    if fields:
+        params["fields"] = ",".join(fields)
+    http = session or requests
+    for attempt in range(cfg.retries + 1):
+        try:
+            resp = http.get(
+                # Pinning and the lock check the configured URL; only the fetch is redirected.
+                upstreams.url("ckan", cfg.ckan_datastore_search_url),
+                params=params,
+                timeout=60,
+                allow_redirects=cfg.allow_redirects,
+            )
+            if resp.status_code not in RETRY_STATUS or attempt == cfg.retries:
+                resp.raise_for_status()
+                return resp.json()
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == cfg.retries:
+                raise
+        # 0.5s, 1s, 2s, ... with jitter so parallel pages do not retry in lockstep.
+        time.sleep(min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random()))
+    raise AssertionError("unreachable")
+
+
+def _page_rows(payload: Dict[str, Any], page: int) -> Tuple[int, List[Tuple[str, str, int, int, Dict[str, Any]]]]:
+    """(raw record count, [(sort keys..., page, seq, row)]) for one datastore_search page."""
+    records = _safe_get(payload, ["result", "records"], [])
+    if not isinstance(records, list):
+        raise RuntimeError("Unexpected response shape: result.records is not a list")
+    out = []
+    for r in records:
+        if not isinstance(r, dict):
+            continue
+        norm = _normalize_record(r)
+        if norm.get("wh_id") is None or not norm.get("name"):
+            continue
+        # (page, seq) keeps ties in source order and lets --limit cut in source order after sorting.
+        out.append((str(norm.get("wh_id")), str(norm.get("name")), page, len(out), norm))
+    return len(records), out
+
+
+def _spill(rows: List[Tuple[str, str, int, int, Dict[str, Any]]], spill_dir: str, n: int) -> str:
+    rows.sort(key=lambda x: x[:4])
+    path = os.path.join(spill_dir, f"run{n:05d}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return path
+
+
+def _read_run(path: str) -> Iterator[Tuple[str, str, int, int, Dict[str, Any]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield tuple(json.loads(line))  # type: ignore[misc]
+
+
+def _fetch_sorted_runs(cfg: SyncConfig, spill_dir: str, spill_rows: int) -> Tuple[List[str], Dict[int, int]]:
+    """Fetch every needed page into sorted spill runs; returns (run paths, valid rows per page)."""
+    session = _session(cfg)
+    runs: List[str] = []
+    buffer: List[Tuple[str, str, int, int, Dict[str, Any]]] = []
+    valid: Dict[int, int] = {}
+    have = 0
+
+    def take(page: int, payload: Dict[str, Any]) -> int:
+        nonlocal have
+        count, rows = _page_rows(payload, page)
+        valid[page] = len(rows)
+        have += len(rows)
+        buffer.extend(rows)
+        if len(buffer) >= spill_rows:
+            runs.append(_spill(buffer, spill_dir, len(runs)))
+            buffer.clear()
+        return count
+
+    first = _datastore_search(cfg, offset=0, session=session)
+    got = take(0, first)
+    total = _safe_get(first, ["result", "total"])
+    columns = {str(f.get("id")) for f in _safe_get(first, ["result", "fields"], []) or [] if isinstance(f, dict)}
+    fields = [f for f in SOURCE_FIELDS if f in columns] or None
+
+    if not isinstance(total, int):
+        # No total reported: page sequentially until a short page, as CKAN always allowed.
+        page = 0
+        while got >= cfg.page_size and not (cfg.limit and have >= cfg.limit):
+            page += 1
+            got = take(page, _datastore_search(cfg, offset=page * cfg.page_size, session=session, fields=fields))
+    else:
+        pages = -(-total // cfg.page_size)
+        nxt = 1
+        # Sliding window: at most 2 x concurrency pages requested or awaiting take(), so
+        # payloads held in memory stay bounded however large the resource is.
+        window = 2 * max(1, cfg.concurrency)
+        inflight: Dict[Future, int] = {}
+        with ThreadPoolExecutor(max_workers=max(1, cfg.concurrency)) as pool:
+            while True:
+                # With a limit, request only pages that could still be needed; rows dropped
+                # by the normalizer are made up by requesting further pages.
+                while (len(inflight) < window and nxt < pages
+                       and not (cfg.limit and have + len(inflight) * cfg.page_size >= cfg.limit)):
+                    fut = pool.submit(_datastore_search, cfg, offset=nxt * cfg.page_size, session=session, fields=fields)
+                    inflight[fut] = nxt
+                    nxt += 1
+                if not inflight:
+                    break
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    take(inflight.pop(fut), fut.result())
+    if buffer:
+        runs.append(_spill(buffer, spill_dir, len(runs)))
+    return runs, valid
+
+
+def _merged_rows(runs: List[str], valid: Dict[int, int], limit: int) -> Iterator[Dict[str, Any]]:
+    """Rows of every run in (wh_id, name) order; with a limit, only the first `limit` in source order."""
+    cut_page, cut_seq = len(valid), 0
+    if limit:
+        left = limit
+        for page in sorted(valid):
+            if valid[page] >= left:
+                cut_page, cut_seq = page, left
+                break
+            left -= valid[page]
+    for _, _, page, seq, row in heapq.merge(*(_read_run(p) for p in runs), key=lambda x: x[:4]):
+        if page < cut_page or (page == cut_page and seq < cut_seq):
+            yield row
 
 
-def _build_index(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _build_index(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     # Lightweight index: list of ids and name pairs for quick inspection.
     pairs = []
+    count = 0
     for r in rows:
+        count += 1
         wh_id = r.get("wh_id")
         name = r.get("name")
         if wh_id is None or not name:
             continue
         pairs.append({"wh_id": wh_id, "name": name})
     return {
-        "count": len(rows),
+        "count": count,
         "ids": pairs,
     }
 
@@ -220,6 +386,9 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", default="config/unesco_whc.json")
     ap.add_argument("--limit", type=int, default=None, help="Override config.limit (0 = no limit)")
+    ap.add_argument("--concurrency", type=int, default=None, help="Override config.concurrency (parallel pages)")
+    ap.add_argument("--retries", type=int, default=None, help="Override config.retries (per page)")
+    ap.add_argument("--spill-rows", type=int, default=50000, help="Rows sorted in memory per spill run")
     args = ap.parse_args()
 
     cfg_path = Path(args.config)
@@ -228,9 +397,11 @@ def main() -> int:
         return 2
 
     cfg = _parse_config(cfg_path)
-    if args.limit is not None:
+    overrides = {k: v for k, v in (("limit", args.limit), ("concurrency", args.concurrency),
+                                    ("retries", args.retries)) if v is not None}
+    if overrides:
         cfg = SyncConfig(
-            **{**cfg.__dict__, "limit": int(args.limit)}
+            **{**cfg.__dict__, **overrides}
         )
 
     try:
@@ -240,42 +411,27 @@ def main() -> int:
         print(f"[sync_unesco_whc001] configuration error: {e}", file=sys.stderr)
         return 2
 
-    all_rows: List[Dict[str, Any]] = []
-    offset = 0
-
-    try:
-        while True:
-            payload = _datastore_search(cfg, offset=offset)
-            records = _safe_get(payload, ["result", "records"], [])
-            if not isinstance(records, list):
-                raise RuntimeError("Unexpected response shape: result.records is not a list")
-
-            for r in records:
-                if not isinstance(r, dict):
-                    continue
-                norm = _normalize_record(r)
-                if norm.get("wh_id") is None or not norm.get("name"):
-                    continue
-                all_rows.append(norm)
-                if cfg.limit and len(all_rows) >= cfg.limit:
-                    break
-
-            if cfg.limit and len(all_rows) >= cfg.limit:
-                break
-            if len(records) < cfg.page_size:
-                break
-            offset += cfg.page_size
+    cfg.output_jsonl.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix=".whc_sort_", dir=str(cfg.output_jsonl.parent)) as spill_dir:
+        try:
+            runs, valid = _fetch_sorted_runs(cfg, spill_dir, max(1, args.spill_rows))
+        except Exception as e:
+            print(f"[sync_unesco_whc001] fetch failed: {e}", file=sys.stderr)
+            return 3
 
-    except Exception as e:
-        print(f"[sync_unesco_whc001] fetch failed: {e}", file=sys.stderr)
-        return 3
+        # Deterministic order to reduce diff churn; the index is collected while writing.
+        index_rows: List[Dict[str, Any]] = []
 
-    # Deterministic order to reduce diff churn
-    all_rows.sort(key=lambda x: (str(x.get("wh_id")), str(x.get("name"))))
+        def rows() -> Iterator[Dict[str, Any]]:
+            for r in _merged_rows(runs, valid, cfg.limit):
+                index_rows.append({"wh_id": r.get("wh_id"), "name": r.get("name")})
+                yield r
 
-    # Write outputs
-    _write_jsonl(cfg.output_jsonl, all_rows)
-    _write_json(cfg.output_index, _build_index(all_rows))
+        # Write outputs
+        _write_jsonl(cfg.output_jsonl, rows())
+    index = _build_index(index_rows)
+    _write_json(cfg.output_index, index)
 
     # Update lock
     now_utc = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -286,14 +442,15 @@ def main() -> int:
             "resource_id": cfg.resource_id,
         },
         "last_synced_utc": now_utc,
-        "record_count": len(all_rows),
+        "record_count": index["count"],
     }
     # Preserve optional notes
     if isinstance(lock, dict) and lock.get("notes"):
         new_lock["notes"] = lock.get("notes")
     _write_json(cfg.lock_file, new_lock)
 
-    print(f"Wrote {len(all_rows)} records to {cfg.output_jsonl}")
+    print(f"Wrote {index['count']} records to {cfg.output_jsonl} "
+          f"({len(valid)} pages, {len(runs)} sort runs, {time.perf_counter() - started:.1f}s)")
     return 0
 
 
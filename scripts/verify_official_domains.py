@@ -15,6 +15,25 @@ Checks
 - Captures redirect chain (final URL)
 - Optional lightweight text check: presence of brand/company tokens
 
+Items are checked concurrently over one pooled aiohttp session, bounded
+globally (--concurrency) and per host (--per-host). With the token check each
+URL is fetched with a single GET; with --no-token-check it is probed with HEAD,
+falling back to GET when HEAD does not answer 2xx/3xx (hosts that reject HEAD
+with 405/501 get GET for the rest of the run). The token check streams the body and stops once it has the first SNIPPET_CHARS of text
+(at most --max-bytes), instead of downloading whole pages. Finished items are
+appended to a checkpoint file (default <report>.partial.jsonl); an
+interrupted run resumes from it and the file is removed on success.
+
+Re-verification is incremental: an item whose verification.verified_at is
+younger than --max-age-days (and whose official_url is unchanged) is not
+fetched again. Stale PASS items are re-checked with conditional requests
+(If-None-Match / If-Modified-Since from the stored etag / last_modified), and
+a 304 keeps the previous verdict. --force re-checks everything.
+
+After writing the registry, the PASS + active subset is written to a derived
+view (<registry>.verified.json, see services.verification) that
+/japanbrands random reads directly. --view-only just rebuilds that view.
+
 Usage
 -----
 python scripts/verify_official_domains.py \
@@ -22,19 +41,36 @@ python scripts/verify_official_domains.py \
   --report data/jp_brands_verification_report.json
 
 Optionally:
-  --timeout 20
+  --timeout 20 --concurrency 32 --per-host 2 --max-bytes 65536 --no-token-check
+  --max-age-days 7 --force --view-only
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
 import json
 import os
 import re
 import sys
-from typing import Any, Dict, List, Tuple
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
 
-import requests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from services.verification import verified_view_path, write_verified_view
+
+USER_AGENT = "majopiica-researchbot-verifier/1.0 (+https://example.invalid)"
+SNIPPET_CHARS = 2000
+CHUNK = 8192
 
 
 def load_json(path: str) -> Any:
@@ -43,9 +79,11 @@ def load_json(path: str) -> Any:
 
 
 def save_json(path: str, obj: Any) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
 
 def normalize_https(url: str) -> str:
@@ -57,18 +95,6 @@ def normalize_https(url: str) -> str:
     return url
 
 
-def fetch(url: str, timeout: int) -> Tuple[str, int, List[str], str]:
-    """Return (final_url, status_code, redirect_chain, body_snippet)."""
-    headers = {
-        "User-Agent": "majopiica-researchbot-verifier/1.0 (+https://example.invalid)"
-    }
-    resp = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-    chain = [h.url for h in resp.history] + [resp.url]
-    text = resp.text or ""
-    snippet = re.sub(r"\s+", " ", text)[:2000]
-    return resp.url, resp.status_code, chain, snippet
-
-
 def token_hit(snippet: str, tokens: List[str]) -> bool:
     if not snippet:
         return False
@@ -80,79 +106,308 @@ def token_hit(snippet: str, tokens: List[str]) -> bool:
     return False
 
 
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_utc(value: Any) -> Optional[datetime]:
+    try:
+        t = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return t if t.tzinfo else t.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class Probe:
+    final_url: str
+    status: int
+    chain: List[str]
+    snippet: str = ""
+    etag: str = ""
+    last_modified: str = ""
+
+
+def _probe(resp: aiohttp.ClientResponse, snippet: str = "") -> Probe:
+    return Probe(str(resp.url), resp.status, [str(h.url) for h in resp.history] + [str(resp.url)], snippet,
+                 resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""))
+
+
+class Prober:
+    """Shared session, global/per-host limits and HEAD support memory for one run."""
+
+    def __init__(self, session: aiohttp.ClientSession, concurrency: int, per_host: int, timeout: int,
+                 max_bytes: int) -> None:
+        self.session = session
+        self.slots = asyncio.Semaphore(concurrency)
+        self.per_host = per_host
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_bytes = max_bytes
+        self.no_head: Set[str] = set()
+        self.bytes_read = 0
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        sem = self.host_slots.get(host)
+        if sem is None:
+            sem = self.host_slots[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def _snippet(self, resp: aiohttp.ClientResponse) -> str:
+        """Decode the body until SNIPPET_CHARS of whitespace-collapsed text (or max_bytes) are read."""
+        try:
+            decoder = codecs.getincrementaldecoder(resp.charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text = ""
+        read = 0
+        async for chunk in resp.content.iter_chunked(CHUNK):
+            read += len(chunk)
+            text = re.sub(r"\s+", " ", text + decoder.decode(chunk))
+            if len(text) >= SNIPPET_CHARS or read >= self.max_bytes:
+                break
+        self.bytes_read += read
+        return text[:SNIPPET_CHARS]
+
+    async def _get(self, url: str, want_body: bool, headers: Dict[str, str]) -> Probe:
+        async with self.session.get(url, headers=headers, timeout=self.timeout, allow_redirects=True) as resp:
+            snippet = await self._snippet(resp) if want_body and resp.status != 304 else ""
+            # Leaving the block early releases the connection without draining the rest.
+            return _probe(resp, snippet)
+
+    async def fetch(self, url: str, want_body: bool, validators: Optional[Dict[str, str]] = None) -> Probe:
+        """Probe `url`; `validators` are conditional-request headers (a 304 means unchanged)."""
+        headers = validators or {}
+        # Host slot first: tasks queued behind a busy host must not hold global slots.
+        async with self._host_slot(url), self.slots:
+            host = (urlsplit(url).hostname or "").lower()
+            # The token check needs the body anyway: one GET instead of HEAD + GET.
+            if not want_body and host not in self.no_head:
+                probe: Optional[Probe]
+                try:
+                    async with self.session.head(url, headers=headers, timeout=self.timeout,
+                                                 allow_redirects=True) as resp:
+                        probe = _probe(resp)
+                except aiohttp.ClientConnectorError:
+                    raise  # host unreachable: a GET would fail the same way
+                except aiohttp.ClientError:
+                    probe = None  # malformed HEAD answer (e.g. a body was sent): treat as unsupported
+                if probe is None or probe.status in (405, 501):
+                    self.no_head.add(host)
+                elif 200 <= probe.status < 400:
+                    return probe
+                # Any other HEAD error (403/404/5xx) may be HEAD-specific: let GET decide.
+            return await self._get(url, want_body, headers)
+
+def validators(item: Dict[str, Any], url: str) -> Dict[str, str]:
+    """Conditional-request headers from the last PASS of this same URL."""
+    prev = item.get("verification") or {}
+    if prev.get("status") != "PASS" or prev.get("checked_url") != url:
+        return {}
+    headers: Dict[str, str] = {}
+    if prev.get("etag"):
+        headers["If-None-Match"] = prev["etag"]
+    if prev.get("last_modified"):
+        headers["If-Modified-Since"] = prev["last_modified"]
+    return headers
+
+
+def is_fresh(item: Dict[str, Any], cutoff: datetime) -> bool:
+    prev = item.get("verification") or {}
+    t = parse_utc(prev.get("verified_at"))
+    # An item (de)activated since the last check needs a new verdict (INACTIVE <-> PASS/FAIL).
+    expected = ("PASS", "FAIL") if item.get("is_active") is True else ("INACTIVE",)
+    return (t is not None and t >= cutoff and prev.get("checked_url") == normalize_https(item.get("official_url", ""))
+            and prev.get("status") in expected)
+
+
+def fresh_result(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Report row for an item skipped because its last verification is still fresh."""
+    prev = item.get("verification") or {}
+    return {
+        "brand_name": item.get("brand_name"),
+        "official_url": normalize_https(item.get("official_url", "")),
+        "is_active": item.get("is_active") is True,
+        "final_url": prev.get("final_url") or "",
+        "http_status": prev.get("http_status"),
+        "redirect_chain": [],
+        "token_hit": prev.get("token_hit"),
+        "status": prev.get("status"),
+        "notes": [f"fresh: verified_at {prev.get('verified_at')}"],
+        "skipped": True,
+    }
+
+
+async def verify_item(prober: Prober, item: Dict[str, Any], token_check: bool) -> Dict[str, Any]:
+    brand = item.get("brand_name")
+    url = normalize_https(item.get("official_url", ""))
+    is_active = item.get("is_active") is True
+    prev = item.get("verification") or {}
+    etag = ""
+    last_modified = ""
+
+    status = "FAIL"
+    notes: List[str] = []
+    final_url = ""
+    code = None
+    chain: List[str] = []
+    text_hit = None
+
+    if not url:
+        notes.append("missing official_url")
+    elif not url.startswith("https://"):
+        notes.append("official_url is not https")
+    else:
+        try:
+            probe = await prober.fetch(url, token_check, validators(item, url))
+            final_url, code, chain, snippet = probe.final_url, probe.status, probe.chain, probe.snippet
+            etag, last_modified = probe.etag or prev.get("etag", ""), probe.last_modified or prev.get("last_modified", "")
+            if code == 304:
+                # Unchanged since the last PASS (validators are only sent for PASS): keep that verdict.
+                status = "PASS"
+                final_url = prev.get("final_url") or final_url
+                code = prev.get("http_status") or code
+                text_hit = prev.get("token_hit")
+                notes.append("not modified since last check (304)")
+            elif code and 200 <= int(code) < 400:
+                status = "PASS"
+            else:
+                notes.append(f"HTTP status {code}")
+            # Lightweight content token check
+            if token_check and status == "PASS" and probe.status != 304:
+                tokens = [brand, item.get("parent_company")]
+                text_hit = token_hit(snippet, [t for t in tokens if t])
+                if text_hit is False:
+                    notes.append("token check did not match (non-fatal)")
+        except Exception as e:
+            notes.append(f"request failed: {str(e) or type(e).__name__}")
+
+    return {
+        "brand_name": brand,
+        "official_url": url,
+        "is_active": is_active,
+        "final_url": final_url,
+        "http_status": code,
+        "redirect_chain": chain,
+        "token_hit": text_hit,
+        "status": status if is_active else "INACTIVE",
+        "notes": notes,
+        "etag": etag,
+        "last_modified": last_modified,
+        "checked_at": utc_now(),
+    }
+
+
+def load_checkpoint(path: str) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """(item index, url) -> result for items finished by an earlier, interrupted run."""
+    done: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            done[(int(rec["index"]), rec["result"]["official_url"])] = rec["result"]
+    return done
+
+
+async def verify_all(items: List[Dict[str, Any]], args: argparse.Namespace, checkpoint: str) -> List[Dict[str, Any]]:
+    done = load_checkpoint(checkpoint)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.max_age_days)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    todo: List[int] = []
+    fresh = 0
+    for i, item in enumerate(items):
+        prev = done.get((i, normalize_https(item.get("official_url", ""))))
+        if prev is not None:
+            results[i] = prev
+        elif not args.force and args.max_age_days > 0 and is_fresh(item, cutoff):
+            results[i] = fresh_result(item)
+            fresh += 1
+        else:
+            todo.append(i)
+    if done:
+        print(f"Resuming: {len(done)} items already verified ({checkpoint})", file=sys.stderr)
+    if fresh:
+        print(f"Skipping {fresh} items verified within {args.max_age_days} days", file=sys.stderr)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    os.makedirs(os.path.dirname(checkpoint) or ".", exist_ok=True)
+    t0 = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}) as session:
+        prober = Prober(session, args.concurrency, args.per_host, args.timeout, args.max_bytes)
+        with open(checkpoint, "a+", encoding="utf-8") as ck:
+            if ck.tell():
+                ck.write("\n")  # a crash may have left a torn last line; start ours on a fresh one
+
+            async def run(i: int) -> None:
+                res = await verify_item(prober, items[i], not args.no_token_check)
+                results[i] = res
+                ck.write(json.dumps({"index": i, "result": res}, ensure_ascii=False) + "\n")
+                ck.flush()
+
+            await asyncio.gather(*(run(i) for i in todo))
+    print(f"Checked {len(todo)} items in {time.perf_counter() - t0:.1f}s "
+          f"({prober.bytes_read} body bytes read, HEAD unsupported on {len(prober.no_head)} hosts)", file=sys.stderr)
+    return [r for r in results if r is not None]
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--registry", default="data/japan_brands_official_registry.json")
     ap.add_argument("--report", default="data/jp_brands_verification_report.json")
     ap.add_argument("--timeout", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=32, help="Requests in flight across all hosts.")
+    ap.add_argument("--per-host", type=int, default=2, help="Requests in flight per host.")
+    ap.add_argument("--max-bytes", type=int, default=65536, help="Body bytes read at most for the token check.")
+    ap.add_argument("--no-token-check", action="store_true", help="Skip the body read; HEAD/status only.")
+    ap.add_argument("--checkpoint", default="", help="Progress file (default <report>.partial.jsonl).")
+    ap.add_argument("--max-age-days", type=float, default=7,
+                    help="Skip items verified more recently than this (0 re-checks everything).")
+    ap.add_argument("--force", action="store_true", help="Re-check every item regardless of age.")
+    ap.add_argument("--view", default="", help="Verified view path (default <registry>.verified.json).")
+    ap.add_argument("--view-only", action="store_true", help="Only rebuild the verified view from the registry.")
     args = ap.parse_args()
+    view_path = args.view or verified_view_path(args.registry)
 
-    reg = load_json(args.registry)
-    items: List[Dict[str, Any]] = reg.get("items", []) if isinstance(reg, dict) else []
-
-    results = []
-    for item in items:
-        brand = item.get("brand_name")
-        url = normalize_https(item.get("official_url", ""))
-        is_active = item.get("is_active") is True
-
-        status = "FAIL"
-        notes: List[str] = []
-        final_url = ""
-        code = None
-        chain: List[str] = []
-        text_hit = None
-
-        if not url:
-            notes.append("missing official_url")
-        elif not url.startswith("https://"):
-            notes.append("official_url is not https")
-        else:
-            try:
-                final_url, code, chain, snippet = fetch(url, args.timeout)
-                if code and 200 <= int(code) < 400:
-                    status = "PASS"
-                else:
-                    notes.append(f"HTTP status {code}")
-                # Lightweight content token check
-                tokens = [brand, item.get("parent_company")]
-                text_hit = token_hit(snippet, [t for t in tokens if t])
-                if text_hit is False:
-                    notes.append("token check did not match (non-fatal)")
-            except Exception as e:
-                notes.append(f"request failed: {e}")
-
-        # Store result
-        results.append(
-            {
-                "brand_name": brand,
-                "official_url": url,
-                "is_active": is_active,
-                "final_url": final_url,
-                "http_status": code,
-                "redirect_chain": chain,
-                "token_hit": text_hit,
-                "status": status if is_active else "INACTIVE",
-                "notes": notes,
-            }
-        )
-
-        # Also update item.verification (non-destructive)
-        item.setdefault("verification", {})
-        item["verification"].update(
-            {
-                "status": status if is_active else "INACTIVE",
-                "verified_at": reg.get("generated_at") or None,
-                "final_url": final_url,
-                "http_status": code,
-            }
-        )
-
-    save_json(args.report, {"items": results})
-    save_json(args.registry, reg)
-
-    passes = sum(1 for r in results if r.get("status") == "PASS")
-    print(f"Verification complete. PASS={passes}/{len(results)}")
+    if not args.view_only:
+        reg = load_json(args.registry)
+        items: List[Dict[str, Any]] = reg.get("items", []) if isinstance(reg, dict) else []
+        checkpoint = args.checkpoint or args.report + ".partial.jsonl"
+
+        results = asyncio.run(verify_all(items, args, checkpoint))
+
+        for item, res in zip(items, results):
+            if res.get("skipped"):
+                continue
+            # Also update item.verification (non-destructive)
+            item.setdefault("verification", {})
+            item["verification"].update(
+                {
+                    "status": res["status"],
+                    "verified_at": res.get("checked_at") or utc_now(),
+                    "final_url": res["final_url"],
+                    "http_status": res["http_status"],
+                    "etag": res.get("etag") or "",
+                    "last_modified": res.get("last_modified") or "",
+                    "checked_url": res["official_url"],
+                    "token_hit": res.get("token_hit"),
+                }
+            )
+
+        save_json(args.report, {"items": results})
+        save_json(args.registry, reg)
+        os.remove(checkpoint)
+
+        passes = sum(1 for r in results if r.get("status") == "PASS")
+        fresh = sum(1 for r in results if r.get("skipped"))
+        print(f"Verification complete. PASS={passes}/{len(results)} (checked {len(results) - fresh}, fresh {fresh})")
+
+    view = write_verified_view(args.registry, view_path)
+    print(f"Verified view: {view['count']} items -> {view_path} (version {view['version']})")
     return 0
 
 
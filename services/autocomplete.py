@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import discord
+from discord import app_commands
+
+from core.term_index import fold
+from services.registry_loader import dataset_version, load_json
+
+# Discord limits: at most 25 choices, name and value at most 100 characters.
+MAX_CHOICES = 25
+CHOICE_LIMIT = 100
+
+Pair = Tuple[str, str]  # (label shown to the user, value submitted)
+
+
+def _word_starts(folded: str) -> List[str]:
+    return [folded[i:] for i in range(len(folded)) if i == 0 or folded[i - 1] == " "]
+
+
+def _matches(folded: str, q: str) -> bool:
+    return any(w.startswith(q) for w in _word_starts(folded))
+
+
+class PrefixIndex:
+    """Sorted folded labels plus a sorted (folded word start, choice id) array.
+
+    "verd" matches "Giuseppe Verdi" through the word-start key "verdi".
+    Completion is a bisect and a short forward scan over each array.
+    """
+
+    def __init__(self, pairs: Iterable[Pair]) -> None:
+        seen: Dict[str, int] = {}
+        labels: List[str] = []
+        choices: List[app_commands.Choice[str]] = []
+        for label, value in pairs:
+            label = str(label).strip()
+            value = str(value).strip()
+            if not label or not value or value in seen:
+                continue
+            seen[value] = len(choices)
+            labels.append(label)
+            choices.append(app_commands.Choice(name=label[:CHOICE_LIMIT], value=value[:CHOICE_LIMIT]))
+        self.choices: Tuple[app_commands.Choice[str], ...] = tuple(choices)
+        self.folded: Tuple[str, ...] = tuple(fold(l) for l in labels)
+        self.folded_by_value: Dict[str, str] = {c.value: f for c, f in zip(self.choices, self.folded)}
+
+        order = sorted(range(len(labels)), key=lambda i: self.folded[i])
+        self._labels: List[str] = [self.folded[i] for i in order]
+        self._label_ids: Tuple[int, ...] = tuple(order)
+        words: List[Tuple[str, int]] = []
+        for i, f in enumerate(self.folded):
+            words.extend((key, i) for key in _word_starts(f)[1:])
+        words.sort()
+        self._words: List[str] = [k for k, _ in words]
+        self._word_ids: Tuple[int, ...] = tuple(i for _, i in words)
+        self._default: Tuple[app_commands.Choice[str], ...] = tuple(self.choices[i] for i in order[:MAX_CHOICES])
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def complete(self, current: str, limit: int = MAX_CHOICES) -> Tuple[app_commands.Choice[str], ...]:
+        return self.search(current, limit)[0]
+
+    def search(self, current: str, limit: int = MAX_CHOICES) -> Tuple[Tuple[app_commands.Choice[str], ...], bool]:
+        """(choices, exhaustive): exhaustive is True only when the result holds every match."""
+        q = fold(current)
+        if not q:
+            return self._default[:limit], len(self.choices) <= limit
+        # Label-prefix hits first, already in label order.
+        out: List[int] = []
+        i = bisect_left(self._labels, q)
+        while i < len(self._labels) and len(out) < limit and self._labels[i].startswith(q):
+            out.append(self._label_ids[i])
+            i += 1
+        if len(out) == limit:
+            return tuple(self.choices[cid] for cid in out), False
+        # Fill the rest with word-start hits from a bounded window, ordered by label.
+        taken = set(out)
+        more: Dict[int, str] = {}
+        i = bisect_left(self._words, q)
+        budget = limit * 8
+        while i < len(self._words) and budget and self._words[i].startswith(q):
+            cid = self._word_ids[i]
+            if cid not in taken:
+                more[cid] = self.folded[cid]
+            i += 1
+            budget -= 1
+        # Stopping on the budget (not on the first non-matching key) may have missed matches.
+        exhaustive = not (i < len(self._words) and self._words[i].startswith(q))
+        exhaustive = exhaustive and len(out) + len(more) <= limit
+        out.extend(sorted(more, key=lambda cid: more[cid])[:limit - len(out)])
+        return tuple(self.choices[cid] for cid in out), exhaustive
+
+
+class AutocompleteProvider:
+    """Answers Discord autocomplete requests for one option from a prebuilt PrefixIndex.
+
+    The index is rebuilt only when `version()` changes (e.g. the registry file
+    was edited). The last (prefix, result) per user is cached, so repeated
+    requests and extensions of a complete result set skip the index.
+
+    Attach with `@app_commands.autocomplete(param=provider.callback)`.
+    """
+
+    def __init__(self, name: str, source: Callable[[], Iterable[Pair]],
+                 version: Optional[Callable[[], Hashable]] = None, cache_size: int = 4096) -> None:
+        self.name = name
+        self._source = source
+        self._version_fn = version
+        self._version: Hashable = None
+        self._index: Optional[PrefixIndex] = None
+        # user id -> (index version, folded prefix, result, result holds every match)
+        self._cache: "OrderedDict[int, Tuple[Hashable, str, Tuple[app_commands.Choice[str], ...], bool]]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def index(self) -> PrefixIndex:
+        version = self._version_fn() if self._version_fn is not None else None
+        if self._index is None or version != self._version:
+            self._index = PrefixIndex(self._source())
+            self._version = version
+            self._cache.clear()
+        return self._index
+
+    def complete(self, current: str, user_id: Optional[int] = None) -> List[app_commands.Choice[str]]:
+        index = self.index()
+        if user_id is None:
+            return list(index.complete(current))
+
+        q = fold(current)
+        hit = self._cache.get(user_id)
+        if hit is not None and hit[0] == self._version:
+            _, prev_q, prev, exhaustive = hit
+            if prev_q == q:
+                self._cache.move_to_end(user_id)
+                return list(prev)
+            # A shorter prefix whose result held every match: narrowing it is enough.
+            if prev_q and q.startswith(prev_q) and exhaustive:
+                result = tuple(c for c in prev if _matches(index.folded_by_value[c.value], q))
+                self._remember(user_id, q, result, True)
+                return list(result)
+
+        result, exhaustive = index.search(current)
+        self._remember(user_id, q, result, exhaustive)
+        return list(result)
+
+    def _remember(self, user_id: int, q: str, result: Tuple[app_commands.Choice[str], ...], exhaustive: bool) -> None:
+        self._cache[user_id] = (self._version, q, result, exhaustive)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def callback(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return self.complete(current, getattr(interaction.user, "id", None))
+
+
+def file_version(path: str) -> Callable[[], Hashable]:
+    def version() -> Hashable:
+        try:
+            return dataset_version(Path(path))
+        except OSError:
+            return None
+    return version
+
+
+def from_registry(name: str, path: str, extract: Callable[[Any], Iterable[Pair]]) -> AutocompleteProvider:
+    """Provider over a JSON registry file; `extract` maps the parsed file to (label, value) pairs."""
+    def source() -> Iterable[Pair]:
+        if not os.path.exists(path):
+            return []
+        return extract(load_json(Path(path)))
+    return AutocompleteProvider(name, source, version=file_version(path))
+
+
+# Built-in providers for registry key fields.
+
+def composer_names(path: str) -> AutocompleteProvider:
+    def extract(data: Any) -> Iterable[Pair]:
+        rows = data if isinstance(data, list) else []
+        return [(c["name"], c["name"]) for c in rows if c.get("nationality") == "Italian" and c.get("name")]
+    return from_registry("composer_names", path, extract)
+
+
+def composer_periods() -> AutocompleteProvider:
+    from core.italian_composers import VALID_PERIODS
+    return AutocompleteProvider("composer_periods", lambda: [(p.title(), p) for p in sorted(VALID_PERIODS)])
+
+
+def glossary_terms(path: str) -> AutocompleteProvider:
+    from core.term_index import build
+    return from_registry("glossary_terms", path, lambda data: [(k, k) for k in build(data).keys])
+
+
+def roman_periods(path: str) -> AutocompleteProvider:
+    def extract(data: Any) -> Iterable[Pair]:
+        items = data.get("items", []) if isinstance(data, dict) else []
+        return [(f"{it.get('title') or it['key']} ({it['key']})", it["key"]) for it in items if it.get("key")]
+    return from_registry("roman_periods", path, extract)
+
+
+def michelin_territories() -> AutocompleteProvider:
+    def source() -> Iterable[Pair]:
+        # Imported on first keystroke only: core.michelin_world pulls in requests + bs4.
+        from core.michelin_world import TERRITORY_MAP
+        return [(k.upper() if len(k) <= 3 else k.title(), k) for k in TERRITORY_MAP]
+    return AutocompleteProvider("michelin_territories", source)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping
 
 import discord
 
@@ -30,21 +31,43 @@ def _format_sources(sources: Any) -> List[str]:
     return out
 
 
-def entry_embed(title_prefix: str, entry: Dict[str, Any]) -> discord.Embed:
-    """Create a consistent embed for registry items.
+# Discord embed limits (https://discord.com/developers/docs/resources/message#embed-object-embed-limits)
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FOOTER_LIMIT = 2048
 
-    This is a service-layer version that tolerates richer 'sources' shapes.
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def entry_payload(title_prefix: str, entry: Dict[str, Any]) -> Mapping[str, Any]:
+    """Render a registry item into an immutable Discord embed payload.
+
+    Every string is truncated to Discord's per-field limits, so the payload can
+    be built once per dataset version and sent as-is afterwards.
     """
     name = entry.get("name", "Unknown")
-    e = discord.Embed(title=f"{title_prefix}: {name}")
+    payload: Dict[str, Any] = {"type": "rich", "title": _clip(f"{title_prefix}: {name}", TITLE_LIMIT)}
 
     subtitle = entry.get("subtitle") or entry.get("type") or entry.get("category")
     if subtitle:
-        e.description = str(subtitle)
+        payload["description"] = _clip(str(subtitle), DESCRIPTION_LIMIT)
+
+    fields: List[Mapping[str, Any]] = []
+
+    def add_field(field_name: str, value: str) -> None:
+        fields.append(MappingProxyType({
+            "name": _clip(field_name, FIELD_NAME_LIMIT),
+            "value": _clip(value, FIELD_VALUE_LIMIT),
+            "inline": False,
+        }))
 
     description = entry.get("description")
     if description:
-        e.add_field(name="Summary", value=str(description), inline=False)
+        add_field("Summary", str(description))
 
     meta_bits: List[str] = []
     for key in ("country", "region", "period", "classification", "hs_code"):
@@ -52,14 +75,33 @@ def entry_embed(title_prefix: str, entry: Dict[str, Any]) -> discord.Embed:
         if val:
             meta_bits.append(f"{key.replace('_', ' ').title()}: {val}")
     if meta_bits:
-        e.add_field(name="Metadata", value="\n".join(meta_bits), inline=False)
+        add_field("Metadata", "\n".join(meta_bits))
 
     sources = _format_sources(entry.get("sources"))
     if sources:
-        e.add_field(name="Official / Academic sources", value="\n".join(sources[:3]), inline=False)
+        add_field("Official / Academic sources", "\n".join(sources[:3]))
+
+    payload["fields"] = tuple(fields)
 
     note = entry.get("note")
     if note:
-        e.set_footer(text=str(note))
+        payload["footer"] = MappingProxyType({"text": _clip(str(note), FOOTER_LIMIT)})
 
-    return e
+    return MappingProxyType(payload)
+
+
+def embed_from_payload(payload: Mapping[str, Any]) -> discord.Embed:
+    """Build a fresh (mutable) embed from a cached payload without sharing state with it."""
+    data = dict(payload)
+    data["fields"] = [dict(f) for f in payload.get("fields", ())]
+    if "footer" in payload:
+        data["footer"] = dict(payload["footer"])
+    return discord.Embed.from_dict(data)
+
+
+def entry_embed(title_prefix: str, entry: Dict[str, Any]) -> discord.Embed:
+    """Create a consistent embed for registry items.
+
+    This is a service-layer version that tolerates richer 'sources' shapes.
+    """
+    return embed_from_payload(entry_payload(title_prefix, entry))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import discord
+
+from services.embed_factory import embed_from_payload, entry_payload
+from services.registry_loader import dataset_version
+from utils import executors
+
+# A dataset version is the (mtime_ns, size) of its file: any edit or re-sync
+# produces a new version and invalidates the compiled payloads.
+Version = Tuple[int, int]
+Loader = Callable[[Path], List[Dict[str, Any]]]
+Normalizer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_ID_KEYS = ("id", "wh_id", "instrument_id", "brand_id", "name", "brand_name")
+
+
+def item_id(item: Dict[str, Any], index: int) -> str:
+    for key in _ID_KEYS:
+        val = item.get(key)
+        if val not in (None, ""):
+            return str(val)
+    return f"#{index}"
+
+
+@dataclass(frozen=True)
+class CompiledRegistry:
+    """Registry items normalized and rendered once into immutable embed payloads."""
+
+    registry: str
+    version: Version
+    ids: Tuple[str, ...]
+    payloads: Tuple[Mapping[str, Any], ...]
+    _index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def payload(self, key: str) -> Optional[Mapping[str, Any]]:
+        i = self._index.get(key)
+        return None if i is None else self.payloads[i]
+
+    def embed(self, index: int) -> discord.Embed:
+        return embed_from_payload(self.payloads[index])
+
+    def random_embed(self) -> discord.Embed:
+        if not self.payloads:
+            raise RuntimeError(f"Registry '{self.registry}' has no items.")
+        return self.embed(random.randrange(len(self.payloads)))
+
+
+# (registry name, path) -> latest compiled version
+_COMPILED: Dict[Tuple[str, str], CompiledRegistry] = {}
+# Compiles run on executor threads; one lock per slot so concurrent misses build once.
+_SLOT_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+_SLOT_LOCKS_GUARD = threading.Lock()
+
+
+def compile_registry(registry: str, path: Path, title_prefix: str, loader: Loader,
+                     normalize: Optional[Normalizer] = None) -> CompiledRegistry:
+    """Return the compiled payloads for `registry`, rebuilding only when the file version changed.
+
+    Cache key is (registry, item id, version): a CompiledRegistry holds one
+    version and resolves item ids to payloads.
+    """
+    version = dataset_version(path)
+    slot = (registry, str(path))
+    cached = _COMPILED.get(slot)
+    if cached is not None and cached.version == version:
+        return cached
+
+    with _SLOT_LOCKS_GUARD:
+        lock = _SLOT_LOCKS.setdefault(slot, threading.Lock())
+    with lock:
+        cached = _COMPILED.get(slot)
+        if cached is not None and cached.version == version:
+            return cached
+        return _build(registry, path, version, title_prefix, loader, normalize)
+
+
+def _build(registry: str, path: Path, version: Version, title_prefix: str, loader: Loader,
+           normalize: Optional[Normalizer]) -> CompiledRegistry:
+    ids: List[str] = []
+    payloads: List[Mapping[str, Any]] = []
+    for i, raw in enumerate(loader(path)):
+        entry = normalize(raw) if normalize is not None else raw
+        ids.append(item_id(raw, i))
+        payloads.append(entry_payload(title_prefix, entry))
+
+    compiled = CompiledRegistry(
+        registry=registry,
+        version=version,
+        ids=tuple(ids),
+        payloads=tuple(payloads),
+        _index={k: i for i, k in enumerate(ids)},
+    )
+    _COMPILED[(registry, str(path))] = compiled
+    return compiled
+
+
+async def compile_registry_async(registry: str, path: Path, title_prefix: str, loader: Loader,
+                                 normalize: Optional[Normalizer] = None) -> CompiledRegistry:
+    """compile_registry on the "files" pool: the version stat and any reload stay off the event loop."""
+    return await executors.run("files", compile_registry, registry, path, title_prefix, loader, normalize)
+
+
+def clear() -> None:
+    _COMPILED.clear()
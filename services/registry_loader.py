@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils import executors
+from utils.io import file_version
 
 
 def load_json(path: Path) -> Any:
@@ -10,6 +13,11 @@ def load_json(path: Path) -> Any:
         return json.load(f)
 
 
+def dataset_version(path: Path) -> Tuple[int, int]:
+    """(mtime_ns, size) of a dataset file; changes whenever the file is edited or re-synced."""
+    return file_version(str(path))
+
+
 def load_registry_items(path: Path, key: str) -> List[Dict[str, Any]]:
     obj = load_json(path)
     items = obj.get(key, []) if isinstance(obj, dict) else []
@@ -36,3 +44,18 @@ def load_optional_json(path: Path) -> Optional[Any]:
     if not path.exists():
         return None
     return load_json(path)
+
+
+# Async facades: the loaders above on the "files" pool (utils.executors), so
+# parsing a large registry does not stall the event loop.
+
+async def load_json_async(path: Path) -> Any:
+    return await executors.run("files", load_json, path)
+
+
+async def load_registry_items_async(path: Path, key: str) -> List[Dict[str, Any]]:
+    return await executors.run("files", load_registry_items, path, key)
+
+
+async def load_optional_json_async(path: Path) -> Optional[Any]:
+    return await executors.run("files", load_optional_json, path)
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.registry_loader import dataset_version, load_json
 
 
 def filter_verified_official_items(reg: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -28,3 +35,69 @@ def filter_verified_official_items(reg: Dict[str, Any]) -> List[Dict[str, Any]]:
         if status == "PASS":
             out.append(i)
     return out
+
+
+# Derived view: the PASS + active subset, written next to the registry by
+# scripts/verify_official_domains.py so /japanbrands reads it without filtering.
+VIEW_NAME = "verified_official"
+
+
+def verified_view_path(registry_path: str) -> str:
+    root, ext = os.path.splitext(registry_path)
+    return f"{root}.verified{ext or '.json'}"
+
+
+def build_verified_view(reg: Dict[str, Any], source_bytes: bytes) -> Dict[str, Any]:
+    """View document for `reg`; `source_bytes` is the registry file it was built from."""
+    items = filter_verified_official_items(reg)
+    body = json.dumps(items, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return {
+        "view": VIEW_NAME,
+        "version": hashlib.sha256(body).hexdigest()[:16],
+        "source_sha256": hashlib.sha256(source_bytes).hexdigest(),
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "count": len(items),
+        "items": items,
+    }
+
+
+def write_verified_view(registry_path: str, view_path: Optional[str] = None) -> Dict[str, Any]:
+    """Rebuild the view from the registry on disk (atomic replace); returns the view document."""
+    with open(registry_path, "rb") as f:
+        raw = f.read()
+    view = build_verified_view(json.loads(raw), raw)
+    out = view_path or verified_view_path(registry_path)
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(view, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, out)
+    return view
+
+
+# registry path -> ((registry version, view version), answer)
+_CURRENT: Dict[str, Tuple[Tuple[Tuple[int, int], Tuple[int, int]], bool]] = {}
+
+
+def view_is_current(view_path: str, registry_path: str) -> bool:
+    """True when the view exists and was built from the registry's current content.
+
+    Compares the view's source_sha256 with the registry bytes (mtimes are
+    arbitrary after a clone or deploy); the answer is cached per version of
+    both files. Blocking: call it from the "files" pool.
+    """
+    try:
+        key = (dataset_version(Path(registry_path)), dataset_version(Path(view_path)))
+    except FileNotFoundError:
+        return False
+    hit = _CURRENT.get(registry_path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    try:
+        with open(registry_path, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        view = load_json(Path(view_path))
+        current = isinstance(view, dict) and view.get("source_sha256") == sha
+    except (OSError, ValueError):
+        current = False
+    _CURRENT[registry_path] = (key, current)
+    return current
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class CommandProfiler:
+    """Opt-in cProfile capture for slow slash commands.
+
+    While disabled, wrapped commands pay one attribute check. When enabled for
+    a command (or "*"), each call runs under cProfile; calls slower than
+    `threshold_ms` are saved as <dir>/<stamp>_<command>.prof plus a .json
+    metadata file, keeping the newest `keep` captures.
+
+    Only one command is profiled at a time (the interpreter has a single
+    profiler hook); overlapping calls run unprofiled. Because handlers await,
+    a capture can include frames from other tasks that ran meanwhile.
+    """
+
+    def __init__(self, directory: str, threshold_ms: float = 1000.0, keep: int = 20) -> None:
+        self.directory = directory
+        self.threshold_ms = threshold_ms
+        self.keep = keep
+        self.enabled = False
+        self.targets: FrozenSet[str] = frozenset()
+        self._busy = threading.Lock()
+        self.captured = 0
+        self.skipped = 0
+
+    def enable(self, targets: str = "*", threshold_ms: Optional[float] = None) -> None:
+        """targets: "*" or comma-separated qualified command names ("instrument random,stats")."""
+        self.targets = frozenset(t.strip() for t in targets.split(",") if t.strip()) or frozenset({"*"})
+        if threshold_ms is not None:
+            self.threshold_ms = float(threshold_ms)
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def wants(self, name: str) -> bool:
+        return self.enabled and ("*" in self.targets or name in self.targets)
+
+    def wrap(self, name: str) -> Callable[[F], F]:
+        def deco(fn: F) -> F:
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.wants(name):
+                    return await fn(*args, **kwargs)
+                if not self._busy.acquire(blocking=False):
+                    self.skipped += 1
+                    return await fn(*args, **kwargs)
+                prof = cProfile.Profile()
+                t0 = time.perf_counter()
+                try:
+                    prof.enable()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        prof.disable()
+                finally:
+                    self._busy.release()
+                    ms = (time.perf_counter() - t0) * 1000.0
+                    if ms >= self.threshold_ms:
+                        self._save(name, prof, ms, kwargs)
+            wrapper.__profiled__ = True  # type: ignore[attr-defined]
+            return wrapper  # type: ignore[return-value]
+        return deco
+
+    # Storage
+
+    def _save(self, name: str, prof: cProfile.Profile, ms: float, kwargs: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            now = time.time()
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}"
+            base = os.path.join(self.directory, f"{stamp}_{self.captured % 10000:04d}_{name.replace(' ', '_')}")
+            prof.dump_stats(base + ".prof")
+            meta = {
+                "command": name,
+                "args": {k: repr(v)[:200] for k, v in kwargs.items()},
+                "duration_ms": round(ms, 3),
+                "ts": int(time.time()),
+            }
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            self.captured += 1
+            self._prune()
+        except Exception as e:
+            print(f"[command_profiler] could not save profile for {name}: {e}", file=sys.stderr)
+
+    def _prune(self) -> None:
+        for base in self._bases()[self.keep:]:
+            for ext in (".prof", ".json"):
+                try:
+                    os.remove(base + ext)
+                except OSError:
+                    pass
+
+    def _bases(self) -> List[str]:
+        """Saved capture paths without extension, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted((fn[:-5] for fn in os.listdir(self.directory) if fn.endswith(".prof")), reverse=True)
+        return [os.path.join(self.directory, n) for n in names]
+
+    def captures(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for base in self._bases():
+            try:
+                with open(base + ".json", "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception:
+                meta = {"command": os.path.basename(base)}
+            meta["file"] = os.path.basename(base) + ".prof"
+            out.append(meta)
+        return out
+
+    def report(self, index: int = 0, top: int = 15, sort: str = "cumulative") -> str:
+        """Top-N functions of capture `index` (0 = newest)."""
+        bases = self._bases()
+        if not bases:
+            return "No profiles captured."
+        if not 0 <= index < len(bases):
+            return f"No capture #{index} (have {len(bases)})."
+        caps = self.captures()
+        meta = caps[index]
+        buf = io.StringIO()
+        stats = pstats.Stats(bases[index] + ".prof", stream=buf)
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+        # pstats prints a preamble (file name, totals); keep the table only.
+        body = buf.getvalue()
+        table = body[body.find("ncalls"):] if "ncalls" in body else body
+        head = f"{meta.get('command')} — {meta.get('duration_ms')} ms — args {meta.get('args', {})}"
+        return head + "\n" + table.rstrip()
+
+    def status(self) -> str:
+        state = "on" if self.enabled else "off"
+        targets = ",".join(sorted(self.targets)) or "-"
+        return (f"Profiling {state} (targets: {targets}, threshold: {self.threshold_ms:.0f} ms, "
+                f"keep: {self.keep}); captured={self.captured} skipped={self.skipped}")
+
+
+def profile_tree(tree: Any, profiler: Optional[CommandProfiler] = None) -> int:
+    """Route every slash command in `tree` through the profiler; returns how many were wrapped."""
+    from discord import app_commands
+
+    profiler = profiler or get_profiler()
+    wrapped = 0
+    for cmd in tree.walk_commands():
+        if not isinstance(cmd, app_commands.Command) or getattr(cmd._callback, "__profiled__", False):
+            continue
+        cmd._callback = profiler.wrap(cmd.qualified_name)(cmd._callback)
+        wrapped += 1
+    return wrapped
+
+
+def _from_env() -> CommandProfiler:
+    prof = CommandProfiler(
+        os.getenv("COMMAND_PROFILE_DIR", os.path.join(".cache", "profiles")),
+        threshold_ms=float(os.getenv("COMMAND_PROFILE_THRESHOLD_MS", "1000")),
+        keep=int(os.getenv("COMMAND_PROFILE_KEEP", "20")),
+    )
+    targets = (os.getenv("COMMAND_PROFILE") or "").strip()
+    if targets and targets.lower() not in ("0", "off", "false", "no"):
+        prof.enable(targets)
+    return prof
+
+
+PROFILER: Optional[CommandProfiler] = None
+
+
+def get_profiler() -> CommandProfiler:
+    """The process-wide profiler, configured from COMMAND_PROFILE* on first use.
+
+    Built lazily rather than at import so settings loaded from .env (main()
+    calls load_dotenv() after importing the command modules) are honoured.
+    """
+    global PROFILER
+    if PROFILER is None:
+        PROFILER = _from_env()
+    return PROFILER
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import discord
+from discord import app_commands
+
+GLOBAL_SCOPE = "global"
+
+
+def parse_guild_ids(raw: Optional[str]) -> List[int]:
+    """Parse a comma/whitespace separated list of guild ids (GUILD_ID / GUILD_IDS)."""
+    out: List[int] = []
+    for part in (raw or "").replace(",", " ").split():
+        if part.isdigit() and int(part) not in out:
+            out.append(int(part))
+    return out
+
+
+def scope_key(guild_id: Optional[int]) -> str:
+    return GLOBAL_SCOPE if guild_id is None else f"guild:{guild_id}"
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Canonical hash of the payload `tree.sync(guild=...)` would upload (per application)."""
+    commands = sorted((c.to_dict(tree) for c in tree.get_commands(guild=guild)), key=lambda d: (d.get("type", 1), d["name"]))
+    payload = {"application_id": tree.client.application_id, "commands": commands}
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_state(path: str) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_state(path: str, state: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(state.items())), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class CommandSyncer:
+    """Sync the command tree only when its serialized schema changed.
+
+    The last-synced hash is persisted per scope ("global", "guild:<id>") so
+    restarts and gateway reconnects with an unchanged tree make no API calls.
+    Guild scopes are synced concurrently.
+    """
+
+    def __init__(self, tree: app_commands.CommandTree, state_path: str, guild_ids: Sequence[int] = (),
+                 force: bool = False) -> None:
+        self.tree = tree
+        self.state_path = state_path
+        self.guild_ids = list(guild_ids)
+        self.force = force
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self) -> Optional[asyncio.Task]:
+        """Start a background sync unless one is already running; never blocks the caller."""
+        if self._task is not None and not self._task.done():
+            return None
+        self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def run(self) -> Dict[str, str]:
+        """Sync every configured scope. Returns scope -> "synced" | "unchanged" | "failed"."""
+        async with self._lock:
+            state = load_state(self.state_path)
+            scopes: List[Optional[int]] = list(self.guild_ids) if self.guild_ids else [None]
+            results = await asyncio.gather(*(self._sync_scope(g, state) for g in scopes))
+            outcome = dict(zip((scope_key(g) for g in scopes), results))
+            if "synced" in results:
+                try:
+                    save_state(self.state_path, state)
+                except Exception as e:
+                    print(f"Command sync state not saved: {e}", file=sys.stderr)
+            self.force = False
+            return outcome
+
+    async def _sync_scope(self, guild_id: Optional[int], state: Dict[str, str]) -> str:
+        key = scope_key(guild_id)
+        guild = discord.Object(id=guild_id) if guild_id is not None else None
+        digest = tree_hash(self.tree, guild=guild)
+        if not self.force and state.get(key) == digest:
+            print(f"Command tree unchanged for {key}; skipping sync.")
+            return "unchanged"
+        try:
+            synced = await self.tree.sync(guild=guild)
+        except Exception as e:
+            print(f"Command sync failed for {key}: {e}", file=sys.stderr)
+            return "failed"
+        state[key] = digest
+        print(f"Synced {len(synced)} commands to {key}.")
+        return "synced"
+
+
+def from_env(tree: app_commands.CommandTree) -> CommandSyncer:
+    """Build a syncer from GUILD_ID / GUILD_IDS, COMMAND_SYNC_STATE and FORCE_COMMAND_SYNC."""
+    guild_ids = parse_guild_ids(" ".join([os.getenv("GUILD_ID") or "", os.getenv("GUILD_IDS") or ""]))
+    state_path = os.getenv("COMMAND_SYNC_STATE") or os.path.join(".cache", "command_sync.json")
+    force = (os.getenv("FORCE_COMMAND_SYNC") or "").strip().lower() in {"1", "true", "yes"}
+    return CommandSyncer(tree, state_path, guild_ids=guild_ids, force=force)
+
@@ -0,0 +1,139 @@
+"""Bounded thread pools per subsystem for blocking calls made from async code.
+
+Every subsystem (file I/O, each upstream API) gets its own small pool and a
+bounded queue, so a slow upstream can only exhaust its own threads: file reads
+and the other upstreams keep their capacity. When a pool and its queue are
+full, run() fails fast with BulkheadFull instead of piling up work.
+
+    items = await executors.run("files", load_registry_items, path, "items")
+
+Sizes come from EXECUTOR_<NAME>_WORKERS / EXECUTOR_<NAME>_QUEUE, else DEFAULTS.
+Wait time before a worker picks a call up is recorded as
+bot_executor_wait_seconds{pool=...}; rejections as bot_executor_rejected_total.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from utils.metrics import METRICS
+
+T = TypeVar("T")
+
+# name -> (workers, queued calls allowed beyond the busy workers)
+DEFAULTS: Dict[str, Tuple[int, int]] = {
+    "files": (4, 256),
+    "nobel": (4, 32),
+    "weather": (4, 32),
+    "wwis": (2, 16),
+    "michelin": (4, 32),
+    "uspto": (2, 8),
+}
+FALLBACK = (2, 16)
+
+
+class BulkheadFull(RuntimeError):
+    pass
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(key) or default))
+    except ValueError:
+        return default
+
+
+class Bulkhead:
+    def __init__(self, name: str, workers: int, max_queue: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0  # submitted and not yet finished (running + queued)
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix=f"{self.name}-io")
+        return self._pool
+
+    def _done(self, _: Any) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                METRICS.inc("bot_executor_rejected_total", pool=self.name)
+                raise BulkheadFull(f"{self.name} is busy ({self.pending} calls in flight); try again shortly.")
+            self.pending += 1
+        submitted = time.perf_counter()
+        ctx = contextvars.copy_context()
+
+        def call() -> T:
+            METRICS.observe("bot_executor_wait_seconds", time.perf_counter() - submitted, pool=self.name)
+            return ctx.run(fn, *args, **kwargs)
+
+        try:
+            fut = self._executor().submit(call)
+        except BaseException:
+            self._done(None)
+            raise
+        # Released when the thread finishes, not when the awaiting task is
+        # cancelled: a cancelled call still occupies its worker until it returns.
+        fut.add_done_callback(self._done)
+        return await asyncio.wrap_future(fut)
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "max_queue": self.max_queue, "pending": self.pending,
+                "completed": self.completed, "rejected": self.rejected}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_BULKHEADS: Dict[str, Bulkhead] = {}
+_LOCK = threading.Lock()
+
+
+def bulkhead(name: str) -> Bulkhead:
+    b = _BULKHEADS.get(name)
+    if b is None:
+        with _LOCK:
+            b = _BULKHEADS.get(name)
+            if b is None:
+                workers, queue = DEFAULTS.get(name, FALLBACK)
+                key = name.upper()
+                b = _BULKHEADS[name] = Bulkhead(name, _env_int(f"EXECUTOR_{key}_WORKERS", workers),
+                                                _env_int(f"EXECUTOR_{key}_QUEUE", queue))
+    return b
+
+
+async def run(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run the blocking `fn(*args, **kwargs)` on the `name` pool and await its result."""
+    return await bulkhead(name).run(fn, *args, **kwargs)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    return {name: b.stats() for name, b in sorted(_BULKHEADS.items())}
+
+
+def shutdown(wait: bool = False) -> None:
+    with _LOCK:
+        bulkheads = list(_BULKHEADS.values())
+    for b in bulkheads:
+        b.shutdown(wait=wait)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
 
 
 def load_json(path: str) -> Dict[str, Any]:
@@ -12,3 +14,25 @@ def load_json(path: str) -> Dict[str, Any]:
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
+
+
+def file_version(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a data file; changes whenever the file is edited or re-synced."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+# (path, builder name) -> (file version, compiled object)
+_COMPILED: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+
+
+def compiled(path: str, build: Callable[[Dict[str, Any]], T]) -> T:
+    """Parse `path` and run `build` on it once per file version."""
+    version = file_version(path)
+    key = (os.path.abspath(path), f"{build.__module__}.{build.__qualname__}")
+    hit = _COMPILED.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    obj = build(load_json(path))
+    _COMPILED[key] = (version, obj)
+    return obj
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """Fixed-memory log-linear latency histogram (HDR-style).
+
+    Values are recorded in microseconds into 2**SUB_BITS linear sub-buckets per
+    power of two, so any quantile is reported within ~1/2**SUB_BITS relative
+    error and memory is a fixed list of ints however many samples arrive.
+    """
+
+    SUB_BITS = 4
+    MAX_EXP = 36  # 2**36 us ~ 19 hours; larger values land in the last bucket
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * ((self.MAX_EXP + 2) << self.SUB_BITS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, us: int) -> int:
+        exp = max(0, us.bit_length() - cls.SUB_BITS - 1)
+        if exp > cls.MAX_EXP:
+            return ((cls.MAX_EXP + 2) << cls.SUB_BITS) - 1
+        return (exp << cls.SUB_BITS) + (us >> exp)
+
+    @classmethod
+    def _upper_us(cls, i: int) -> int:
+        sub = 1 << cls.SUB_BITS
+        if i < 2 * sub:
+            return i
+        exp = i // sub - 1
+        return ((i - (exp << cls.SUB_BITS) + 1) << exp) - 1
+
+    def record(self, seconds: float) -> None:
+        us = max(0, int(seconds * 1_000_000))
+        self.counts[self._index(us)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q-th sample; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    return min(self._upper_us(i) / 1_000_000, self.max)
+        return self.max
+
+
+class Metrics:
+    """Process-wide counters and latency histograms keyed by (name, labels)."""
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], int] = {}
+        self.histograms: Dict[Tuple[str, Labels], LatencyHistogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, value: int = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            h = self.histograms.get(key)
+            if h is None:
+                h = self.histograms[key] = LatencyHistogram()
+            h.record(seconds)
+
+    def counter(self, name: str, **labels: str) -> int:
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (counters and summaries)."""
+        def fmt(labels: Labels, extra: Labels = ()) -> str:
+            items = labels + extra
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            typed = set()
+            for (name, labels), value in counters:
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{fmt(labels)} {value}")
+            for (name, labels), h in histograms:
+                if name not in typed:
+                    lines.append(f"# TYPE {name} summary")
+                    typed.add(name)
+                for q in self.QUANTILES:
+                    lines.append(f"{name}{fmt(labels, (('quantile', str(q)),))} {h.quantile(q):.6f}")
+                lines.append(f"{name}_sum{fmt(labels)} {h.total:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        lines.append("# TYPE bot_uptime_seconds gauge")
+        lines.append(f"bot_uptime_seconds {time.time() - self.started:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, limit: int = 15) -> str:
+        """Plain-text digest for the /stats command."""
+        with self._lock:
+            cmds = [(dict(labels).get("command", "?"), h) for (name, labels), h in self.histograms.items()
+                    if name == "bot_command_duration_seconds"]
+            ups = [(dict(labels).get("upstream", "?"), h) for (name, labels), h in self.histograms.items()
+                   if name == "bot_upstream_duration_seconds"]
+            waits = [(dict(labels).get("pool", "?"), h) for (name, labels), h in self.histograms.items()
+                     if name == "bot_executor_wait_seconds"]
+            caches: Dict[str, Dict[str, int]] = {}
+            errors: Dict[str, int] = {}
+            for (name, labels), v in self.counters.items():
+                d = dict(labels)
+                if name == "bot_cache_requests_total":
+                    caches.setdefault(d.get("cache", "?"), {})[d.get("result", "?")] = v
+                elif name == "bot_command_errors_total":
+                    errors[d.get("command", "?")] = v
+
+        def row(label: str, h: LatencyHistogram) -> str:
+            return (f"{label[:28]:<28} n={h.count:<6} p50={h.quantile(0.5) * 1000:7.1f}ms "
+                    f"p99={h.quantile(0.99) * 1000:7.1f}ms max={h.max * 1000:7.1f}ms")
+
+        out: List[str] = [f"Uptime: {int(time.time() - self.started)}s"]
+        if cmds:
+            out.append("Commands:")
+            for label, h in sorted(cmds, key=lambda x: -x[1].count)[:limit]:
+                err = errors.get(label, 0)
+                out.append(row(label, h) + (f" errors={err}" if err else ""))
+        if ups:
+            out.append("Upstreams:")
+            for label, h in sorted(ups, key=lambda x: -x[1].count)[:limit]:
+                out.append(row(label, h))
+        if waits:
+            out.append("Executor queue wait:")
+            for label, h in sorted(waits, key=lambda x: -x[1].count)[:limit]:
+                out.append(row(label, h))
+        if caches:
+            out.append("Caches:")
+            for name, r in sorted(caches.items()):
+                hit, miss = r.get("hit", 0), r.get("miss", 0)
+                rate = hit / (hit + miss) * 100 if hit + miss else 0.0
+                out.append(f"{name[:28]:<28} hit={hit} miss={miss} ({rate:.0f}%)")
+        return "\n".join(out)
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+METRICS = Metrics()
+
+
+# Recording helpers
+
+def cache_result(cache: str, hit: bool) -> None:
+    METRICS.inc("bot_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def upstream(name: str) -> Iterator[None]:
+    """Time one upstream request: `with metrics.upstream("nobel"): requests.get(...)`."""
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        METRICS.observe("bot_upstream_duration_seconds", time.perf_counter() - t0, upstream=name)
+        if not ok:
+            METRICS.inc("bot_upstream_errors_total", upstream=name)
+
+
+# TRACE_COMMANDS=1: every invocation is also written to the audit log as an
+# {"event": "command"} record, replayable with benchmarks/loadtest.py --trace.
+# Read by instrument_tree(), which runs after main() has loaded .env.
+TRACE_COMMANDS = False
+
+
+def _trace_from_env() -> bool:
+    return (os.getenv("TRACE_COMMANDS") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _trace(name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+    from core.audit_logger import log_event
+
+    interaction = args[-1] if args else None
+    user = getattr(interaction, "user", None)
+    log_event({
+        "event": "command",
+        "command": name,
+        "options": {k: v if isinstance(v, (str, int, float, bool)) or v is None else str(v) for k, v in kwargs.items()},
+        "user_id": getattr(user, "id", None),
+        "t": time.time(),
+    })
+
+
+def instrument_command(name: str) -> Callable[[F], F]:
+    """Decorator for slash-command callbacks: latency histogram plus error counter."""
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if TRACE_COMMANDS:
+                _trace(name, args, kwargs)
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except BaseException:
+                METRICS.inc("bot_command_errors_total", command=name)
+                raise
+            finally:
+                METRICS.observe("bot_command_duration_seconds", time.perf_counter() - t0, command=name)
+        wrapper.__instrumented__ = True  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+    return deco
+
+
+def instrument_tree(tree: Any) -> int:
+    """Wrap the callback of every slash command in `tree`; returns how many were wrapped.
+
+    discord.py inspects the callback signature when the command is created,
+    so replacing the stored callback afterwards leaves option parsing intact.
+    """
+    from discord import app_commands
+
+    global TRACE_COMMANDS
+    TRACE_COMMANDS = _trace_from_env()
+    wrapped = 0
+    for cmd in tree.walk_commands():
+        if not isinstance(cmd, app_commands.Command):
+            continue
+        cb = cmd._callback
+        if getattr(cb, "__instrumented__", False):
+            continue
+        cmd._callback = instrument_command(cmd.qualified_name)(cb)
+        wrapped += 1
+    return wrapped
+
+
+# Exposition endpoint
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> Optional[threading.Thread]:
+    """Serve /metrics in Prometheus text format from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = METRICS.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"Warning: metrics endpoint not started on {host}:{port}: {e}", file=sys.stderr)
+        return None
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return thread
+
+
+def from_env() -> Optional[threading.Thread]:
+    """Start the endpoint when METRICS_PORT is set (METRICS_HOST defaults to localhost)."""
+    port = (os.getenv("METRICS_PORT") or "").strip()
+    if not port or port == "0":
+        return None
+    return start_http_server(int(port), os.getenv("METRICS_HOST", "127.0.0.1"))
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import sysconfig
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+OTHER = "[other]"
+
+# Innermost stdlib frames of a thread parked in a blocking wait: the event loop in
+# select/epoll, workers and writers waiting on a Condition, Event or queue.
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),  # concurrent.futures worker blocked on its work queue
+})
+_STDLIB = os.path.normcase(sysconfig.get_paths()["stdlib"])
+
+
+def is_idle_frame(code) -> bool:
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES and \
+        os.path.normcase(code.co_filename).startswith(_STDLIB)
+
+
+class SamplingProfiler:
+    """Timer-driven stack sampler for every thread in the process.
+
+    A daemon thread wakes `hz` times a second, reads `sys._current_frames()`
+    and adds one count to each thread's folded stack
+    ("thread;outer (file:line);...;inner (file:line)"). Memory is bounded by
+    `max_stacks`; once full, unseen stacks are counted under "[other]".
+    Output is the collapsed-stack format read by flamegraph.pl, speedscope
+    and inferno.
+
+    Threads whose innermost frame is a blocking wait (IDLE_FRAMES) are counted
+    in `idle` and left out of the stacks, so the output shows where CPU time
+    goes; pass include_idle=True for a wall-clock view.
+    """
+
+    def __init__(self, hz: float = 29.0, max_stacks: int = 20000, max_depth: int = 64,
+                 include_idle: bool = False) -> None:
+        self.interval = 1.0 / max(hz, 0.1)
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.dropped = 0
+        self.idle = 0
+        self._idle_codes: Dict[object, bool] = {}
+        self.busy_seconds = 0.0
+        self.started_at = 0.0
+        # id(code) -> (code, "name (file:line)"); the code object is kept so its id cannot be reused.
+        self._labels: Dict[int, Tuple[object, str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _label(self, code) -> str:
+        hit = self._labels.get(id(code))
+        if hit is not None and hit[0] is code:
+            return hit[1]
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        if len(self._labels) < 50000:
+            self._labels[id(code)] = (code, label)
+        return label
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            t0 = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            folded: List[str] = []
+            idle_threads = 0
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                if not self.include_idle:
+                    idle = self._idle_codes.get(frame.f_code)
+                    if idle is None:
+                        idle = self._idle_codes[frame.f_code] = is_idle_frame(frame.f_code)
+                    if idle:
+                        idle_threads += 1
+                        continue
+                parts: List[str] = []
+                f = frame
+                while f is not None and len(parts) < self.max_depth:
+                    parts.append(self._label(f.f_code))
+                    f = f.f_back
+                parts.append(names.get(ident, f"thread-{ident}"))
+                parts.reverse()
+                folded.append(";".join(parts))
+            del frames
+            with self._lock:
+                for stack in folded:
+                    if stack in self.stacks:
+                        self.stacks[stack] += 1
+                    elif len(self.stacks) < self.max_stacks:
+                        self.stacks[stack] = 1
+                    else:
+                        self.stacks[OTHER] = self.stacks.get(OTHER, 0) + 1
+                        self.dropped += 1
+                self.idle += idle_threads
+                self.samples += 1
+            self.busy_seconds += time.perf_counter() - t0
+
+    def overhead(self) -> float:
+        """Fraction of wall time spent sampling since start()."""
+        wall = time.monotonic() - self.started_at if self.started_at else 0.0
+        return self.busy_seconds / wall if wall > 0 else 0.0
+
+    def snapshot(self, reset: bool = False) -> List[Tuple[str, int]]:
+        with self._lock:
+            rows = sorted(self.stacks.items())
+            if reset:
+                self.stacks = {}
+                self.samples = 0
+                self.dropped = 0
+                self.idle = 0
+        return rows
+
+    def collapsed(self, reset: bool = False) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.snapshot(reset))
+
+    def export(self, path: str, reset: bool = False) -> str:
+        """Write collapsed stacks to `path` atomically; returns the path."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.collapsed(reset))
+        os.replace(tmp, path)
+        return path
+
+    def top(self, limit: int = 15) -> List[Tuple[str, int]]:
+        """Leaf frames by sample count (idle waits excluded unless include_idle)."""
+        leaf: Dict[str, int] = {}
+        for stack, n in self.snapshot():
+            frame = stack.rsplit(";", 1)[-1]
+            leaf[frame] = leaf.get(frame, 0) + n
+        return sorted(leaf.items(), key=lambda kv: -kv[1])[:limit]
+
+    def status(self) -> str:
+        state = "running" if self.running else "stopped"
+        return (f"Sampler {state} at {1.0 / self.interval:.0f} Hz: {self.samples} samples, "
+                f"{len(self.stacks)} stacks, {self.dropped} dropped, {self.idle} idle thread samples skipped, overhead {self.overhead() * 100:.2f}%")
+
+
+class _Exporter:
+    """Periodically writes collapsed stacks to <dir>/stacks-<utc stamp>.folded."""
+
+    def __init__(self, profiler: SamplingProfiler, directory: str, every_seconds: float, keep: int = 48) -> None:
+        self.profiler = profiler
+        self.directory = directory
+        self.every = every_seconds
+        self.keep = keep
+        self._thread = threading.Thread(target=self._run, name="sampling-export", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.every)
+            try:
+                export_file(self.profiler, self.directory, reset=True)
+                files = sorted(fn for fn in os.listdir(self.directory) if fn.endswith(".folded"))
+                for fn in files[:-self.keep]:
+                    os.remove(os.path.join(self.directory, fn))
+            except Exception as e:
+                print(f"[sampling_profiler] export failed: {e}", file=sys.stderr)
+
+
+_EXPORT_SEQ = itertools.count()
+
+
+def export_file(profiler: SamplingProfiler, directory: str, reset: bool = False) -> str:
+    # Millisecond stamp plus a per-process sequence: exports in the same second never collide.
+    now = time.time()
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}"
+    return profiler.export(os.path.join(directory, f"stacks-{stamp}-{next(_EXPORT_SEQ):04d}.folded"), reset=reset)
+
+
+SAMPLER: Optional[SamplingProfiler] = None
+
+
+def export_dir() -> str:
+    return os.getenv("SAMPLING_PROFILER_DIR", os.path.join(".cache", "stacks"))
+
+
+def from_env() -> Optional[SamplingProfiler]:
+    """Start the process-wide sampler when SAMPLING_PROFILER=1.
+
+    SAMPLING_PROFILER_HZ sets the rate (default 29) and
+    SAMPLING_PROFILER_EXPORT_SECONDS (0 = on demand only) the export schedule;
+    SAMPLING_PROFILER_INCLUDE_IDLE=1 keeps threads parked in blocking waits.
+    """
+    global SAMPLER
+    if (os.getenv("SAMPLING_PROFILER") or "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if SAMPLER is None:
+        SAMPLER = SamplingProfiler(
+            hz=float(os.getenv("SAMPLING_PROFILER_HZ", "29")),
+            include_idle=(os.getenv("SAMPLING_PROFILER_INCLUDE_IDLE") or "").strip().lower() in ("1", "true", "yes", "on"),
+        )
+        SAMPLER.start()
+        every = float(os.getenv("SAMPLING_PROFILER_EXPORT_SECONDS", "0") or 0)
+        if every > 0:
+            _Exporter(SAMPLER, export_dir(), every).start()
+    return SAMPLER
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Record wall-clock time spent importing modules and registering commands.
+
+    Import times are inclusive: a module's figure contains the time spent
+    importing its own (not yet loaded) dependencies. Only the first import of a
+    module is recorded, later imports are sys.modules lookups.
+    """
+
+    def __init__(self) -> None:
+        self.imports: Dict[str, float] = {}
+        self.sections: List[Tuple[str, float]] = []
+        self._orig_import: Optional[Callable[..., Any]] = None
+        self._t0 = time.perf_counter()
+
+    def install(self) -> None:
+        if self._orig_import is not None:
+            return
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        if self._orig_import is None:
+            return
+        builtins.__import__ = self._orig_import
+        self._orig_import = None
+
+    def _import(self, name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> Any:
+        orig = self._orig_import or builtins.__import__
+        if level != 0 or name in sys.modules:
+            return orig(name, globals, locals, fromlist, level)
+        t0 = time.perf_counter()
+        try:
+            return orig(name, globals, locals, fromlist, level)
+        finally:
+            self.imports.setdefault(name, (time.perf_counter() - t0) * 1000.0)
+
+    @contextmanager
+    def section(self, label: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append((label, (time.perf_counter() - t0) * 1000.0))
+
+    def report(self, limit: int = 25) -> str:
+        total = (time.perf_counter() - self._t0) * 1000.0
+        lines = [f"Startup profile ({total:.1f} ms since profiler start)", "", "Imports (inclusive ms):"]
+        rows = sorted(self.imports.items(), key=lambda kv: (-kv[1], kv[0]))
+        for name, ms in rows[:limit]:
+            lines.append(f"  {ms:9.1f}  {name}")
+        if len(rows) > limit:
+            lines.append(f"  … {len(rows) - limit} more module(s)")
+        if self.sections:
+            lines.extend(["", "Sections (ms):"])
+            for label, ms in self.sections:
+                lines.append(f"  {ms:9.1f}  {label}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def maybe_section(profiler: Optional[StartupProfiler], label: str) -> Iterator[None]:
+    if profiler is None:
+        yield
+        return
+    with profiler.section(label):
+        yield
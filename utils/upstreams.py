@@ -0,0 +1,43 @@
+"""Base-URL overrides for the external APIs the bot and sync scripts call.
+
+UPSTREAM_<NAME>_URL swaps the scheme and host of a production URL and is
+prefixed to its path, so one fake server can stand in for every upstream:
+
+    UPSTREAM_NOBEL_URL=http://127.0.0.1:8700/nobel
+    https://api.nobelprize.org/2.1/nobelPrizes -> http://127.0.0.1:8700/nobel/2.1/nobelPrizes
+
+Unset means production. Only the fetch URL is rewritten; links shown to users
+and URLs pinned in config/*.lock.json keep their production values.
+Names: nobel, nws, metno, wwis, epic, gog, michelin, uspto, ckan, smithsonian, vam, sparql.
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+NAMES = ("nobel", "nws", "metno", "wwis", "epic", "gog", "michelin", "uspto", "ckan", "smithsonian", "vam", "sparql")
+
+
+def env_var(name: str) -> str:
+    return f"UPSTREAM_{name.upper()}_URL"
+
+
+def override(name: str) -> Optional[str]:
+    v = (os.getenv(env_var(name)) or "").strip().rstrip("/")
+    return v or None
+
+
+def url(name: str, production: str) -> str:
+    """`production` rebased onto UPSTREAM_<NAME>_URL when set, else unchanged."""
+    base = override(name)
+    if not base or not production:
+        return production
+    b = urlsplit(base)
+    p = urlsplit(production)
+    return urlunsplit((b.scheme, b.netloc, b.path + p.path, p.query, p.fragment))
+
+
+def active() -> Dict[str, str]:
+    """{name: override} for every upstream currently redirected."""
+    return {n: v for n in NAMES if (v := override(n))}